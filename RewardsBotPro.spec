@@ -3,7 +3,7 @@ from PyInstaller.utils.hooks import collect_all
 
 datas = [('logo.png', '.'), ('logo.ico', '.')]
 binaries = []
-hiddenimports = []
+hiddenimports = ['tesserocr', 'mss']  # optional OCR engine / capture backend, skipped if not installed
 tmp_ret = collect_all('pytesseract')
 datas += tmp_ret[0]; binaries += tmp_ret[1]; hiddenimports += tmp_ret[2]
 
@@ -0,0 +1,216 @@
+# --- BACKEND INTERFACES FOR THE AUTOMATION ENGINE ---
+# The engine (engine.py) only talks to the outside world through these. The real
+# implementations below (and processes.ProcessManager) drive Edge, the desktop and the database; fakes.py has
+# in-memory versions so whole runs can be exercised on any OS.
+#
+# Screen capture uses the backends in capture.py (size() / grab(region, gray, scale) / close())
+# and OCR uses scanner.DashboardScanner (reset_memo / region / read_snapshot / ocr_calls / ocr_skipped / stages,
+# plus hints / prime / fingerprint for ocr_pool).
+# Reads are dashboard.Reading objects (points, membership, per-field confidence).
+# The interfaces are ABCs, so a backend missing a method fails when it is built, not halfway through a run.
+
+from abc import ABC, abstractmethod
+
+class ProcessLauncher(ABC):
+    """Starts and stops browser processes. Only ever closes what it launched."""
+    handed_off = 0      # Launches whose window went to a browser we didn't start (and so can't close)
+
+    @abstractmethod
+    def launch(self, profile_dir, url=None, debug=False): ...
+    @abstractmethod
+    def close_all(self): ...            # Returns once what it closed is gone
+    @abstractmethod
+    def any_running(self): ...
+    @abstractmethod
+    def pids(self): ...                 # {profile_dir: pid} of live launches
+
+class WindowManager(ABC):
+    """Registry of the windows our launches opened, keyed by profile folder.
+
+    claim() binds a profile to the first window not yet known that belongs to one of
+    our browser processes (`pids()` -> {profile_dir: pid}), so call it after each launch
+    until it returns a handle; window() is then a dict lookup. Windows of other
+    processes are remembered as ignored and never looked at again.
+    Subclasses list windows as (handle, pid) in z-order and focus/check handles.
+    """
+    def __init__(self, pids):
+        self.pids = pids
+        self.by_profile = {}        # profile_dir -> handle
+        self.owner = {}             # handle -> profile_dir
+        self.ignored = set()        # Handles of windows that aren't ours
+
+    def claim(self, profile_dir):
+        handle = self.window(profile_dir)
+        if handle is not None: return handle
+        ours = set(self.pids().values())
+        for handle, pid in self.list_windows():
+            if handle in self.owner or handle in self.ignored: continue
+            if pid in ours:
+                self.by_profile[profile_dir], self.owner[handle] = handle, profile_dir
+                return handle
+            self.ignored.add(handle)
+        return None
+
+    def window(self, profile_dir):
+        handle = self.by_profile.get(profile_dir)
+        if handle is not None and not self.alive(handle):
+            self.release(profile_dir)
+            return None
+        return handle
+
+    def release(self, profile_dir):
+        handle = self.by_profile.pop(profile_dir, None)
+        self.owner.pop(handle, None)
+
+    def clear(self):
+        self.by_profile, self.owner, self.ignored = {}, {}, set()
+
+    def baseline(self):
+        """Windows open right now (earlier runs, the user's) are never claimed."""
+        self.ignored.update(handle for handle, _ in self.list_windows())
+
+    @abstractmethod
+    def list_windows(self): ...         # [(handle, pid)], topmost first
+    @abstractmethod
+    def alive(self, handle): ...
+    @abstractmethod
+    def activate(self, handle): ...
+    @abstractmethod
+    def active_title(self): ...
+
+class InputDevice(ABC):
+    @abstractmethod
+    def search(self, text): ...
+
+class PageReader(ABC):
+    """Reads the dashboard as text (DevTools) instead of from pixels."""
+    @abstractmethod
+    def read(self, scan_url): ...       # Reading, or None
+
+class Storage(ABC):
+    """Profiles in, scan results out."""
+    @abstractmethod
+    def load_profiles(self, ids): ...
+    @abstractmethod
+    def put(self, profile_id, points, membership, source, conf=None, fields=None): ...   # fields: Reading.fields
+    @abstractmethod
+    def flush(self): ...
+    @abstractmethod
+    def close(self): ...
+
+class Backends:
+    """Everything one engine run drives. `page` is only needed for DOM scans, `words` for searches.
+    `ocr_pool` (an ocr_pool.OcrPipeline over `ocr`) moves OCR into worker processes."""
+    def __init__(self, launcher, windows, input, capture, ocr, storage, page=None, words=None, ocr_pool=None):
+        self.launcher = launcher
+        self.windows = windows
+        self.input = input
+        self.capture = capture
+        self.ocr = ocr
+        self.storage = storage
+        self.page = page
+        self.words = words
+        self.ocr_pool = ocr_pool
+
+    def close(self):
+        try:
+            if self.ocr_pool: self.ocr_pool.close()
+            self.capture.close()
+        finally: self.storage.close()
+
+# --- REAL BACKENDS ---
+
+class DesktopWindows(WindowManager):
+    """Top-level windows from EnumWindows (visible, with a title) and their owning process ids."""
+    def __init__(self, pids):
+        super().__init__(pids)
+        import ctypes
+        from ctypes import wintypes
+        import pygetwindow
+        self.ctypes, self.wintypes, self.gw = ctypes, wintypes, pygetwindow
+        self.user32 = ctypes.windll.user32
+        self.enum_proc = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+
+    def list_windows(self):
+        found, pid = [], self.wintypes.DWORD()
+        def visit(hwnd, _):
+            if self.user32.IsWindowVisible(hwnd) and self.user32.GetWindowTextLengthW(hwnd):
+                self.user32.GetWindowThreadProcessId(hwnd, self.ctypes.byref(pid))
+                found.append((hwnd, pid.value))
+            return True
+        self.user32.EnumWindows(self.enum_proc(visit), 0)
+        return found
+
+    def alive(self, handle): return bool(self.user32.IsWindow(handle))
+
+    def activate(self, handle): self.gw.Win32Window(handle).activate()
+
+    def active_title(self):
+        win = self.gw.getActiveWindow()
+        return (win.title or "") if win else ""
+
+class KeyboardInput(InputDevice):
+    def __init__(self):
+        import pyautogui
+        self.pyautogui = pyautogui
+
+    def search(self, text):
+        self.pyautogui.hotkey('ctrl', 'e')
+        self.pyautogui.write(text)
+        self.pyautogui.press('enter')
+
+class DevToolsReader(PageReader):
+    def __init__(self, port, parse):
+        from devtools import DevToolsClient
+        self.client = DevToolsClient(port)
+        self.parse = parse              # text -> Reading
+
+    def read(self, scan_url): return self.parse(self.client.page_text(scan_url)) or None
+
+class DbStorage(Storage):
+    """Profiles from the DB; results through the write-behind writer, committed on flush()."""
+    def __init__(self, on_error=None):
+        import os
+        from db_model import BASE_DIR, Session
+        from db_writer import ScanResultWriter
+        self.Session = Session
+        self.writer = ScanResultWriter(Session, on_error=on_error, dump_path=os.path.join(BASE_DIR, "unsaved_scans.jsonl"))
+
+    def load_profiles(self, ids):
+        from db_model import Profile
+        with self.Session() as session:   # Read only: the loaded rows stay usable detached
+            return [p for p in (session.get(Profile, pid) for pid in ids) if p]
+
+    def put(self, profile_id, points, membership, source, conf=None, fields=None):
+        self.writer.put(profile_id, points, membership, source, conf, fields)
+
+    def flush(self): self.writer.flush(wait=True)
+
+    def close(self): self.writer.close()
+
+class RandomWords:
+    def __init__(self):
+        from wonderwords import RandomWord
+        self.r = RandomWord()
+
+    def word(self): return self.r.word()
+
+def real_backends(mode, scan_url, scan_source="ocr", devtools_port=9222, locator=None, tracer=None, on_error=None, processes=None,
+                  ocr_workers=0, tesseract_cmd=None):
+    """The desktop/Edge/DB backends. Call on the thread that will run the engine (mss handles are per thread).
+    Pass the app's ProcessManager as `processes` to keep track of browsers a launch job leaves open.
+    `ocr_workers` is the setting of that name (see ocr_pool.worker_count)."""
+    from functools import partial
+    from processes import ProcessManager
+    from scanner import DashboardScanner
+    from ocr_pool import OcrPipeline, scanner_reader, worker_count
+    scanner = DashboardScanner(scan_url, locator=locator, tracer=tracer)
+    workers = worker_count(ocr_workers) if mode != "launch" else 0
+    pool = OcrPipeline(partial(scanner_reader, scan_url, tesseract_cmd), scanner, workers) if workers else None
+    searching = mode == "start"
+    if processes: processes.debug_port = devtools_port
+    launcher = processes or ProcessManager(debug_port=devtools_port)
+    return Backends(launcher, DesktopWindows(launcher.pids), KeyboardInput() if searching else None,
+                    scanner.capture, scanner, DbStorage(on_error),
+                    page=DevToolsReader(devtools_port, scanner.parse_text) if scan_source == "dom" else None,
+                    words=RandomWords() if searching else None, ocr_pool=pool)
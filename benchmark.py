@@ -0,0 +1,601 @@
+"""Offline benchmarks for Rewards Bot Pro. Runs headless, no browser needed.
+
+    python benchmark.py ocr                      # all OCR configurations over bench_data/
+    python benchmark.py ocr --configs roi-gray --repeat 5 -v
+    python benchmark.py ocr --engines pytesseract,tesserocr   # per-call cost of each OCR engine
+    python benchmark.py db --profiles 10000                   # indexes + pragmas vs a plain SQLite file
+    python benchmark.py history --profiles 500 --days 365     # scan history aggregate queries
+    python benchmark.py ui --profiles 500                     # profile list build + tier updates
+    python benchmark.py detect --profiles 300                 # Edge profile detection on a synthetic User Data tree
+    python benchmark.py startup                               # GUI time to first paint vs CLI report, memory
+    python benchmark.py parse                                 # dashboard text parser on recorded OCR output
+    python benchmark.py engine --profiles 20                  # automation engine on fake backends, overlap off vs on
+    python benchmark.py engine --ocr-workers 3 --fail-first 2  # ... and with OCR on worker processes
+    python benchmark.py processes --profiles 10               # launch/close tracked dummy browsers, others left running
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_data")
+SCAN_URL = "https://rewards.bing.com/"
+
+# --- OCR CONFIGURATIONS (name -> DashboardScanner kwargs) ---
+OCR_CONFIGS = {
+    "full-gray": dict(preprocess="gray", config=r'--psm 6', use_roi=False),
+    "full-otsu": dict(preprocess="otsu", config=r'--psm 6', use_roi=False),
+    "full-gray-psm11": dict(preprocess="gray", config=r'--psm 11', use_roi=False),
+    "roi-gray": dict(preprocess="gray", config=r'--psm 6', use_roi=True, cascade=False),
+    "roi-otsu": dict(preprocess="otsu", config=r'--psm 6', use_roi=True, cascade=False),
+    "roi-upscale": dict(preprocess="upscale", config=r'--psm 6', use_roi=True, cascade=False),
+    "roi-cascade": dict(preprocess="gray", config=r'--psm 6', use_roi=True),     # Digits-only line first, panel/full below min_conf
+}
+
+def load_fixtures(folder):
+    """Reads expected.json from the folder: {"image.png": {"points": 123, "membership": "Gold"}}."""
+    with open(os.path.join(folder, "expected.json"), 'r') as f: expected = json.load(f)
+    return [(os.path.join(folder, name), want) for name, want in sorted(expected.items())]
+
+def percentile(values, pct):
+    if not values: return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))]
+
+def summarize(name, latencies, hits, total):
+    return {
+        "config": name, "calls": total,
+        "p50_ms": round(percentile(latencies, 50), 1), "p95_ms": round(percentile(latencies, 95), 1),
+        "mean_ms": round(sum(latencies) / len(latencies), 1) if latencies else 0.0,
+        "points_acc": round(hits["points"] / total, 3) if total else 0.0,
+        "membership_acc": round(hits["membership"] / total, 3) if total else 0.0,
+    }
+
+def run_ocr_config(name, kwargs, fixtures, repeat, engine, verbose=False):
+    from scanner import DashboardScanner
+    from capture import FrameCapture
+    latencies, hits, total = [], {"points": 0, "membership": 0}, 0
+    scanner = None
+    for path, want in fixtures:
+        capture = FrameCapture(path)  # Decoded once, so only capture+OCR+parse is timed
+        if scanner is None: scanner = DashboardScanner(SCAN_URL, capture=capture, engine=engine, memo_size=0, **kwargs)  # Measure every OCR call
+        scanner.capture = capture
+        for attempt in range(repeat):
+            t0 = time.perf_counter()
+            reading = scanner.capture_dashboard_data()
+            points, mem = reading
+            ms = (time.perf_counter() - t0) * 1000
+            latencies.append(ms); total += 1
+            hits["points"] += points == want.get("points")
+            hits["membership"] += mem == want.get("membership")
+            if verbose: print(f"  {name:<28} {os.path.basename(path):<32} #{attempt + 1} {ms:8.1f} ms -> {points} / {mem} [{reading.stage} {reading.conf}]")
+    row = summarize(name, latencies, hits, total)
+    row["stages"] = dict(scanner.stages) if scanner else {}
+    return row
+
+def print_table(rows):
+    print(f"{'config':<30}{'calls':>6}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}{'points':>9}{'tier':>8}")
+    for r in rows:
+        print(f"{r['config']:<30}{r['calls']:>6}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['mean_ms']:>10}{r['points_acc']:>9.0%}{r['membership_acc']:>8.0%}")
+
+def cmd_ocr(args):
+    import pytesseract
+    from ocr_engine import ENGINES, create_engine
+    try: pytesseract.get_tesseract_version()
+    except Exception: sys.exit("Tesseract not found on PATH; install it to run the OCR benchmark.")
+    fixtures = load_fixtures(args.data)
+    names = args.configs.split(",") if args.configs else list(OCR_CONFIGS)
+    rows = []
+    for engine_name in args.engines.split(",") if args.engines else ENGINES:
+        try: engine = create_engine(engine_name)
+        except Exception as e:
+            print(f"Skipping engine {engine_name}: {e}"); continue
+        for n in names:
+            rows.append(run_ocr_config(f"{n}@{engine.name}", OCR_CONFIGS[n], fixtures, args.repeat, engine, args.verbose))
+        engine.close()
+    print_table(rows)
+    return rows
+
+def _timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter(); fn(); samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+def run_db_variant(name, tuned, profiles, repeat):
+    from sqlalchemy import create_engine, select, update, text
+    from sqlalchemy.orm import sessionmaker
+    from db_model import Base, Profile, MembershipLevel, make_engine, init_db
+
+    folder = tempfile.mkdtemp(prefix="rbp_db_")
+    path = os.path.join(folder, "bench.db")
+    engine = make_engine(path) if tuned else create_engine(f"sqlite:///{path}")
+    if tuned: init_db(engine, verbose=False)
+    else:
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:  # The schema before this change had no secondary indexes
+            for index in Profile.__table__.indexes: conn.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+    Session = sessionmaker(bind=engine)
+
+    rnd = random.Random(42)
+    levels = list(MembershipLevel)
+    with Session() as session, session.begin():
+        session.execute(Profile.__table__.insert(), [
+            {"name": f"Profile {i}", "email": f"user{i}@outlook.com", "edge_profile_directory": f"Profile {i}",
+             "membership": rnd.choice(levels).name, "available_points": rnd.randint(0, 50000)} for i in range(profiles)])
+
+    def by_directory():
+        with Session() as s:
+            for i in rnd.sample(range(profiles), 50): s.execute(select(Profile.id).where(Profile.edge_profile_directory == f"Profile {i}")).first()
+    def by_tier():
+        with Session() as s: s.execute(select(Profile.id).where(Profile.membership == MembershipLevel.GOLD)).all()
+    def by_points():
+        with Session() as s: s.execute(select(Profile.id).where(Profile.available_points.between(20000, 20500))).all()
+    def commit_each():
+        with Session() as s:
+            for i in rnd.sample(range(1, profiles + 1), 20):
+                s.execute(update(Profile).where(Profile.id == i).values(available_points=rnd.randint(0, 50000))); s.commit()
+
+    rows = []
+    for label, fn in (("50x lookup by directory", by_directory), ("tier = Gold", by_tier),
+                      ("points in range", by_points), ("20 single-row commits", commit_each)):
+        samples = _timed(fn, repeat)
+        rows.append({"variant": name, "query": label, "p50_ms": round(percentile(samples, 50), 2), "p95_ms": round(percentile(samples, 95), 2)})
+    engine.dispose()
+    return rows
+
+def cmd_db(args):
+    rows = run_db_variant("plain", False, args.profiles, args.repeat) + run_db_variant("tuned", True, args.profiles, args.repeat)
+    print(f"{'variant':<8}{'query':<28}{'p50 ms':>10}{'p95 ms':>10}")
+    for r in rows: print(f"{r['variant']:<8}{r['query']:<28}{r['p50_ms']:>10}{r['p95_ms']:>10}")
+    return rows
+
+def cmd_history(args):
+    from sqlalchemy.orm import sessionmaker
+    from db_model import Profile, ScanHistory, make_engine, init_db
+    import history
+
+    engine = make_engine(os.path.join(tempfile.mkdtemp(prefix="rbp_hist_"), "bench.db"))
+    init_db(engine, verbose=False)
+    Session = sessionmaker(bind=engine)
+    rnd = random.Random(7)
+    now = int(time.time())
+    with Session() as session, session.begin():
+        session.execute(Profile.__table__.insert(), [{"name": f"Profile {i}", "edge_profile_directory": f"Profile {i}",
+                                                      "membership": "MEMBER", "available_points": 0} for i in range(args.profiles)])
+        rows = []
+        for pid in range(1, args.profiles + 1):
+            points = rnd.randint(0, 5000)
+            for day in range(args.days, 0, -1):
+                for scan in range(args.scans_per_day):
+                    points += rnd.choice((0, 0, 30, 90, 150))
+                    if rnd.random() < 0.01: points = max(0, points - 5000)   # Redeemed
+                    rows.append({"profile_id": pid, "ts": now - day * 86400 + scan * 3600, "points": points, "level": 0, "source": 0})
+        session.execute(ScanHistory.__table__.insert(), rows)
+    print(f"{len(rows):,} history rows for {args.profiles} profiles")
+
+    results = []
+    with Session() as session:
+        for label, fn in (("daily deltas (7 days)", lambda: history.daily_deltas(session, 7)),
+                          ("totals (30 days)", lambda: history.totals_last_days(session, 30)),
+                          ("no gain since 3 days", lambda: history.no_gain_since(session, now - 3 * 86400))):
+            samples = _timed(fn, args.repeat)
+            results.append({"query": label, "p50_ms": round(percentile(samples, 50), 2), "p95_ms": round(percentile(samples, 95), 2)})
+    print(f"{'query':<26}{'p50 ms':>10}{'p95 ms':>10}")
+    for r in results: print(f"{r['query']:<26}{r['p50_ms']:>10}{r['p95_ms']:>10}")
+    engine.dispose()
+    return results
+
+# --- PROFILE LIST RENDERING ---
+_LEGACY_FRAME = """
+    #CardFrame { background-color: #2b2b2b; border-radius: 6px; border: 1px solid #3d3d3d; }
+    #CardFrame:hover { border: 1px solid #5a5a5a; background-color: #323232; }
+    QCheckBox { spacing: 8px; }
+    QCheckBox::indicator { width: 18px; height: 18px; border-radius: 4px; border: 2px solid #555; background-color: #2b2b2b; }
+    QCheckBox::indicator:hover { border-color: #888; }
+    QCheckBox::indicator:checked { background-color: #0e639c; border: 2px solid #0e639c; }
+"""
+
+def _legacy_badge_style(level):
+    bg = {"Member": "#555555", "Silver": "#90a4ae", "Gold": "#ffb300"}.get(level, "#555555")
+    fg = "#000000" if level == "Gold" else "#ffffff"
+    return f"QPushButton {{ background-color: {bg}; color: {fg}; border-radius: 10px; font-size: 10px; font-weight: bold; border: none; }}"
+
+def _legacy_card(p, font_size):
+    """The old per-profile widget: a frame, four children and four stylesheets of its own."""
+    from PySide6.QtWidgets import QFrame, QHBoxLayout, QLabel, QCheckBox, QPushButton
+    from PySide6.QtGui import QFont
+    frame = QFrame(); frame.setObjectName("CardFrame"); frame.setStyleSheet(_LEGACY_FRAME)
+    lay = QHBoxLayout(frame)
+    check = QCheckBox(); check.setChecked(True); lay.addWidget(check)
+    name = QLabel(p.name); name.setFont(QFont("Segoe UI", font_size, QFont.Bold)); name.setStyleSheet("color: #e0e0e0; background: transparent; border: none;"); lay.addWidget(name)
+    email = QLabel(f"({p.email})"); email.setStyleSheet("QLabel { color: #888888; } QLabel:hover { color: #3daee9; text-decoration: underline; }"); lay.addWidget(email)
+    badge = QPushButton(p.membership.value); badge.setFixedSize(60, 20); badge.setStyleSheet(_legacy_badge_style(p.membership.value)); lay.addWidget(badge)
+    points = QLabel(f"{p.available_points:,}"); points.setStyleSheet("color: #00e676; background: transparent; border: none;"); lay.addWidget(points)
+    frame.badge = badge
+    return frame
+
+def cmd_ui(args):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from types import SimpleNamespace
+    from PySide6.QtCore import QEvent
+    from PySide6.QtWidgets import QApplication, QWidget, QVBoxLayout, QScrollArea
+    from db_model import MembershipLevel
+    from ui_components import ProfileListModel, ProfileListView
+
+    # Every widget and model is deleted before the app goes: Qt objects outliving QApplication abort the interpreter
+    owned = QApplication.instance() is None
+    trues = sys.getrefcount(True)
+    app = QApplication.instance() or QApplication([])
+
+    def dispose(*objects):
+        for obj in objects: obj.deleteLater()
+        app.sendPostedEvents(None, QEvent.DeferredDelete)
+    levels = list(MembershipLevel)
+    profiles = [SimpleNamespace(id=i, name=f"Profile {i}", email=f"user{i}@example.com", membership=levels[i % 3],
+                                available_points=i * 37, edge_profile_directory=f"Profile {i}") for i in range(1, args.profiles + 1)]
+    cycle = {"Member": "Silver", "Silver": "Gold", "Gold": "Member"}
+    results = []
+
+    def legacy():
+        area = QScrollArea(); area.setWidgetResizable(True); area.resize(500, 700)
+        content = QWidget(); lay = QVBoxLayout(content); area.setWidget(content)
+        t0 = time.perf_counter()
+        cards = [_legacy_card(p, 13) for p in profiles]
+        for c in cards: lay.addWidget(c)
+        area.show(); app.processEvents()
+        build = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for i, c in enumerate(cards[:args.updates]):
+            c.badge.setText(cycle[c.badge.text()]); c.badge.setStyleSheet(_legacy_badge_style(c.badge.text()))
+        app.processEvents()
+        update = time.perf_counter() - t0
+        area.close(); dispose(area); del cards, content, lay, area
+        return build, update
+
+    def themed():
+        model = ProfileListModel(); view = ProfileListView(model, 13); view.resize(500, 700)
+        t0 = time.perf_counter()
+        model.sync_profiles(profiles)
+        view.show(); app.processEvents()
+        build = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for r in model.rows[:args.updates]: model.update_profile(r.id, membership=cycle[r.membership])
+        app.processEvents()
+        update = time.perf_counter() - t0
+        view.close(); dispose(view, model); del view, model
+        return build, update
+
+    for name, fn in (("card widgets", legacy), ("themed delegate", themed)):
+        builds, updates = [], []
+        for _ in range(args.repeat):
+            b, u = fn(); builds.append(b * 1000); updates.append(u * 1000)
+        results.append({"variant": name, "build_p50_ms": round(percentile(builds, 50), 1),
+                        "tier_update_p50_ms": round(percentile(updates, 50), 1)})
+    print(f"{args.profiles} profiles, {args.updates} tier updates")
+    print(f"{'variant':<18}{'build ms':>12}{'tier updates ms':>18}")
+    for r in results: print(f"{r['variant']:<18}{r['build_p50_ms']:>12}{r['tier_update_p50_ms']:>18}")
+    if owned:
+        app.shutdown(); del app
+    # PySide6 6.12 gives back Signal.emit()'s True without a reference of its own, so every emit (thousands
+    # here) drops one. True is immortal from Python 3.12; before that it gets freed and the interpreter aborts
+    # with "bool_dealloc" at exit. Return what the emits took.
+    lost = trues - sys.getrefcount(True)
+    if lost > 0 and sys.version_info < (3, 12):
+        import ctypes
+        for _ in range(lost): ctypes.pythonapi.Py_IncRef(ctypes.py_object(True))
+    return results
+
+# --- EDGE PROFILE DETECTION ---
+def _legacy_detect(user_data):
+    """The old per-folder loop: full json.load of every Preferences file."""
+    rows = []
+    for item in sorted(os.listdir(user_data)):
+        if not (item == "Default" or item.startswith("Profile ")): continue
+        email, display_name = "Unknown", item
+        try:
+            with open(os.path.join(user_data, item, "Preferences"), 'r', encoding='utf-8') as f: data = json.load(f)
+            accounts = data.get('account_info', [])
+            if accounts:
+                email = accounts[0].get('email', 'Unknown')
+                display_name = accounts[0].get('full_name', '') or accounts[0].get('given_name', '') or item
+            if display_name == item: display_name = data.get('profile', {}).get('name', '') or item
+        except Exception: pass
+        rows.append({"name": display_name, "email": email or None, "edge_profile_directory": item})
+    return rows
+
+def cmd_detect(args):
+    from sqlalchemy import insert
+    from sqlalchemy.orm import sessionmaker
+    from db_model import Profile, MembershipLevel, make_engine, init_db
+    from edge_profiles import detect_profiles
+    from fakes import make_user_data
+
+    root = tempfile.mkdtemp(prefix="rbp_userdata_")
+    user_data = os.path.join(root, "User Data")
+    make_user_data(user_data, args.profiles, args.pad_kb)
+    print(f"{args.profiles} profiles, ~{args.pad_kb} KB Preferences each")
+
+    def run(name, detect, commit_each):
+        engine = make_engine(os.path.join(tempfile.mkdtemp(prefix="rbp_detect_"), "bench.db"))
+        init_db(engine, verbose=False)
+        Session = sessionmaker(bind=engine)
+        t0 = time.perf_counter()
+        rows = detect()
+        t1 = time.perf_counter()
+        with Session() as session:
+            for row in rows: row["membership"] = MembershipLevel.MEMBER
+            if commit_each:
+                for row in rows: session.add(Profile(**row)); session.commit()
+            else:
+                session.execute(insert(Profile), rows); session.commit()
+        t2 = time.perf_counter()
+        engine.dispose()
+        return rows, {"variant": name, "read_ms": round((t1 - t0) * 1000, 1), "insert_ms": round((t2 - t1) * 1000, 1),
+                      "total_ms": round((t2 - t0) * 1000, 1)}
+
+    legacy_rows, legacy = run("sequential full parse", lambda: _legacy_detect(user_data), True)
+    rows, current = run("pool partial read", lambda: detect_profiles(user_data, workers=args.workers), False)
+    strip = lambda rs: [{k: r[k] for k in ("name", "email", "edge_profile_directory")} for r in rs]
+    if strip(rows) != strip(legacy_rows): print("WARNING: detected profiles differ from the full-parse baseline")
+    print(f"{'variant':<24}{'read ms':>10}{'insert ms':>12}{'total ms':>11}")
+    for r in (legacy, current): print(f"{r['variant']:<24}{r['read_ms']:>10}{r['insert_ms']:>12}{r['total_ms']:>11}")
+    return [legacy, current]
+
+# --- GUI STARTUP ---
+HEAVY_MODULES = ("cv2", "numpy", "pyautogui", "pytesseract", "pygetwindow", "wonderwords", "mss", "worker")
+
+_STARTUP_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QObject, QEvent
+app = QApplication(sys.argv)
+t_qt = time.perf_counter()
+import mainwindow
+t_import = time.perf_counter()
+mainwindow.SettingsManager.save = staticmethod(lambda data: None)   # Don't overwrite the user's settings on exit
+window = mainwindow.MainWindow()
+t_built = time.perf_counter()
+marks = {}
+class FirstPaint(QObject):
+    def eventFilter(self, obj, ev):
+        if ev.type() == QEvent.Paint and "paint" not in marks:
+            marks["paint"] = time.perf_counter(); app.quit()
+        return False
+probe = FirstPaint(); window.installEventFilter(probe)
+window.show(); app.exec()
+print(json.dumps({"qt_ms": (t_qt - t0) * 1000, "import_ms": (t_import - t_qt) * 1000, "window_ms": (t_built - t_import) * 1000,
+                  "first_paint_ms": (marks.get("paint", time.perf_counter()) - t0) * 1000, "peak_rss_mb": peak_rss_mb(),
+                  "heavy_loaded": [m for m in %r if m in sys.modules]}))
+"""
+
+_CLI_PROBE = """
+import io, json, sys, time
+t0 = time.perf_counter()
+import cli
+t_import = time.perf_counter()
+real, sys.stdout = sys.stdout, io.StringIO()
+cli.main(["report"])
+sys.stdout = real
+t_done = time.perf_counter()
+print(json.dumps({"import_ms": (t_import - t0) * 1000, "report_ms": (t_done - t_import) * 1000, "peak_rss_mb": peak_rss_mb(),
+                  "heavy_loaded": [m for m in %r + ("PySide6",) if m in sys.modules]}))
+"""
+
+# Prepended to both probes
+_RSS = """
+def peak_rss_mb():
+    try:
+        import resource
+        kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return round(kb / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+    except ImportError:
+        import ctypes, ctypes.wintypes
+        class Counters(ctypes.Structure):
+            _fields_ = [("cb", ctypes.wintypes.DWORD), ("PageFaultCount", ctypes.wintypes.DWORD)] + \\
+                       [(n, ctypes.c_size_t) for n in ("PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage",
+                                                       "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")]
+        c = Counters(); c.cb = ctypes.sizeof(c)
+        ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(c), c.cb)
+        return round(c.PeakWorkingSetSize / (1024 * 1024), 1)
+"""
+
+def _probe(code, repeat, env, cwd):
+    import subprocess
+    samples = []
+    for _ in range(repeat):     # Fresh interpreter each time: import cost is the point
+        out = subprocess.run([sys.executable, "-c", "import sys\n" + _RSS + code % (HEAVY_MODULES,)], cwd=cwd, env=env,
+                             capture_output=True, text=True)
+        if out.returncode != 0: print(out.stderr.strip()); return None
+        samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    row = {key: round(percentile([s[key] for s in samples], 50), 1) for key in samples[0] if key != "heavy_loaded"}
+    row["heavy_loaded"] = samples[-1]["heavy_loaded"]
+    return row
+
+# --- DASHBOARD TEXT PARSER (recorded OCR/DevTools text in bench_data/ocr_text.json) ---
+def legacy_parse(text):
+    """What the scanner did before dashboard.parse_dashboard: two separate scans, points and tier only."""
+    m = re.search(r"Available points[^\d]*(\d[\d,]*)", text, re.IGNORECASE)
+    points = int(m.group(1).replace(",", "")) if m else None
+    if re.search(r"\bGold\b", text, re.IGNORECASE) or "Level 2" in text: mem = "Gold"
+    elif re.search(r"\bSilver\b", text, re.IGNORECASE) or "Level 1" in text: mem = "Silver"
+    elif "Member" in text: mem = "Member"
+    else: mem = None
+    return points, mem
+
+def cmd_parse(args):
+    """Cost per text only; tests/test_dashboard.py checks what the cases read as."""
+    from dashboard import parse_dashboard
+    with open(os.path.join(args.data, "ocr_text.json"), 'r') as f: texts = [case["text"] for case in json.load(f)]
+    rows = []
+    for name, fn in (("parse_dashboard", parse_dashboard), ("legacy", legacy_parse)):
+        t0 = time.perf_counter()
+        for _ in range(args.repeat):
+            for text in texts: fn(text)
+        us = (time.perf_counter() - t0) / (args.repeat * len(texts)) * 1e6
+        rows.append({"parser": name, "us_per_text": round(us, 1)})
+        print(f"{name:<16}{us:>8.1f} us per text")
+    return rows
+
+def cmd_startup(args):
+    env = dict(os.environ)
+    if sys.platform.startswith("linux") and not env.get("DISPLAY"): env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    here = os.path.dirname(os.path.abspath(__file__))
+    gui = _probe(_STARTUP_PROBE, args.repeat, env, here)
+    cli = _probe(_CLI_PROBE, args.repeat, env, here)
+    if not gui or not cli: return []
+    gui["variant"], cli["variant"] = "gui", "cli"
+    print(f"{'Qt init':<22}{gui['qt_ms']:>10} ms")
+    print(f"{'import mainwindow':<22}{gui['import_ms']:>10} ms")
+    print(f"{'build MainWindow':<22}{gui['window_ms']:>10} ms")
+    print(f"{'first paint':<22}{gui['first_paint_ms']:>10} ms  (from interpreter start of the probe)")
+    print(f"{'GUI peak RSS':<22}{gui['peak_rss_mb']:>10} MB")
+    print(f"heavy modules loaded before first paint: {', '.join(gui['heavy_loaded']) or 'none'}")
+    print(f"{'import cli':<22}{cli['import_ms']:>10} ms")
+    print(f"{'cli report':<22}{cli['report_ms']:>10} ms")
+    print(f"{'CLI peak RSS':<22}{cli['peak_rss_mb']:>10} MB")
+    print(f"heavy modules loaded by a CLI report: {', '.join(cli['heavy_loaded']) or 'none'}")
+    return [gui, cli]
+
+# --- AUTOMATION ENGINE (fake backends, see fakes.py) ---
+def run_engine(mode, profiles, overlap, args, workers=0):
+    import asyncio
+    from engine import AutomationEngine
+    from fakes import fake_backends
+    backends, desktop = fake_backends(profiles, args.launch_delay, args.load_delay, args.ocr_delay, args.flush_delay, args.fail_first, ocr_workers=workers)
+    strays = [desktop.stray() for _ in range(args.stray)]       # The user's own Edge windows: never typed into or closed
+    # Short timeouts: the fake desktop is faster than Edge
+    engine = AutomationEngine(mode, args.batch, args.searches, SCAN_URL, on_log=lambda m: None, overlap=overlap,
+                              timeouts={"load_stable": 0.1, "search_load_stable": 0.1, "repaint": 0.3, "batch_pause": 0.2})
+    t0 = time.perf_counter()
+    summary = asyncio.run(engine.run(lambda: backends, [p.id for p in profiles]))
+    seconds = time.perf_counter() - t0
+    untouched = all(w in desktop.windows and "Outlook" in w.title for w in strays)
+    return seconds, summary, backends.storage, untouched
+
+def cmd_engine(args):
+    from fakes import make_profiles
+    profiles = make_profiles(args.profiles)
+    expected = {p.id: (p.points, p.membership) for p in profiles}
+    rows = []
+    for mode in args.modes.split(","):
+        print(f"{mode}: {args.profiles} profiles, batches of {args.batch}, OCR {args.ocr_delay * 1000:.0f} ms, load {args.load_delay * 1000:.0f} ms")
+        variants = [(False, 0), (True, 0)] + [(o, args.ocr_workers) for o in (False, True) if args.ocr_workers >= 2]
+        for overlap, workers in variants:
+            seconds, summary, storage, untouched = run_engine(mode, profiles, overlap, args, workers)
+            got = {pid: (points, mem) for pid, points, mem, *_ in storage.committed}
+            ok = untouched and (mode == "launch" or (got == expected and not summary["failed"]))
+            name = ("overlap" if overlap else "sequential") + (f"+{workers}p" if workers else "")
+            rows.append({"mode": mode, "variant": name, "seconds": round(seconds, 3), "scanned": summary["scanned"],
+                         "failed": len(summary["failed"]), "commits": storage.transactions, "correct": ok})
+            print(f"  {name:<15}{seconds:>8.2f} s  scanned {summary['scanned']:>4}  failed {len(summary['failed']):>3}  "
+                  f"commits {storage.transactions:>3}  {'ok' if ok else 'MISMATCH'}")
+    return rows
+
+# --- BROWSER PROCESS LIFECYCLE (dummy browser, see fakes.dummy_browser) ---
+def cmd_processes(args):
+    from processes import ProcessManager
+    from fakes import dummy_browser
+    foreign = ProcessManager(dummy_browser(args.children))     # "The user's own Edge": must survive
+    foreign.launch("Default")
+    manager = ProcessManager(dummy_browser(args.children))
+    rows = []
+    try:
+        for r in range(args.repeat):
+            t0 = time.perf_counter()
+            procs = [manager.launch(f"Profile {i}") for i in range(args.profiles)]
+            launched = time.perf_counter() - t0
+            time.sleep(0.3)                                     # Let the dummies start their children
+            t0 = time.perf_counter()
+            closed = manager.close_all()
+            closing = time.perf_counter() - t0
+            rows.append({"launch_ms": round(launched * 1000, 1), "close_ms": round(closing * 1000, 1), "closed": closed,
+                         "left_running": sum(p.alive() for p in procs), "foreign_alive": foreign.any_running()})
+        print(f"{args.profiles} dummy browsers with {args.children} children each, {args.repeat} rounds")
+        print(f"  launch {sum(r['launch_ms'] for r in rows) / len(rows):>8.1f} ms   close+wait {sum(r['close_ms'] for r in rows) / len(rows):>8.1f} ms"
+              f"   (old path: taskkill + 1000 ms sleep)")
+        print(f"  ours left running: {max(r['left_running'] for r in rows)}   foreign browser still running: {all(r['foreign_alive'] for r in rows)}")
+    finally:
+        manager.close_all(); foreign.close_all()
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rewards Bot Pro offline benchmarks")
+    parser.add_argument("--json", help="Also write the results to this file")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_ocr = sub.add_parser("ocr", help="OCR latency/accuracy over recorded dashboard screenshots")
+    p_ocr.add_argument("--data", default=BENCH_DIR, help="Folder with images and expected.json")
+    p_ocr.add_argument("--configs", help=f"Comma separated subset of: {', '.join(OCR_CONFIGS)}")
+    p_ocr.add_argument("--repeat", type=int, default=3, help="Captures per image (first locates the panel, later ones reuse it)")
+    p_ocr.add_argument("--engines", help="Comma separated OCR engines to compare (default: all of ocr_engine.ENGINES)")
+    p_ocr.add_argument("-v", "--verbose", action="store_true", help="Print per-image latency")
+    p_ocr.set_defaults(func=cmd_ocr)
+
+    p_db = sub.add_parser("db", help="Profile table lookups/commits: shared tuned engine vs plain SQLite")
+    p_db.add_argument("--profiles", type=int, default=10000)
+    p_db.add_argument("--repeat", type=int, default=20)
+    p_db.set_defaults(func=cmd_db)
+
+    p_hist = sub.add_parser("history", help="Scan history aggregates over a synthetic year of scans")
+    p_hist.add_argument("--profiles", type=int, default=500)
+    p_hist.add_argument("--days", type=int, default=365)
+    p_hist.add_argument("--scans-per-day", type=int, default=2)
+    p_hist.add_argument("--repeat", type=int, default=5)
+    p_hist.set_defaults(func=cmd_history)
+
+    p_ui = sub.add_parser("ui", help="Profile list build and tier update cost: per-card stylesheets vs themed delegate")
+    p_ui.add_argument("--profiles", type=int, default=500)
+    p_ui.add_argument("--updates", type=int, default=200)
+    p_ui.add_argument("--repeat", type=int, default=3)
+    p_ui.set_defaults(func=cmd_ui)
+
+    p_det = sub.add_parser("detect", help="Edge profile auto-detection over a synthetic User Data tree")
+    p_det.add_argument("--profiles", type=int, default=300)
+    p_det.add_argument("--pad-kb", type=int, default=512, help="Approximate size of each Preferences file")
+    p_det.add_argument("--workers", type=int, help="Thread pool size (default: based on CPU count)")
+    p_det.set_defaults(func=cmd_detect)
+
+    p_start = sub.add_parser("startup", help="GUI time to first paint and CLI report cost/memory, each in a fresh interpreter")
+    p_start.add_argument("--repeat", type=int, default=5)
+    p_start.set_defaults(func=cmd_startup)
+
+    p_parse = sub.add_parser("parse", help="Dashboard text parser over recorded OCR output: cost per text")
+    p_parse.add_argument("--data", default=BENCH_DIR, help="Folder with ocr_text.json")
+    p_parse.add_argument("--repeat", type=int, default=2000)
+    p_parse.set_defaults(func=cmd_parse)
+
+    p_eng = sub.add_parser("engine", help="Automation engine over fake backends: sequential vs overlapped OCR and commits")
+    p_eng.add_argument("--profiles", type=int, default=20)
+    p_eng.add_argument("--batch", type=int, default=5)
+    p_eng.add_argument("--modes", default="scan,start", help="Comma separated subset of: scan, start, launch")
+    p_eng.add_argument("--searches", type=int, default=9, help="Points per profile in start mode (3 per search)")
+    p_eng.add_argument("--launch-delay", type=float, default=0.05, help="Seconds until a fake window appears")
+    p_eng.add_argument("--load-delay", type=float, default=0.2, help="Seconds until a fake page stops painting")
+    p_eng.add_argument("--ocr-delay", type=float, default=0.3, help="Seconds per fake OCR call")
+    p_eng.add_argument("--flush-delay", type=float, default=0.1, help="Seconds per fake commit")
+    p_eng.add_argument("--fail-first", type=int, default=0, help="OCR misses per profile before it reads the page (per worker process with --ocr-workers)")
+    p_eng.add_argument("--stray", type=int, default=1, help="Edge windows open before the run that aren't ours")
+    p_eng.add_argument("--ocr-workers", type=int, default=0, help="Also run both variants with OCR on this many worker processes (2+)")
+    p_eng.set_defaults(func=cmd_engine)
+
+    p_proc = sub.add_parser("processes", help="Tracked browser launch/close with a dummy browser; an untracked one must survive")
+    p_proc.add_argument("--profiles", type=int, default=10)
+    p_proc.add_argument("--children", type=int, default=3, help="Child processes per dummy browser")
+    p_proc.add_argument("--repeat", type=int, default=3)
+    p_proc.set_defaults(func=cmd_processes)
+
+    args = parser.parse_args(argv)
+    rows = args.func(args)
+    if args.json:
+        with open(args.json, 'w') as f: json.dump(rows, f, indent=4)
+    return 1 if any(row and row.get("correct") is False for row in rows) else 0     # A MISMATCH fails the run
+
+if __name__ == "__main__":
+    sys.exit(main())
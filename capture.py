@@ -0,0 +1,100 @@
+import cv2
+import numpy as np
+
+# --- SCREEN CAPTURE BACKENDS ---
+# Every backend returns gray (or RGB with gray=False) numpy frames from grab(region, scale).
+# region is (left, top, width, height) in screen pixels; scale < 1 is the downscaled fast path.
+# Frames may live in buffers reused by the next grab(): copy them if you need to keep one.
+
+class BufferPool:
+    """Output buffers keyed by shape, allocated once and reused across retries."""
+    def __init__(self): self.buffers = {}
+
+    def get(self, shape):
+        buf = self.buffers.get(shape)
+        if buf is None: buf = self.buffers[shape] = np.empty(shape, dtype=np.uint8)
+        return buf
+
+    def finish(self, src, gray, scale, code_gray, code_rgb):
+        h, w = src.shape[:2]
+        shape = (h, w) if gray else (h, w, 3)
+        out = self.get(shape)
+        if gray: cv2.cvtColor(src, code_gray, dst=out)
+        elif code_rgb is not None: cv2.cvtColor(src, code_rgb, dst=out)
+        else: np.copyto(out, src)
+        if scale == 1: return out
+        small_shape = (max(1, int(h * scale)), max(1, int(w * scale))) + shape[2:]
+        small = self.get(small_shape)
+        cv2.resize(out, (small_shape[1], small_shape[0]), dst=small, interpolation=cv2.INTER_AREA)
+        return small
+
+class MssCapture:
+    """Grabs one monitor (or a region of it) with mss; no PIL image in between."""
+    name = "mss"
+
+    def __init__(self, monitor=1):
+        import mss
+        self.sct = mss.mss()
+        self.monitor = self.sct.monitors[monitor]
+        self.pool = BufferPool()
+
+    def size(self): return (self.monitor["width"], self.monitor["height"])
+
+    def grab(self, region=None, gray=True, scale=1):
+        box = dict(self.monitor)
+        if region:
+            x, y, w, h = region
+            box = {"left": box["left"] + x, "top": box["top"] + y, "width": w, "height": h}
+        shot = self.sct.grab(box)
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)  # View, no copy
+        return self.pool.finish(bgra, gray, scale, cv2.COLOR_BGRA2GRAY, cv2.COLOR_BGRA2RGB)
+
+    def close(self): self.sct.close()
+
+class PyAutoGuiCapture:
+    """The original path (PIL screenshot); kept as the fallback when mss is unavailable."""
+    name = "pyautogui"
+
+    def __init__(self):
+        import pyautogui
+        self.pyautogui = pyautogui
+        self.pool = BufferPool()
+
+    def size(self): return tuple(self.pyautogui.size())
+
+    def grab(self, region=None, gray=True, scale=1):
+        rgb = np.asarray(self.pyautogui.screenshot(region=region) if region else self.pyautogui.screenshot())
+        return self.pool.finish(rgb, gray, scale, cv2.COLOR_RGB2GRAY, None)
+
+    def close(self): pass
+
+class FrameCapture:
+    """Serves a fixed frame (a recorded screenshot file or a synthetic array) for tests and benchmarks."""
+    name = "file"
+
+    def __init__(self, frame):
+        if isinstance(frame, str):
+            frame = cv2.cvtColor(cv2.imread(frame, cv2.IMREAD_COLOR), cv2.COLOR_BGR2RGB)
+        self.set_frame(frame)
+        self.pool = BufferPool()
+
+    def set_frame(self, frame):
+        self.rgb = np.ascontiguousarray(frame if frame.ndim == 3 else cv2.cvtColor(frame, cv2.COLOR_GRAY2RGB))
+
+    def size(self): return (self.rgb.shape[1], self.rgb.shape[0])
+
+    def grab(self, region=None, gray=True, scale=1):
+        src = self.rgb
+        if region:
+            x, y, w, h = region
+            src = src[y:y + h, x:x + w]
+        return self.pool.finish(src, gray, scale, cv2.COLOR_RGB2GRAY, None)
+
+    def close(self): pass
+
+def create_capture(name="auto"):
+    """"auto" prefers mss and falls back to pyautogui."""
+    if name == "mss": return MssCapture()
+    if name == "pyautogui": return PyAutoGuiCapture()
+    try: return MssCapture()
+    except Exception: return PyAutoGuiCapture()
@@ -0,0 +1,153 @@
+"""Command line runner for scheduled jobs. Same core as the GUI buttons, without Qt.
+
+    python cli.py scan --select "gold & points<5000"
+    python cli.py start --select 1-10 --searches 30
+    python cli.py launch --ids 3,4
+    python cli.py report --days 7 --json report.json
+    python cli.py scan --format jsonl            # one JSON event per line on stdout
+
+Profiles are picked with the selection query syntax (see selection.py), default "all".
+Unset options come from user_settings.json, like the GUI.
+Exit codes: 0 ok, 1 some profiles failed, 2 nothing selected / bad query, 3 job error, 130 stopped with Ctrl+C.
+"""
+import argparse
+import json
+import multiprocessing
+import sys
+import threading
+import time
+
+from sqlalchemy import select
+
+from db_model import Session, Profile, init_db
+from selection import run_query, QueryError
+from settings_manager import SettingsManager
+
+EXIT_OK, EXIT_FAILED, EXIT_NOTHING, EXIT_ERROR, EXIT_STOPPED = 0, 1, 2, 3, 130
+
+class Output:
+    """Progress to stdout: plain lines, or one JSON object per event with --format jsonl."""
+    def __init__(self, fmt="text", stream=None):
+        self.jsonl = fmt == "jsonl"
+        self.stream = stream or sys.stdout
+        self.lock = threading.Lock()
+
+    def event(self, kind, text=None, **fields):
+        with self.lock:
+            if self.jsonl: self.stream.write(json.dumps({"event": kind, "ts": round(time.time(), 3), **fields}) + "\n")
+            elif text is not None: self.stream.write(f"{time.strftime('%H:%M:%S')} {text}\n")
+            self.stream.flush()
+
+    def log(self, message): self.event("log", message, message=message)
+
+    def result(self, pid, points, membership): self.event("result", id=pid, points=points, membership=membership)
+
+def select_profiles(session, query="all", ids=None):
+    """Profiles in list order (by id) matching the query and, if given, the explicit ids."""
+    order = list(session.scalars(select(Profile.id).order_by(Profile.id)))
+    matched = run_query(session, query, lambda ns: {order[n - 1] for n in ns if 1 <= n <= len(order)}, len(order))
+    if ids: matched &= set(ids)
+    return [pid for pid in order if pid in matched]
+
+def report_rows(session, ids, days=7):
+    from history import totals_last_days
+    gained = totals_last_days(session, days)
+    wanted = set(ids)
+    return [{"id": p.id, "name": p.name, "email": p.email, "membership": p.membership.value, "points": p.available_points or 0,
+             f"gained_{days}d": gained.get(p.id, 0), "last_run": p.last_run.isoformat(timespec="seconds") if p.last_run else None,
+             "conf": p.points_conf, "today": p.today_points, "streak": p.streak,
+             "search": f"{p.search_points}/{p.search_max}" if p.search_max else None,
+             "mobile": f"{p.mobile_points}/{p.mobile_max}" if p.mobile_max else None, "auto_redeem": p.auto_redeem}
+            for p in session.scalars(select(Profile).order_by(Profile.id)) if p.id in wanted]
+
+def print_report(rows, out, days):
+    if out.jsonl:
+        for row in rows: out.event("profile", **row)
+        return
+    key = f"gained_{days}d"
+    out.stream.write(f"{'id':>5}  {'name':<28}{'tier':<8}{'points':>9}{key:>12}  last run\n")
+    for r in rows:
+        out.stream.write(f"{r['id']:>5}  {r['name'][:27]:<28}{r['membership']:<8}{r['points']:>9,}{r[key]:>12,}  {r['last_run'] or '-'}\n")
+    out.stream.write(f"{len(rows)} profiles, {sum(r['points'] for r in rows):,} points\n")
+
+def run_job(args, ids, settings, out):
+    from runner import Runner
+    runner = Runner(args.command, ids, args.batch or settings["parallel_browsers"], args.searches or settings["last_search_val"],
+                    scan_url=args.url or settings["scan_url"], update_after=not args.no_verify,
+                    scan_source=args.source or settings["scan_source"], devtools_port=args.port or settings["devtools_port"],
+                    trace_path=args.trace, tesseract_cmd=settings.get("tesseract_cmd") or None,
+                    ocr_workers=settings["ocr_workers"] if args.ocr_workers is None else args.ocr_workers,
+                    on_log=out.log, on_result=out.result)
+    box = {}
+    thread = threading.Thread(target=lambda: box.update(summary=runner.run()), name="runner")
+    thread.start()
+    interrupted = False
+    while thread.is_alive():
+        try: thread.join(0.2)
+        except KeyboardInterrupt:       # First Ctrl+C finishes the current step and flushes results
+            if not interrupted: out.log("Stopping after the current step...")
+            interrupted = True; runner.stop()
+    if runner.tesseract_cmd and runner.tesseract_cmd != settings.get("tesseract_cmd"):
+        settings["tesseract_cmd"] = runner.tesseract_cmd; SettingsManager.save(settings)
+    summary = box.get("summary") or runner.summary()
+    if summary["error"]: code = EXIT_ERROR
+    elif interrupted: code = EXIT_STOPPED
+    elif summary["failed"]: code = EXIT_FAILED
+    else: code = EXIT_OK
+    return summary, code
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rewards Bot Pro command line runner (no GUI)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--select", default="all", help='Selection query, e.g. "gold & points>5000 & 1-20,35"')
+    common.add_argument("--ids", help="Comma separated profile ids (combined with --select)")
+    common.add_argument("--format", choices=("text", "jsonl"), default="text", help="Progress on stdout")
+    common.add_argument("--json", help="Write the final summary to this file")
+    jobs = argparse.ArgumentParser(add_help=False)
+    jobs.add_argument("--batch", type=int, help="Profiles per batch (parallel browsers)")
+    jobs.add_argument("--url", help="Dashboard URL")
+    jobs.add_argument("--source", choices=("ocr", "dom"), help="Read points from screenshots or over DevTools")
+    jobs.add_argument("--port", type=int, help="DevTools port for --source dom")
+    jobs.add_argument("--trace", help="Write per-phase timing spans to this JSONL file")
+    jobs.add_argument("--ocr-workers", type=int, help="OCR processes (0 = one per spare core, 1 = no worker processes)")
+
+    sub.add_parser("scan", parents=[common, jobs], help="Open each profile's dashboard and record points")
+    p_start = sub.add_parser("start", parents=[common, jobs], help="Run searches, then verify points")
+    p_start.add_argument("--searches", type=int, help="Points to earn (3 per search)")
+    p_start.add_argument("--no-verify", action="store_true", help="Skip the scan after searching")
+    sub.add_parser("launch", parents=[common, jobs], help="Open the dashboard for each profile, batch by batch")
+    p_report = sub.add_parser("report", parents=[common], help="Points per profile from the database")
+    p_report.add_argument("--days", type=int, default=7, help="Window for the points gained column")
+
+    args = parser.parse_args(argv)
+    for name in ("searches", "no_verify"):
+        if not hasattr(args, name): setattr(args, name, None if name == "searches" else False)
+    out = Output(args.format)
+    settings = SettingsManager.load()
+    init_db(verbose=False)
+
+    try: ids = [int(x) for x in args.ids.split(',') if x.strip()] if args.ids else None
+    except ValueError: parser.error("--ids takes comma separated numbers")
+    try:
+        with Session() as session: selected = select_profiles(session, args.select, ids)
+    except QueryError as e:
+        out.event("error", f"Query error: {e}", message=str(e)); return EXIT_NOTHING
+    if not selected:
+        out.event("error", "No profiles selected.", message="No profiles selected"); return EXIT_NOTHING
+
+    if args.command == "report":
+        with Session() as session: rows = report_rows(session, selected, args.days)
+        print_report(rows, out, args.days)
+        summary, code = {"mode": "report", "profiles": len(rows), "rows": rows}, EXIT_OK
+    else:
+        summary, code = run_job(args, selected, settings, out)
+        out.event("summary", f"{summary['scanned']} scanned, {len(summary['failed'])} failed (exit {code})", exit_code=code, **summary)
+
+    if args.json:
+        with open(args.json, 'w') as f: json.dump(summary, f, indent=4)
+    return code
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -1,31 +1,27 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from db_model import Base, Profile, MembershipLevel
+from db_model import Profile, MembershipLevel, EdgeFolder, Session, init_db
+from edge_profiles import edge_user_data_dir, detect_profiles, fingerprint_folders, DetectResult
+from sqlalchemy import select, insert, delete
 import os
-import json
-import sys
 
-# --- DATABASE PATH CONFIGURATION ---
-if getattr(sys, 'frozen', False):
-    # If running as a compiled EXE, put DB next to the .exe file
-    base_path = os.path.dirname(sys.executable)
-else:
-    # If running as a Python script, put DB next to this script file
-    base_path = os.path.dirname(os.path.abspath(__file__))
+class ProfileController:
+    def __init__(self, session=None):
+        # Shared engine/session factory from db_model, so the UI and the worker always open the same file
+        if session is None: init_db(verbose=False)
+        self.session = session or Session()
 
-DB_NAME = os.path.join(base_path, "profiles.db")
+    def get_all_profiles(self, fresh=False):
+        # fresh: drop cached attributes so rows written by other sessions (scan writer) are re-read
+        if fresh: self.session.expire_all()
+        return self.session.query(Profile).order_by(Profile.id).all()
 
-# Initialize Database
-engine = create_engine(f"sqlite:///{DB_NAME}")
-Base.metadata.create_all(engine)
-Session = sessionmaker(bind=engine)
+    def get_by_directory(self, edge_dir):
+        return self.session.query(Profile).filter(Profile.edge_profile_directory == edge_dir).first()
 
-class ProfileController:
-    def __init__(self):
-        self.session = Session()
+    def get_by_membership(self, level):
+        return self.session.query(Profile).filter(Profile.membership == MembershipLevel(level)).all()
 
-    def get_all_profiles(self):
-        return self.session.query(Profile).all()
+    def get_in_point_range(self, min_points, max_points):
+        return self.session.query(Profile).filter(Profile.available_points.between(min_points, max_points)).all()
 
     def add_profile(self, name, email=None, edge_dir="Default"):
         new_profile = Profile(
@@ -44,63 +40,73 @@ class ProfileController:
             self.session.delete(profile)
             self.session.commit()
 
-    def auto_detect_profiles(self):
-        """Scans the user's PC for Edge profiles automatically."""
-        local_app_data = os.getenv('LOCALAPPDATA')
-        if not local_app_data: return 0
-        
-        edge_user_data = os.path.join(local_app_data, 'Microsoft', 'Edge', 'User Data')
-        if not os.path.exists(edge_user_data): return 0
+    def auto_detect_profiles(self, user_data=None, workers=None):
+        """Scans the user's PC (or the given User Data folder) for Edge profiles automatically.
 
-        # Get existing directories to avoid duplicates
-        existing_dirs = {p.edge_profile_directory for p in self.get_all_profiles()}
-        new_count = 0
-        
-        try:
-            for item in os.listdir(edge_user_data):
-                # We look for folders named "Default" or "Profile X"
-                if item == "Default" or item.startswith("Profile "):
-                    full_path = os.path.join(edge_user_data, item)
-                    
-                    if os.path.isdir(full_path):
-                        # It's a valid profile if it has a 'Preferences' file
-                        if os.path.exists(os.path.join(full_path, "Preferences")):
-                            
-                            if item not in existing_dirs:
-                                # Try to grab the email
-                                email = "Unknown"
-                                display_name = item # Fallback name
+        Only folders whose Preferences mtime/size changed since the last scan are read again:
+        new ones are added, known ones get their email/name updated in place and folders
+        that disappeared are flagged in edge_folders (select them with the query word "missing").
+        The cache belongs to one User Data folder: when it's another one (setting changed, other
+        Edge channel), every folder is read again and nothing is flagged missing.
+        """
+        user_data = user_data or edge_user_data_dir()
+        if not user_data or not os.path.isdir(user_data): return DetectResult()
 
-                                try:
-                                    with open(os.path.join(full_path, "Preferences"), 'r', encoding='utf-8') as f:
-                                        data = json.load(f)
-                                        
-                                        # Attempt to get Email and Real Name
-                                        accounts = data.get('account_info', [])
-                                        if accounts and len(accounts) > 0:
-                                            email = accounts[0].get('email', 'Unknown')
-                                            full_name = accounts[0].get('full_name', '')
-                                            given_name = accounts[0].get('given_name', '')
-                                            
-                                            if full_name: display_name = full_name
-                                            elif given_name: display_name = given_name
-                                            
-                                        # Fallback to Profile Name if no account info
-                                        if display_name == item:
-                                            prof_name = data.get('profile', {}).get('name', '')
-                                            if prof_name: display_name = prof_name
+        root = os.path.normcase(os.path.abspath(user_data))
+        current = fingerprint_folders(user_data)
+        cached = {f.directory: f for f in self.session.scalars(select(EdgeFolder))}
+        cleared = any(f.root != root for f in cached.values())
+        if cleared:
+            self.session.execute(delete(EdgeFolder)); cached = {}
+        known_dirs = set(self.session.scalars(select(Profile.edge_profile_directory)))
+        changed = [d for d, fp in current.items()
+                   if d not in cached or (cached[d].mtime_ns, cached[d].size) != fp or not cached[d].present or d not in known_dirs]
+        removed = [d for d, f in cached.items() if f.present and d not in current]
+        if not changed and not removed:
+            if cleared: self.session.commit()
+            return DetectResult()
 
-                                except Exception as e:
-                                    pass
+        result = DetectResult(removed=len(removed), read=len(changed))
+        rows = detect_profiles(user_data, items=changed, workers=workers)
+        if rows:
+            taken = set(self.session.scalars(select(Profile.name)))     # Names are unique in the table
+            def free_name(name, item, current=None):
+                if name == current or name not in taken: return name
+                return f"{name} ({item})"
 
-                                if not email: email = None
+            existing = {p.edge_profile_directory: p for p in
+                        self.session.scalars(select(Profile).where(Profile.edge_profile_directory.in_([r["edge_profile_directory"] for r in rows])))}
+            new_rows = []
+            for row in rows:
+                item = row["edge_profile_directory"]
+                profile = existing.get(item)
+                if profile is None:
+                    row["name"] = free_name(row["name"], item); taken.add(row["name"])
+                    row["membership"] = MembershipLevel.MEMBER
+                    new_rows.append(row)
+                    continue
+                if row["name"] == item and row["email"] in (None, "Unknown"): continue    # Nothing readable, keep what we have
+                name = free_name(row["name"], item, profile.name) if row["name"] != item else profile.name
+                if (name, row["email"]) != (profile.name, profile.email):
+                    taken.discard(profile.name); taken.add(name)
+                    profile.name, profile.email = name, row["email"]
+                    result.updated += 1
+            # One transaction for all new profiles
+            if new_rows: self.session.execute(insert(Profile), new_rows)
+            result.added = len(new_rows)
+
+        for d in changed:
+            mtime_ns, size = current[d]
+            if d in cached: cached[d].mtime_ns, cached[d].size, cached[d].present = mtime_ns, size, True
+            else: self.session.add(EdgeFolder(directory=d, root=root, mtime_ns=mtime_ns, size=size, present=True))
+        for d in removed: cached[d].present = False
+        self.session.commit()
+        return result
 
-                                self.add_profile(display_name, email, item)
-                                new_count += 1
-        except Exception as e:
-            print(f"Error scanning: {e}")
-            
-        return new_count
+    def get_missing_profiles(self):
+        """Profiles whose Edge folder was gone at the last detection."""
+        gone = select(EdgeFolder.directory).where(EdgeFolder.present.is_(False))
+        return self.session.query(Profile).filter(Profile.edge_profile_directory.in_(gone)).order_by(Profile.id).all()
 
     def close(self):
         self.session.close()
\ No newline at end of file
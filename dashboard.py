@@ -0,0 +1,111 @@
+import re
+
+# --- WHAT ONE DASHBOARD READ PRODUCED ---
+# Kept free of cv2/tesseract so the engine, storage and fakes can use it.
+
+NUMBER = re.compile(r"^\d[\d,]*$")
+
+class Reading:
+    """Points and membership from one read, with per-field confidence (0-100) and the OCR stage that produced them.
+
+    Unpacks like the old (points, membership) tuple. `fields` has whatever else the page showed
+    (see FIELDS) and `spans` where each value sat in the parsed text.
+    """
+    __slots__ = ("points", "membership", "conf", "stage", "fields", "spans")
+
+    def __init__(self, points=None, membership=None, conf=None, stage=None, fields=None, spans=None):
+        self.points = points
+        self.membership = membership
+        self.conf = conf or {}      # {"points": 93, "membership": 88, "today": 90}; a field is missing when unknown
+        self.stage = stage          # "digits", "panel", "full" or "dom"
+        self.fields = fields or {}  # {"today": 175, "streak": 4, "pc_search": (90, 150)}
+        self.spans = spans or {}    # {"points": (start, end), ...} in the parsed text
+
+    def __iter__(self): return iter((self.points, self.membership))
+
+    def __bool__(self): return self.points is not None
+
+    def __repr__(self): return f"<Reading({self.points}, {self.membership}, conf={self.conf}, stage={self.stage}, fields={self.fields})>"
+
+EMPTY = Reading()
+
+# --- DASHBOARD TEXT PARSER ---
+# One pass over the OCR (or DevTools) text. The tokenizer splits it into labels,
+# values, tier words and line breaks; the parser hands each value to the oldest
+# label still waiting for that kind of value. That covers "Available points 4,290"
+# as well as the dashboard's columns, where OCR gives a line of labels
+# ("Available points  Auto-redeem  Today's points") above a line of values ("4,290 - 175").
+
+# field, label, value kind, reach (lines after the label its value may be on; None = any)
+FIELDS = (
+    ("points",        r"available\s+points",             "number",   None),
+    ("today",         r"today'?s\s+points",              "number",   1),
+    ("streak",        r"streak(?:\s+count)?",            "number",   1),
+    ("auto_redeem",   r"auto-?\s?redeem",                "setting",  1),
+    ("pc_search",     r"(?:pc|bing)\s+search(?:es)?",     "fraction", 1),
+    ("mobile_search", r"mobile\s+search(?:es)?",         "fraction", 1),
+)
+_KINDS = {name: kind for name, _, kind, _ in FIELDS}
+_REACH = {name: reach for name, _, _, reach in FIELDS}
+_ACCEPTS = {"number": ("number",), "setting": ("number", "dash"), "fraction": ("fraction",)}
+
+_TOKEN = re.compile("|".join(f"(?P<{name}>\\b{label})" for name, label, _, _ in FIELDS) + r"""
+  | (?P<days>\b\d+)\s*-?\s*days?\s+streak
+  | (?P<fraction>\d[\d,]*\s*/\s*\d[\d,]*)
+  | (?P<number>\d[\d,]*)
+  | (?P<tier>\b(?:gold|silver|member|level\s*[12])\b)
+  | (?P<dash>(?<![\w-])[-–—](?![\w-]))
+  | (?P<newline>\n)
+""", re.VERBOSE | re.IGNORECASE)
+
+TIERS = ("Member", "Silver", "Gold")       # Highest wins: "Gold Member" is Gold
+
+def _tier(word):
+    word = word.lower()
+    if word.startswith("level"): return TIERS[int(word[-1])]
+    return word.capitalize()
+
+def _number(text): return int(text.replace(",", ""))
+
+def parse_dashboard(text):
+    """Reading of every field found in dashboard text (stage and confidence left for the caller).
+    Falsy when there are no points."""
+    values, spans = {}, {}
+    pending = []            # [field, line] of labels waiting for a value, oldest first
+    tier, line = None, 0
+    for m in _TOKEN.finditer(text or ""):
+        kind = m.lastgroup
+        if kind == "newline":
+            line += 1
+            pending = [p for p in pending if _REACH[p[0]] is None or line - p[1] <= _REACH[p[0]]]
+        elif kind in _KINDS:
+            if kind not in values and all(p[0] != kind for p in pending): pending.append([kind, line])
+        elif kind == "tier":
+            found = _tier(m.group(kind))
+            if tier is None or TIERS.index(found) > TIERS.index(tier[0]): tier = (found, m.span())
+        elif kind == "days":
+            if "streak" not in values: values["streak"], spans["streak"] = int(m.group(kind)), m.span(kind)
+        else:
+            field = next((p for p in pending if kind in _ACCEPTS[_KINDS[p[0]]]), None)
+            if field is None: continue
+            pending.remove(field)
+            raw = m.group(kind)
+            if kind == "fraction": value = tuple(_number(v.strip()) for v in raw.split("/"))
+            elif kind == "dash": value = 0      # Auto-redeem off
+            else: value = _number(raw)
+            values[field[0]], spans[field[0]] = value, m.span(kind)
+    if tier: spans["membership"] = tier[1]
+    return Reading(values.pop("points", None), tier[0] if tier else None, fields=values, spans=spans)
+
+def word_confidence(data, match):
+    """Lowest confidence of the OCR words (image_to_data output) for which match(word) is true, or None."""
+    confs = [float(c) for w, c in zip(data["text"], data["conf"]) if w and w.strip() and float(c) >= 0 and match(w.strip())]
+    return int(round(min(confs))) if confs else None
+
+def span_confidence(data, offsets, spans):
+    """{field: lowest confidence of the OCR words its value spans}. `offsets` from roi_locator.words_to_text."""
+    conf = {}
+    for field, (start, end) in spans.items():
+        confs = [float(data["conf"][i]) for s, e, i in offsets if s < end and e > start and float(data["conf"][i]) >= 0]
+        if confs: conf[field] = int(round(min(confs)))
+    return conf
@@ -1,14 +1,44 @@
-from sqlalchemy import create_engine, String, Integer, DateTime
+from sqlalchemy import create_engine, event, inspect, text, String, Integer, SmallInteger, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, sessionmaker
 from datetime import datetime
 import enum
 import os
+import sys
 
-# 1. Define the Database File
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# 1. Define the Database File (the one place both the UI and the worker get it from)
+if getattr(sys, 'frozen', False):
+    # If running as a compiled EXE, put DB next to the .exe file
+    BASE_DIR = os.path.dirname(sys.executable)
+else:
+    # If running as a Python script, put DB next to this script file
+    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_FILE = os.path.join(BASE_DIR, "profiles.db")
 
-engine = create_engine(f"sqlite:///{DB_FILE}", echo=False)
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",      # Readers (UI) don't block the scan writer and vice versa
+    "synchronous": "NORMAL",    # Safe with WAL, far fewer fsyncs than FULL
+    "cache_size": -16000,       # 16 MB page cache per connection
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,       # Wait for a lock instead of failing with "database is locked"
+    "foreign_keys": "ON",       # Deleting a profile drops its scan history
+}
+
+def enable_wal(engine, pragmas=SQLITE_PRAGMAS):
+    """Applies the SQLite pragmas (WAL etc.) to every new pooled connection."""
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_conn, record):
+        cur = dbapi_conn.cursor()
+        for key, value in pragmas.items(): cur.execute(f"PRAGMA {key}={value}")
+        cur.close()
+
+def make_engine(path, pragmas=SQLITE_PRAGMAS):
+    # Small explicit pool: the UI thread, the scan writer and a worker read at most
+    engine = create_engine(f"sqlite:///{path}", echo=False, pool_size=3, max_overflow=2, pool_timeout=10,
+                           connect_args={"check_same_thread": False})
+    if pragmas: enable_wal(engine, pragmas)
+    return engine
+
+engine = make_engine(DB_FILE)
 Session = sessionmaker(bind=engine)
 
 class Base(DeclarativeBase):
@@ -32,25 +62,101 @@ class Profile(Base):
     # nullable=True allows us to save a profile even if we don't know the email yet
     email: Mapped[str] = mapped_column(String(100), nullable=True)
     
-    # Edge Folder: e.g., "Profile 1"
-    edge_profile_directory: Mapped[str] = mapped_column(String(100))
+    # Edge Folder: e.g., "Profile 1" (indexed: detection looks profiles up by folder)
+    edge_profile_directory: Mapped[str] = mapped_column(String(100), index=True)
     
-    # Membership Status
-    membership: Mapped[MembershipLevel] = mapped_column(default=MembershipLevel.MEMBER)
+    # Membership Status (indexed: selection by tier)
+    membership: Mapped[MembershipLevel] = mapped_column(default=MembershipLevel.MEMBER, index=True)
     
-    # Available Points (from Dashboard)
-    available_points: Mapped[int] = mapped_column(Integer, default=0)
+    # Available Points (from Dashboard) (indexed: selection by point range)
+    available_points: Mapped[int] = mapped_column(Integer, default=0, index=True)
     
     # Last Run Timestamp
     last_run: Mapped[datetime] = mapped_column(DateTime, nullable=True)
 
+    # OCR confidence (0-100) of the last points read; low values are worth a rescan ("conf<70")
+    points_conf: Mapped[int] = mapped_column(SmallInteger, nullable=True)
+
+    # The rest of the dashboard, as of details_run (only full page and DevTools reads see it)
+    today_points: Mapped[int] = mapped_column(Integer, nullable=True)
+    streak: Mapped[int] = mapped_column(SmallInteger, nullable=True)
+    search_points: Mapped[int] = mapped_column(SmallInteger, nullable=True)
+    search_max: Mapped[int] = mapped_column(SmallInteger, nullable=True)
+    mobile_points: Mapped[int] = mapped_column(SmallInteger, nullable=True)
+    mobile_max: Mapped[int] = mapped_column(SmallInteger, nullable=True)
+    # Auto-redeem goal in points, 0 when it's off
+    auto_redeem: Mapped[int] = mapped_column(Integer, nullable=True)
+    details_run: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+
     def __repr__(self):
         return f"<Profile(name={self.name}, email={self.email})>"
 
-def init_db():
+# Compact codes for the history table (index in the tuple is what gets stored)
+LEVEL_CODES = (MembershipLevel.MEMBER, MembershipLevel.SILVER, MembershipLevel.GOLD)
+SCAN_SOURCES = ("ocr", "dom")
+
+class ScanHistory(Base):
+    """Append-only: one row per successful scan. Queries live in history.py."""
+    __tablename__ = "scan_history"
+    __table_args__ = (Index("ix_scan_history_profile_ts", "profile_id", "ts"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    profile_id: Mapped[int] = mapped_column(ForeignKey("profiles.id", ondelete="CASCADE"))
+
+    # Unix seconds (UTC)
+    ts: Mapped[int] = mapped_column(Integer)
+    points: Mapped[int] = mapped_column(Integer)
+
+    # Index into LEVEL_CODES / SCAN_SOURCES
+    level: Mapped[int] = mapped_column(SmallInteger, default=0)
+    source: Mapped[int] = mapped_column(SmallInteger, default=0)
+
+    # Per-field read confidence, 0-100 (NULL when unknown)
+    points_conf: Mapped[int] = mapped_column(SmallInteger, nullable=True)
+    level_conf: Mapped[int] = mapped_column(SmallInteger, nullable=True)
+
+    def __repr__(self):
+        return f"<ScanHistory(profile_id={self.profile_id}, ts={self.ts}, points={self.points})>"
+
+class EdgeFolder(Base):
+    """Detection cache: fingerprint of each Edge profile folder's Preferences file (see edge_profiles.py)."""
+    __tablename__ = "edge_folders"
+
+    # Edge Folder: e.g., "Profile 1"
+    directory: Mapped[str] = mapped_column(String(100), primary_key=True)
+
+    # The User Data folder it was seen in; rows from another one are dropped (see ProfileController.auto_detect_profiles)
+    root: Mapped[str] = mapped_column(String(260), nullable=True)
+
+    # Preferences st_mtime_ns / st_size when it was last read
+    mtime_ns: Mapped[int] = mapped_column(Integer)
+    size: Mapped[int] = mapped_column(Integer)
+
+    # False once the folder is gone from User Data; its profile is kept but flagged
+    present: Mapped[bool] = mapped_column(Boolean, default=True)
+
+    def __repr__(self):
+        return f"<EdgeFolder({self.directory}, present={self.present})>"
+
+def add_missing_columns(bind):
+    """create_all doesn't alter existing tables: add (nullable) columns that older DBs lack."""
+    existing = inspect(bind)
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            have = {c["name"] for c in existing.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in have:
+                    conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(bind.dialect)}'))
+
+def init_db(bind=None, verbose=True):
     # This creates the tables defined above
-    Base.metadata.create_all(engine)
-    print(f"Database initialized at: {DB_FILE}")
+    bind = bind if bind is not None else engine
+    Base.metadata.create_all(bind)
+    add_missing_columns(bind)
+    # create_all skips indexes on tables that already exist, so add any that older DBs lack
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes: index.create(bind, checkfirst=True)
+    if verbose: print(f"Database initialized at: {DB_FILE}")
 
 if __name__ == "__main__":
     # If the file exists, we print a warning so you know to delete it if the schema changed
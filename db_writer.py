@@ -0,0 +1,123 @@
+import json
+import queue
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import update
+
+from db_model import Profile, MembershipLevel, ScanHistory
+from history import history_row
+
+_FLUSH = object()
+_STOP = object()
+
+def detail_columns(fields):
+    """Profile columns for the extra dashboard fields of a Reading, or {} when it has none (digits-only reads).
+
+    Written as a set: a field the page didn't show is cleared, so nothing older than details_run survives."""
+    fields = fields or {}
+    row = {"today_points": fields.get("today"), "streak": fields.get("streak"), "auto_redeem": fields.get("auto_redeem")}
+    row["search_points"], row["search_max"] = fields.get("pc_search") or (None, None)
+    row["mobile_points"], row["mobile_max"] = fields.get("mobile_search") or (None, None)
+    return row if any(v is not None for v in row.values()) else {}
+
+class ScanResultWriter:
+    """Write-behind queue for scan results, drained by a single DB writer thread.
+
+    put() never touches the database. The writer commits everything pending in
+    one transaction when flush() is called (end of a batch), every `flush_ms`,
+    or when `max_pending` results are waiting. Later results for the same
+    profile replace earlier unflushed ones on the profile row; every result is
+    appended to the scan history.
+    A failed commit keeps its rows for the next one. After `max_retries` failures
+    in a row (or a failure on close) they are appended to `dump_path` as JSON lines,
+    so nothing scanned is lost silently.
+    """
+    def __init__(self, session_factory, flush_ms=2000, max_pending=50, on_error=None, max_retries=3, dump_path=None):
+        self.Session = session_factory
+        self.flush_interval = flush_ms / 1000
+        self.max_pending = max_pending
+        self.on_error = on_error
+        self.max_retries = max_retries
+        self.dump_path = dump_path
+        self.failures = 0           # Failed commits in a row
+        self.dropped = 0            # Results given up on (and dumped)
+        self.queue = queue.Queue()
+        self.written = 0
+        self.transactions = 0
+        self.thread = threading.Thread(target=self._loop, name="ScanResultWriter", daemon=True)
+        self.thread.start()
+
+    def put(self, profile_id, points, membership, source="ocr", conf=None, fields=None):
+        try: level = MembershipLevel(membership)
+        except ValueError: level = MembershipLevel.MEMBER
+        row = {"id": profile_id, "available_points": points, "membership": level, "last_run": datetime.now(),
+               "points_conf": (conf or {}).get("points")}
+        details = detail_columns(fields)
+        if details: row.update(details, details_run=row["last_run"])
+        self.queue.put((profile_id, (row, history_row(profile_id, points, level, source, conf=conf))))
+
+    def flush(self, wait=False):
+        done = threading.Event()
+        self.queue.put((_FLUSH, done))
+        if wait: done.wait()
+
+    def close(self):
+        """Flushes whatever is pending and stops the writer thread."""
+        self.queue.put((_STOP, None))
+        self.thread.join()
+
+    def _loop(self):
+        pending, scans = {}, []
+        next_flush = time.monotonic() + self.flush_interval
+        while True:
+            try: key, item = self.queue.get(timeout=max(0.0, next_flush - time.monotonic()))
+            except queue.Empty: key, item = None, None
+
+            if key is _STOP:
+                self._write(pending, scans, last=True)
+                return
+            if key is _FLUSH:
+                pending, scans = self._write(pending, scans)
+                item.set()
+            elif key is not None:
+                pending[key] = item[0]      # A newer result replaces one still waiting for a retry
+                scans.append(item[1])
+
+            if (len(scans) >= self.max_pending and not self.failures) or time.monotonic() >= next_flush:     # Retries wait for the timer
+                pending, scans = self._write(pending, scans)
+            if time.monotonic() >= next_flush: next_flush = time.monotonic() + self.flush_interval
+
+    def _write(self, pending, scans, last=False):
+        """Commits the rows; (pending, scans) still to write, i.e. the same ones when a retry is due."""
+        if not pending: return {}, []
+        try:
+            with self.Session() as session, session.begin():
+                session.execute(update(Profile), list(pending.values()))  # Bulk UPDATE by primary key
+                session.execute(ScanHistory.__table__.insert(), scans)
+            self.written += len(pending)
+            self.transactions += 1
+            self.failures = 0
+            return {}, []
+        except Exception as e:
+            self.failures += 1
+            if self.on_error: self.on_error(e)
+            if not last and self.failures < self.max_retries: return pending, scans
+            self._dump(pending, scans)
+            self.failures = 0
+            return {}, []
+
+    def _dump(self, pending, scans):
+        self.dropped += len(pending)
+        if not self.dump_path: return
+        try:
+            with open(self.dump_path, 'a', encoding='utf-8') as f:
+                for row in pending.values(): f.write(json.dumps({"profile": row}, default=_plain) + "\n")
+                for row in scans: f.write(json.dumps({"history": row}, default=_plain) + "\n")
+        except OSError as e:
+            if self.on_error: self.on_error(e)
+
+def _plain(value):
+    """JSON for the dump: datetimes as ISO text, enums by value."""
+    return value.isoformat() if isinstance(value, datetime) else getattr(value, "value", str(value))
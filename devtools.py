@@ -0,0 +1,196 @@
+import base64
+import hashlib
+import json
+import os
+import re
+import socket
+import socketserver
+import struct
+import threading
+import urllib.parse
+import urllib.request
+
+# Minimal Chrome DevTools Protocol client (stdlib only): list page targets over HTTP,
+# then Runtime.evaluate over the target's WebSocket. Edge must be started with
+# --remote-debugging-port=<port> for this to work.
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+PAGE_TEXT_JS = "document.readyState === 'complete' && document.body ? document.body.innerText : ''"
+
+class DevToolsError(Exception):
+    pass
+
+# --- WEBSOCKET FRAMING (RFC 6455, text frames only) ---
+def _recv_exact(sock, n):
+    buf = b""
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk: raise DevToolsError("Connection closed")
+        buf += chunk
+    return buf
+
+def send_frame(sock, payload, mask=True, opcode=0x1, fin=True):
+    """One frame; fin=False (then opcode 0x0 for the rest) sends a message in fragments."""
+    data = payload.encode("utf-8") if isinstance(payload, str) else payload
+    header = bytes([(0x80 if fin else 0) | opcode])
+    length = len(data)
+    mask_bit = 0x80 if mask else 0
+    if length < 126: header += bytes([mask_bit | length])
+    elif length < 65536: header += bytes([mask_bit | 126]) + struct.pack("!H", length)
+    else: header += bytes([mask_bit | 127]) + struct.pack("!Q", length)
+    if mask:
+        key = os.urandom(4)
+        data = bytes(b ^ key[i % 4] for i, b in enumerate(data))
+        header += key
+    sock.sendall(header + data)
+
+def recv_frame(sock):
+    """Returns (opcode, payload bytes), joining continuation frames."""
+    payload, opcode = b"", None
+    while True:
+        b1, b2 = _recv_exact(sock, 2)
+        opcode = opcode if (b1 & 0x0F) == 0 else (b1 & 0x0F)
+        length = b2 & 0x7F
+        if length == 126: length = struct.unpack("!H", _recv_exact(sock, 2))[0]
+        elif length == 127: length = struct.unpack("!Q", _recv_exact(sock, 8))[0]
+        key = _recv_exact(sock, 4) if b2 & 0x80 else None
+        chunk = _recv_exact(sock, length)
+        if key: chunk = bytes(b ^ key[i % 4] for i, b in enumerate(chunk))
+        payload += chunk
+        if b1 & 0x80: return opcode, payload
+
+def _read_http_head(sock):
+    head = b""
+    while b"\r\n\r\n" not in head:
+        chunk = sock.recv(1024)
+        if not chunk: raise DevToolsError("Connection closed during handshake")
+        head += chunk
+    return head.decode("latin-1")
+
+# --- CLIENT ---
+class DevToolsClient:
+    def __init__(self, port=9222, host="127.0.0.1", timeout=5):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.next_id = 0
+
+    def list_targets(self):
+        url = f"http://{self.host}:{self.port}/json/list"
+        with urllib.request.urlopen(url, timeout=self.timeout) as resp:
+            return json.loads(resp.read().decode("utf-8"))
+
+    def find_page(self, scan_url):
+        """First page target on the same host as scan_url, or None."""
+        want = urllib.parse.urlparse(scan_url).netloc
+        for t in self.list_targets():
+            if t.get("type") == "page" and urllib.parse.urlparse(t.get("url", "")).netloc == want:
+                return t
+        return None
+
+    def evaluate(self, ws_url, expression):
+        u = urllib.parse.urlparse(ws_url)
+        sock = socket.create_connection((u.hostname, u.port or 80), self.timeout)
+        try:
+            key = base64.b64encode(os.urandom(16)).decode()
+            sock.sendall((f"GET {u.path} HTTP/1.1\r\nHost: {u.hostname}:{u.port}\r\nUpgrade: websocket\r\n"
+                          f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode())
+            if " 101 " not in _read_http_head(sock).split("\r\n", 1)[0]:
+                raise DevToolsError("WebSocket handshake refused")
+
+            self.next_id += 1
+            msg_id = self.next_id
+            send_frame(sock, json.dumps({"id": msg_id, "method": "Runtime.evaluate",
+                                         "params": {"expression": expression, "returnByValue": True}}))
+            while True:
+                opcode, payload = recv_frame(sock)
+                if opcode == 0x8: raise DevToolsError("Target closed the connection")
+                if opcode != 0x1: continue
+                msg = json.loads(payload.decode("utf-8"))
+                if msg.get("id") != msg_id: continue  # Protocol events
+                if "error" in msg: raise DevToolsError(msg["error"].get("message", "evaluate failed"))
+                result = msg.get("result", {})
+                if "exceptionDetails" in result: raise DevToolsError("Expression threw")
+                return result.get("result", {}).get("value")
+        finally:
+            sock.close()
+
+    def page_text(self, scan_url):
+        """Visible text of the loaded rewards page, or None while it is not there yet."""
+        try:
+            target = self.find_page(scan_url)
+            if not target or not target.get("webSocketDebuggerUrl"): return None
+            return self.evaluate(target["webSocketDebuggerUrl"], PAGE_TEXT_JS) or None
+        except (OSError, ValueError, DevToolsError):
+            return None
+
+# --- LOCAL STAND-IN SERVER (for tests, no browser) ---
+def html_to_text(html):
+    """Crude innerText: drops scripts/styles and tags, one line per block element."""
+    html = re.sub(r"(?is)<(script|style)\b.*?</\1>", "", html)
+    html = re.sub(r"(?i)<br\s*/?>|</(p|div|li|h\d|span|tr)>", "\n", html)
+    text = re.sub(r"<[^>]+>", "", html)
+    return "\n".join(line.strip() for line in text.splitlines() if line.strip())
+
+class StandInDevToolsServer:
+    """Serves one canned page through the same /json/list + WebSocket API as Edge.
+
+    Every Runtime.evaluate is answered with the page's text, which is all the
+    scanner asks for, after one protocol event the client has to skip. `fragment`
+    splits replies into frames of that many bytes.
+        server = StandInDevToolsServer(html, "https://rewards.bing.com/").start()
+        DevToolsClient(server.port).page_text("https://rewards.bing.com/")
+    """
+    def __init__(self, html, page_url, port=0, fragment=None):
+        self.text = html_to_text(html)
+        self.page_url = page_url
+        self.fragment = fragment
+        outer = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                head = _read_http_head(self.request)
+                path = head.split(" ", 2)[1]
+                if "upgrade: websocket" in head.lower(): outer._serve_ws(self.request, head)
+                elif path.startswith("/json"): outer._serve_json(self.request)
+                else: self.request.sendall(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        self.server = socketserver.ThreadingTCPServer(("127.0.0.1", port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown(); self.server.server_close()
+
+    def _serve_json(self, sock):
+        body = json.dumps([{"id": "1", "type": "page", "title": "Microsoft Rewards", "url": self.page_url,
+                            "webSocketDebuggerUrl": f"ws://127.0.0.1:{self.port}/devtools/page/1"}]).encode()
+        sock.sendall(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: "
+                     + str(len(body)).encode() + b"\r\n\r\n" + body)
+
+    def _serve_ws(self, sock, head):
+        key = re.search(r"(?i)sec-websocket-key:\s*(\S+)", head).group(1)
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        sock.sendall(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode())
+        try:
+            while True:
+                opcode, payload = recv_frame(sock)
+                if opcode == 0x8: return
+                msg = json.loads(payload.decode("utf-8"))
+                self._send(sock, json.dumps({"method": "Runtime.executionContextCreated", "params": {}}))
+                self._send(sock, json.dumps({"id": msg["id"], "result": {"result": {"type": "string", "value": self.text}}}))
+        except DevToolsError:
+            return
+
+    def _send(self, sock, message):
+        data = message.encode("utf-8")
+        step = self.fragment or len(data) or 1
+        parts = [data[i:i + step] for i in range(0, len(data), step)] or [b""]
+        for n, part in enumerate(parts):
+            send_frame(sock, part, mask=False, opcode=0x1 if n == 0 else 0x0, fin=n == len(parts) - 1)
@@ -0,0 +1,135 @@
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+# --- EDGE PROFILE DISCOVERY ---
+# A profile's Preferences file can be several MB, but only account_info and
+# profile.name are needed. Edge writes it as compact JSON with sorted keys, so
+# account_info sits near the top: the file is read in chunks and decoding stops
+# as soon as the wanted keys are complete; only keys of the top-level object count.
+# Folders are read on a thread pool.
+# Rescans compare each Preferences file's mtime/size with the edge_folders
+# table and only re-read folders that changed.
+
+CHUNK = 64 * 1024
+_STRUCT = re.compile(rb'["{}]')
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"\s*:?')
+_FLAT = rb'[^"{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"{}]*)*'       # No braces outside strings (unrolled, so it can't backtrack badly)
+_SKIP = re.compile(_FLAT + rb'(?:\{' + _FLAT + rb'\}' + _FLAT + rb')*')     # Up to the next brace that changes depth
+_KEYS = (b'"account_info"', b'"profile"')
+
+def edge_user_data_dir(local_app_data=None):
+    local_app_data = local_app_data or os.getenv('LOCALAPPDATA')
+    if not local_app_data: return None
+    path = os.path.join(local_app_data, 'Microsoft', 'Edge', 'User Data')
+    return path if os.path.isdir(path) else None
+
+class DetectResult:
+    def __init__(self, added=0, updated=0, removed=0, read=0):
+        self.added = added          # New profiles inserted
+        self.updated = updated      # Existing profiles whose email/name changed in Edge
+        self.removed = removed      # Profiles whose folder disappeared (flagged, not deleted)
+        self.read = read            # Preferences files parsed
+
+    def __bool__(self): return bool(self.added or self.updated or self.removed)
+
+    def __repr__(self): return f"<DetectResult(added={self.added}, updated={self.updated}, removed={self.removed}, read={self.read})>"
+
+def fingerprint_folders(user_data):
+    """{folder: (mtime_ns, size)} of every "Default"/"Profile N" folder's Preferences file, one stat each.
+    Raises OSError if User Data itself can't be listed (an empty result would read as every folder removed)."""
+    out = {}
+    with os.scandir(user_data) as it:
+        for entry in it:
+            if entry.name == "Default" or entry.name.startswith("Profile "):
+                try: st = os.stat(os.path.join(entry.path, "Preferences"))
+                except OSError: continue
+                out[entry.name] = (st.st_mtime_ns, st.st_size)
+    return out
+
+def list_profile_dirs(user_data):
+    """Folder names that look like profiles, i.e. have a Preferences file."""
+    return sorted(fingerprint_folders(user_data))
+
+class _TopLevelKeys:
+    """Finds the wanted keys of the top-level object in a growing buffer, each byte scanned once.
+    Strings are skipped whole, so braces inside them and nested objects reusing a key don't count."""
+    def __init__(self):
+        self.pos, self.depth = 0, 0
+        self.found = {}             # key -> offset of its value
+        self.done = 0               # Values starting before this offset are complete in the buffer
+
+    def scan(self, buf):
+        # Only {} count: keys live in objects, so a key is top-level exactly at object depth 1
+        while True:
+            if self.depth > 1:      # Inside a nested object nothing matters but braces (innermost objects are skipped whole)
+                self.pos = _SKIP.match(buf, self.pos).end()
+                if self.pos == len(buf) or buf[self.pos] == 0x22: return     # A cut off string: wait for the rest
+                self.depth += 1 if buf[self.pos] == 0x7B else -1
+                self.pos += 1
+                continue
+            m = _STRUCT.search(buf, self.pos)
+            if not m: self.pos = len(buf); return
+            if buf[m.start()] == 0x22:      # '"'
+                s = _STRING.match(buf, m.start())
+                if not s or s.end() == len(buf): self.pos = m.start(); return
+                if self.depth == 1 and s.group().endswith(b":"):
+                    self.done = m.start()
+                    key = s.group().rstrip(b": \t\r\n")
+                    if key in _KEYS and key not in self.found: self.found[key] = s.end()
+                self.pos = s.end()
+            else:
+                self.depth += 1 if buf[m.start()] == 0x7B else -1
+                if self.depth == 0: self.done = m.start()
+                self.pos = m.end()
+
+    def value(self, buf, key):
+        """The key's JSON value once it is complete, else None."""
+        start = self.found.get(key)
+        if start is None or start >= self.done: return None
+        return json.JSONDecoder().raw_decode(buf[start:self.done].decode('utf-8', 'replace').lstrip())[0]
+
+def read_identity(path, chunk_size=CHUNK):
+    """(email, full_name, given_name, profile_name) from a Preferences file, reading only as far as needed.
+    Like data['account_info'] / data['profile']['name']: only top-level keys count."""
+    buf, keys, accounts, profile = bytearray(), _TopLevelKeys(), None, None
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            buf += chunk
+            keys.scan(buf)
+            if accounts is None: accounts = keys.value(buf, b'"account_info"')
+            if accounts is not None:
+                first = accounts[0] if isinstance(accounts, list) and accounts else {}
+                if first.get('full_name') or first.get('given_name'): break
+            if profile is None: profile = keys.value(buf, b'"profile"')
+            if profile is not None and accounts is not None: break
+            if not chunk:
+                if accounts is None and profile is None:    # Not the layout we expect: fall back to a full parse
+                    data = json.loads(buf.decode('utf-8'))
+                    accounts, profile = data.get('account_info', []), data.get('profile', {})
+                break
+    first = accounts[0] if isinstance(accounts, list) and accounts else {}
+    prof_name = profile.get('name') if isinstance(profile, dict) else None
+    return first.get('email', 'Unknown'), first.get('full_name', ''), first.get('given_name', ''), prof_name or ''
+
+def describe_profile(user_data, item):
+    """{"name", "email", "edge_profile_directory"} for one profile folder, same fallbacks as before."""
+    email, display_name = "Unknown", item
+    try:
+        email, full_name, given_name, prof_name = read_identity(os.path.join(user_data, item, "Preferences"))
+        if full_name: display_name = full_name
+        elif given_name: display_name = given_name
+        elif prof_name: display_name = prof_name
+    except Exception:
+        pass
+    return {"name": display_name, "email": email or None, "edge_profile_directory": item}
+
+def detect_profiles(user_data, items=None, skip=(), workers=None):
+    """Reads the given profile folders (default: all of them not in `skip`) on a thread pool; rows in folder order."""
+    items = sorted(d for d in (list_profile_dirs(user_data) if items is None else items) if d not in skip)
+    if not items: return []
+    workers = workers or min(16, (os.cpu_count() or 4) * 2, len(items))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="detect") as pool:
+        return list(pool.map(lambda item: describe_profile(user_data, item), items))
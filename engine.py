@@ -0,0 +1,375 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+import readiness
+from dashboard import Reading
+from readiness import wait_until_async, WaitStats
+from tracing import NULL_TRACER
+
+# --- ASYNCIO AUTOMATION ENGINE ---
+# Drives scan / start / launch jobs through the backend interfaces in backends.py,
+# so the same code runs against Edge on Windows or the fakes in fakes.py anywhere.
+#
+# Three kinds of work, each on its own lane:
+#   screen  one thread: launching, windows, input and capture (the screen is shared, and mss handles are per thread)
+#   ocr     one thread: OCR of frames captured earlier, or worker processes (ocr_pool) when the backends have them
+#   io      DevTools reads and storage flushes
+# With overlap on, a profile's frame is OCR'd while the next profile launches and
+# loads, and a batch commits while the next batch starts. Frames whose quick OCR
+# finds no points are retried at the end of the batch the careful (sequential) way.
+# On worker processes the careful way keeps capturing on every repaint while earlier
+# frames are still being read; the first frame with points wins and the rest are dropped.
+
+class AutomationEngine:
+    TIMEOUTS = {"window": 5, "load": 10, "load_stable": 0.5, "search_load_stable": 0.8, "search": 3,
+                "devtools": 20, "repaint": 1.5, "attempts": 15, "batch_pause": 5}
+
+    def __init__(self, mode, batch_size=5, search_count=30, scan_url="https://rewards.bing.com/pointsbreakdown", update_after=True,
+                 scan_source="ocr", on_log=None, on_result=None, tracer=None, overlap=True, timeouts=None, min_conf=80):
+        self.mode = mode
+        self.batch_size = batch_size
+        self.search_count = search_count
+        self.scan_url = scan_url
+        self.update_after = update_after
+        self.scan_source = scan_source      # "ocr" or "dom" (DevTools, OCR as fallback)
+        self.on_log = on_log or print
+        self.on_result = on_result          # on_result(profile_id, points, membership)
+        self.tracer = tracer or NULL_TRACER
+        self.overlap = overlap
+        self.timeouts = {**self.TIMEOUTS, **(timeouts or {})}
+        self.min_conf = min_conf            # Reads below this are stored but flagged in the log (select them with conf<N)
+        self.is_running = True
+        self.waits = WaitStats()
+        self.b = None                       # Backends, built on the screen thread by run()
+        self.pool = None                    # Their OcrPipeline, until it fails
+        self.selected = 0
+        self.results = []                   # {"id", "name", "points", "membership", "source", "conf", + Reading.fields} per successful scan
+        self.failed = []                    # Names of profiles whose scan timed out
+        self.error = None
+
+    def log(self, message): self.on_log(message)
+
+    def record(self, profile, points, membership, source, conf=None, fields=None):
+        self.results.append({"id": profile.id, "name": profile.name, "points": points, "membership": membership, "source": source,
+                             "conf": conf or {}, **(fields or {})})
+        if self.on_result: self.on_result(profile.id, points, membership)
+
+    def summary(self):
+        return {"mode": self.mode, "profiles": self.selected, "scanned": len(self.results), "failed": self.failed,
+                "stopped": not self.is_running, "error": self.error, "results": self.results}
+
+    def stop(self): self.is_running = False     # Safe from any thread
+
+    # --- Lanes ---
+    # Each call runs in a copy of the caller's context, so spans on a lane keep the Tracer.bind attributes
+    async def screen(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.screen_pool, contextvars.copy_context().run, fn, *args)
+
+    async def io(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.io_pool, contextvars.copy_context().run, fn, *args)
+
+    async def wait(self, condition, name, timeout=None, lane=None):
+        return await wait_until_async(condition, timeout or self.timeouts[name], name=name, keep_going=lambda: self.is_running,
+                                      stats=self.waits, executor=lane or self.screen_pool)
+
+    # --- Run ---
+    async def run(self, make_backends, selected_ids):
+        """Runs the whole job. make_backends() is called on the screen thread; returns summary()."""
+        self.selected = len(selected_ids)
+        self.screen_pool = ThreadPoolExecutor(1, thread_name_prefix="screen")
+        self.ocr_pool = ThreadPoolExecutor(1, thread_name_prefix="ocr")
+        self.io_pool = ThreadPoolExecutor(2, thread_name_prefix="io")
+        self.ocr_tasks, self.retry = [], []
+        flush_task = warm_up = None
+        try:
+            self.b = await self.screen(make_backends)
+            self.pool = self.b.ocr_pool
+            if self.pool:
+                self.log(f"OCR on {self.pool.workers} worker processes")
+                warm_up = asyncio.ensure_future(self.io(self.pool.warm_up))    # Workers start while the first browser opens
+            await self.screen(self.b.windows.baseline)
+            profiles = await self.io(self.b.storage.load_profiles, selected_ids)
+            self.log(f"Starting {self.mode.upper()}. Total: {len(profiles)}")
+            batches = [profiles[i:i + self.batch_size] for i in range(0, len(profiles), self.batch_size)]
+
+            for i, batch in enumerate(batches):
+                if not self.is_running: break
+                self.log(f"--- Batch {i+1}/{len(batches)} ({len(batch)} profiles) ---")
+                with self.tracer.bind(batch=i + 1), self.tracer.span("batch", mode=self.mode, size=len(batch)):
+                    if self.mode == "scan":
+                        await self.scan_batch(batch)
+                    elif self.mode == "start":
+                        await self.search_batch(batch)
+                        await self.close_all()
+                        if self.is_running and self.update_after:
+                            self.log("Searches finished. Verifying details...")
+                            await self.scan_batch(batch)
+                    elif self.mode == "launch":
+                        await self.launch_batch(batch)
+
+                    # One transaction per batch; with overlap the next batch starts while it commits
+                    if flush_task: await flush_task
+                    flush_task = asyncio.ensure_future(self.flush(len(batch)))
+                    if not self.overlap: await flush_task
+                if self.mode == "launch" and i < len(batches) - 1:
+                    self.log(f"Waiting {self.timeouts['batch_pause']}s before next batch...")
+                    await wait_until_async(lambda: False, self.timeouts["batch_pause"], keep_going=lambda: self.is_running)
+
+            if flush_task: await flush_task
+            ocr = self.b.ocr
+            if ocr.ocr_skipped: self.log(f"OCR: {ocr.ocr_calls} calls, {ocr.ocr_skipped} avoided (unchanged frames)")
+            if any(ocr.stages.values()): self.log("OCR stages: " + ", ".join(f"{k} {v}" for k, v in ocr.stages.items()))
+            if self.waits.waits: self.log(f"Waits: {self.waits.summary()}")
+            if self.tracer.enabled: self.log(self.tracer.summary())
+            self.log("All Batches Complete.")
+
+        except Exception as e:
+            self.error = str(e)
+            self.log(f"Worker Error: {str(e)}")
+
+        finally:
+            if self.ocr_tasks: await asyncio.gather(*self.ocr_tasks, return_exceptions=True)
+            if warm_up: await asyncio.gather(warm_up, return_exceptions=True)
+            if flush_task and not flush_task.done(): await asyncio.gather(flush_task, return_exceptions=True)
+            if self.b: await self.screen(self.b.close)
+            for pool in (self.screen_pool, self.ocr_pool, self.io_pool): pool.shutdown(wait=True)
+        return self.summary()
+
+    async def flush(self, count):
+        with self.tracer.span("db_commit", profiles=count):
+            await self.io(self.b.storage.flush)
+
+    async def close_all(self):
+        handed_off = self.b.launcher.handed_off
+        with self.tracer.span("close"):
+            await self.screen(self.b.launcher.close_all)
+            self.b.windows.clear()
+        if self.b.launcher.handed_off > handed_off and not handed_off:
+            self.log("Edge was already open outside the app: its windows are left alone. Close Edge before a run.")
+
+    async def launch(self, profile, url=None, debug=False):
+        """Launches the profile's browser and waits for its window; the window handle, or None on timeout."""
+        profile_dir = profile.edge_profile_directory
+        with self.tracer.span("launch", profile_id=profile.id):
+            await self.screen(self.b.launcher.launch, profile_dir, url, debug)
+            result = await self.wait(lambda: self.b.windows.claim(profile_dir), "window")
+        return result.value if result else None
+
+    # --- Launch ---
+    async def launch_batch(self, batch):
+        self.log("Launching browsers...")
+        for profile in batch:
+            if not self.is_running: break
+            await self.launch(profile, self.scan_url)
+
+    # --- Searches ---
+    async def search_batch(self, batch):
+        self.log("Cleaning up previous windows...")
+        await self.close_all()
+
+        self.log("Launching browsers...")
+        for profile in batch:
+            if not self.is_running: return
+            await self.launch(profile)
+
+        self.log("Waiting for browsers to load...")
+        with self.tracer.span("load_wait"):
+            await self.wait(readiness.frame_stable(self.b.capture, self.timeouts["search_load_stable"]), "load")
+
+        windows = []
+        for profile in batch:       # Late windows get one more chance to be claimed
+            handle = await self.screen(self.b.windows.claim, profile.edge_profile_directory)
+            if handle is not None: windows.append(handle)
+            else: self.log(f"[{profile.name}] No window found, skipping its searches")
+        if not windows:
+            self.log("Error: No valid Edge windows found!")
+            return
+
+        total_searches_needed = int(self.search_count / 3)
+        self.log(f"Target: {self.search_count} Pts ({total_searches_needed} searches)")
+        for i in range(total_searches_needed):
+            if not self.is_running: break
+            with self.tracer.span("search_round", round=i + 1, windows=len(windows)):
+                await self.search_round(windows)
+            self.log(f"Progress: {i+1}/{total_searches_needed}")
+
+    async def search_round(self, windows):
+        def type_word(win):
+            self.b.windows.activate(win)
+            word = self.b.words.word()
+            self.b.input.search(word)
+            return word
+        for win in windows:
+            try:
+                word = await self.screen(type_word, win)
+                await self.wait(lambda: word.lower() in self.b.windows.active_title().lower(), "search")
+            except Exception: pass
+
+    # --- Scans ---
+    async def scan_batch(self, batch):
+        for profile in batch:
+            if not self.is_running: break
+            with self.tracer.span("profile", profile_id=profile.id, profile=profile.name):
+                if self.overlap: await self.scan_quick(profile)
+                else: await self.scan_profile(profile)
+        if self.ocr_tasks:
+            await asyncio.gather(*self.ocr_tasks)
+            self.ocr_tasks = []
+        retry, self.retry = self.retry, []
+        for profile in retry:                   # Quick OCR found nothing: the careful way, one at a time
+            if not self.is_running: break
+            self.log(f"[{profile.name}] Retrying with live OCR")
+            with self.tracer.span("profile", profile_id=profile.id, profile=profile.name, retry=True):
+                await self.scan_profile(profile)
+
+    async def launch_profile(self, profile):
+        """Opens the profile's dashboard. The Reading if DevTools could read it, else None once the page settled."""
+        self.log(f"Scanning: {profile.name}")
+        with self.tracer.span("launch", profile_id=profile.id):
+            await self.screen(self.b.launcher.launch, profile.edge_profile_directory, self.scan_url, self.scan_source == "dom")
+        if self.scan_source == "dom":
+            with self.tracer.span("dom_read", profile_id=profile.id):
+                result = await self.wait(lambda: self.b.page.read(self.scan_url), "devtools", lane=self.io_pool)
+            if result: return result.value
+            if self.is_running: self.log(f"[{profile.name}] DevTools read failed, falling back to OCR")
+        self.log("Waiting for page load...")
+        with self.tracer.span("load_wait", profile_id=profile.id):
+            if await self.wait(lambda: self.b.windows.claim(profile.edge_profile_directory), "window"):
+                await self.wait(readiness.frame_stable(self.b.capture, self.timeouts["load_stable"]), "load")
+        return None
+
+    def finish(self, profile, reading, source):
+        if reading:
+            points, final_mem = reading.points, reading.membership or "Member"
+            conf = reading.conf
+            self.b.storage.put(profile.id, points, final_mem, source, conf, reading.fields)    # Committed with the rest of the batch
+            self.record(profile, points, final_mem, source, conf, reading.fields)
+            low = f" (low confidence {conf['points']}%)" if conf.get("points", 100) < self.min_conf else ""
+            self.log(f"[{profile.name}] Success: {points} Pts | {final_mem}{low}")
+        else:
+            self.failed.append(profile.name)
+            self.log(f"[{profile.name}] Failed: Timed out")
+
+    def snapshot(self):
+        """(frame copy, screen size, region) of the page as it is now; copies because capture buffers are reused."""
+        size = self.b.capture.size()
+        region = self.b.ocr.region(size)
+        return self.b.capture.grab(region=region).copy(), size, region
+
+    def read_snapshot(self, profile_id, frame, size, region, reset=False):
+        if reset: self.b.ocr.reset_memo()   # Different profiles can render near identical pages
+        with self.tracer.bind(profile_id=profile_id):
+            return self.b.ocr.read_snapshot(frame, size, region)
+
+    async def ocr(self, profile_id, frame, size, region, reset=False):
+        return await asyncio.get_running_loop().run_in_executor(self.ocr_pool, contextvars.copy_context().run, self.read_snapshot,
+                                                                profile_id, frame, size, region, reset)
+
+    # --- OCR worker processes (ocr_pool.OcrPipeline) ---
+    async def shoot(self, token):
+        """Captures the page into a free pool slot (waiting for one while OCR is behind) and queues its OCR.
+        The job's future, or None for a frame this scan already submitted."""
+        pool = self.pool
+        slot = await pool.acquire()
+        try: shot = await self.screen(pool.fill, token, slot, self.b.capture)
+        except Exception:
+            pool.release(slot); raise
+        if shot is None:
+            pool.release(slot); return None
+        return pool.submit(token, slot, shot)
+
+    def first_done(self, pending):
+        """Reading of a finished job that found points (finished jobs leave `pending`), else an empty one."""
+        for fut in [f for f in pending if f.done()]:
+            pending.discard(fut)
+            if fut.cancelled(): continue
+            if fut.exception():
+                self.pool_failed(fut.exception()); continue
+            result = fut.result()
+            if result and result[0]: return result[0]
+        return Reading()
+
+    def pool_failed(self, e):
+        if self.pool is None: return
+        self.pool = None        # Backends.close() still shuts it down
+        self.log(f"OCR workers failed ({e}), reading on a thread instead")
+
+    async def scan_pooled(self, profile):
+        """scan_profile on the worker processes: a frame per repaint while earlier ones are read; first valid one wins."""
+        pool, pending = self.pool, set()
+        token = pool.begin()
+        try:
+            for attempt in range(self.timeouts["attempts"]):
+                if not (self.is_running and self.pool): break
+                with self.tracer.span("capture", profile_id=profile.id):
+                    fut = await self.shoot(token)
+                if fut: pending.add(fut)
+                changed = await self.screen(readiness.frame_changed, self.b.capture)
+                with self.tracer.span("retry_wait", profile_id=profile.id, attempt=attempt + 1):
+                    await self.wait(lambda: changed() or any(f.done() for f in pending), "repaint")
+                reading = self.first_done(pending)
+                if reading: return reading
+            while pending and self.is_running:      # Out of attempts: the frames still being read
+                await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                reading = self.first_done(pending)
+                if reading: return reading
+            return Reading()
+        finally:
+            pool.cancel(token)      # Drops the frames nobody needs any more
+
+    async def scan_quick(self, profile):
+        """Launch, wait, capture one frame and close; the OCR runs in the background while the next profile loads."""
+        found = await self.launch_profile(profile)
+        if found:
+            await self.close_all()
+            self.finish(profile, found, "dom")
+            return
+        if not self.is_running: return
+        pool, token, job = self.pool, None, None
+        try:                        # Until read() owns the token, any failure here gives it back
+            with self.tracer.span("capture", profile_id=profile.id):
+                if pool:
+                    token = pool.begin()
+                    job = await self.shoot(token)
+                else: shot = await self.screen(self.snapshot)
+            await self.close_all()
+        except BaseException:
+            if token is not None: pool.cancel(token)
+            raise
+
+        async def read():
+            try:
+                if pool:
+                    if job is not None: await asyncio.wait([job])
+                    reading = self.first_done({job}) if job is not None else Reading()     # No frame: retried below
+                else: reading = await self.ocr(profile.id, *shot, reset=True)
+            finally:
+                if token is not None: pool.cancel(token)
+            if reading: self.finish(profile, reading, "ocr")
+            else: self.retry.append(profile)
+        self.ocr_tasks.append(asyncio.ensure_future(read()))
+
+    async def scan_profile(self, profile):
+        """The careful path: OCR the live page until the points show up, re-reading whenever it repaints."""
+        reading = await self.launch_profile(profile)
+        source = "dom" if reading else "ocr"
+        skipped_before = self.b.ocr.ocr_skipped
+        reset = True
+        if self.pool and not reading: reading = await self.scan_pooled(profile)
+        for attempt in range(0 if reading or self.pool else self.timeouts["attempts"]):
+            if not self.is_running: break
+            shot = await self.screen(self.snapshot)
+            reading = await self.ocr(profile.id, *shot, reset=reset)
+            reset = False
+            if not reading and shot[2] is not None:     # The panel moved: full frame straight away
+                shot = await self.screen(self.snapshot)
+                reading = await self.ocr(profile.id, *shot)
+            if reading: break
+            changed = await self.screen(readiness.frame_changed, self.b.capture)
+            with self.tracer.span("retry_wait", profile_id=profile.id, attempt=attempt + 1):
+                await self.wait(changed, "repaint")
+        self.finish(profile, reading, source)
+        skipped = self.b.ocr.ocr_skipped - skipped_before
+        if skipped: self.log(f"[{profile.name}] Page unchanged, {skipped} OCR calls avoided")
+        await self.close_all()
@@ -0,0 +1,295 @@
+import json
+import os
+import random
+import sys
+import threading
+import time
+from functools import partial
+
+import numpy as np
+
+from dashboard import Reading
+from backends import Backends, ProcessLauncher, WindowManager, InputDevice, PageReader, Storage
+
+# --- IN-MEMORY BACKENDS ---
+# A pretend desktop for running the engine without Edge, a screen or a database
+# (Linux CI, the engine benchmark). Windows appear `launch_delay` after launch and
+# finish loading `load_delay` later; until then the screen keeps changing, like a
+# page that is still painting. A loaded page carries its profile's index in the
+# top left pixels, which FakeOcr "reads" after sleeping `ocr_delay`.
+
+_MAGIC = (0xA5, 0x5A)
+
+class FakeProfile:
+    def __init__(self, id, name, edge_profile_directory, points=0, membership="Member"):
+        self.id = id
+        self.name = name
+        self.edge_profile_directory = edge_profile_directory
+        self.points = points            # What the fake dashboard shows
+        self.membership = membership
+
+    def __repr__(self): return f"<FakeProfile({self.id}, {self.name!r})>"
+
+def make_profiles(count, seed=3):
+    rng = np.random.default_rng(seed)
+    tiers = ("Member", "Silver", "Gold")
+    return [FakeProfile(i, f"Profile {i}", "Default" if i == 1 else f"Profile {i - 1}", int(rng.integers(0, 20000)), tiers[i % 3])
+            for i in range(1, count + 1)]
+
+class FakeWindow:
+    def __init__(self, handle, pid, profile, opened, title=None):
+        self.handle = handle
+        self.pid = pid
+        self.profile = profile          # None for a stray window
+        self.opened = opened
+        self.title = title or f"New tab - {profile.name} - Microsoft Edge"
+
+class FakeDesktop:
+    """Shared state behind the fake launcher, windows, input and capture."""
+    def __init__(self, profiles, launch_delay=0.05, load_delay=0.2, size=(320, 200)):
+        self.by_dir = {p.edge_profile_directory: p for p in profiles}
+        self.index = {p.id: n for n, p in enumerate(profiles, 1)}
+        self.by_index = dict(enumerate(profiles, 1))
+        self.launch_delay = launch_delay
+        self.load_delay = load_delay
+        self.size = size
+        self.windows = []               # Launch order; the last visible one is in front
+        self.active = None
+        self.launches = 0
+        self.next_handle = 100
+        self.lock = threading.Lock()
+
+    def open(self, profile, pid, title=None):
+        with self.lock:
+            self.next_handle += 1
+            win = FakeWindow(self.next_handle, pid, profile, time.monotonic(), title)
+            self.windows.append(win)
+        return win
+
+    def stray(self, title="Inbox - Outlook - Microsoft Edge"):
+        """A window we didn't launch (the user's own Edge), shown in front."""
+        return self.open(None, pid=1, title=title)
+
+    def visible(self, now=None):
+        now = time.monotonic() if now is None else now
+        with self.lock: return [w for w in self.windows if now >= w.opened + self.launch_delay]
+
+    def front(self):
+        wins = [w for w in self.visible() if w.profile]
+        return wins[-1] if wins else None
+
+    def loaded(self, win, now=None):
+        now = time.monotonic() if now is None else now
+        return now >= win.opened + self.launch_delay + self.load_delay
+
+class FakeLauncher(ProcessLauncher):
+    """One fake process per launch (pids from 1000 up); closing removes only its windows."""
+    def __init__(self, desktop):
+        self.d = desktop
+        self.procs = {}                 # profile_dir -> pid
+        self.next_pid = 1000
+
+    def launch(self, profile_dir, url=None, debug=False):
+        self.next_pid += 1
+        self.procs[profile_dir] = self.next_pid
+        self.d.open(self.d.by_dir[profile_dir], self.next_pid)
+        self.d.launches += 1
+
+    def close_all(self):
+        ours = set(self.procs.values())
+        with self.d.lock:
+            self.d.windows = [w for w in self.d.windows if w.pid not in ours]
+            if self.d.active and self.d.active.pid in ours: self.d.active = None
+        self.procs = {}
+
+    def any_running(self):
+        ours = set(self.procs.values())
+        with self.d.lock: return any(w.pid in ours for w in self.d.windows)
+
+    def pids(self): return dict(self.procs)
+
+class FakeWindows(WindowManager):
+    def __init__(self, desktop, pids):
+        super().__init__(pids)
+        self.d = desktop
+        self.listed = 0                 # list_windows() calls, i.e. enumerations
+
+    def list_windows(self):
+        self.listed += 1
+        return [(w.handle, w.pid) for w in reversed(self.d.visible())]
+
+    def alive(self, handle):
+        with self.d.lock: return any(w.handle == handle for w in self.d.windows)
+
+    def activate(self, handle):
+        with self.d.lock: self.d.active = next((w for w in self.d.windows if w.handle == handle), None)
+
+    def active_title(self): return self.d.active.title if self.d.active else ""
+
+class FakeInput(InputDevice):
+    def __init__(self, desktop):
+        self.d = desktop
+        self.searches = 0
+
+    def search(self, text):
+        if self.d.active: self.d.active.title = f"{text} - Search - Microsoft Edge"
+        self.searches += 1
+
+class FakeWords:
+    def __init__(self): self.n = 0
+
+    def word(self):
+        self.n += 1
+        return f"word{self.n}"
+
+class FakeCapture:
+    """Gray frames of the fake desktop: noise that changes every `tick` while the front window loads."""
+    name = "fake"
+
+    def __init__(self, desktop, tick=0.03):
+        self.d = desktop
+        self.tick = tick
+        self.grabs = 0
+
+    def size(self): return self.d.size
+
+    def frame(self):
+        w, h = self.d.size
+        win = self.d.front()
+        if win is None: return np.full((h, w), 40, np.uint8)
+        if not self.d.loaded(win):
+            step = int(time.monotonic() / self.tick)
+            return np.random.default_rng(step).integers(0, 256, (h, w), dtype=np.uint8)
+        n = self.d.index[win.profile.id]
+        frame = np.full((h, w), 230, np.uint8)
+        frame[0, 0:4] = (_MAGIC[0], n >> 8, n & 0xFF, _MAGIC[1])
+        return frame
+
+    def grab(self, region=None, gray=True, scale=1):
+        import cv2
+        self.grabs += 1
+        frame = self.frame()
+        if region:
+            x, y, w, h = region
+            frame = frame[y:y + h, x:x + w]
+        if not gray: frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2RGB)
+        if scale != 1:
+            frame = cv2.resize(frame, (max(1, int(frame.shape[1] * scale)), max(1, int(frame.shape[0] * scale))), interpolation=cv2.INTER_AREA)
+        return frame
+
+    def close(self): pass
+
+class FakeOcr:
+    """Stands in for scanner.DashboardScanner: decodes the page token, slowly. `fail_first` misses per profile first.
+
+    Built from the desktop's `by_index` only, so ocr_pool can rebuild it in a worker process.
+    """
+    def __init__(self, by_index, ocr_delay=0.3, fail_first=0):
+        self.by_index = by_index
+        self.ocr_delay = ocr_delay
+        self.fail_first = fail_first
+        self.misses = {}
+        self.ocr_calls = 0
+        self.ocr_skipped = 0
+        self.stages = {"digits": 0, "panel": 0, "full": 0}
+
+    def reset_memo(self): pass
+
+    def region(self, size): return None
+
+    def hints(self, size): return None
+
+    def prime(self, size, hints): pass
+
+    def fingerprint(self, frame): return None
+
+    def read_snapshot(self, frame, size, region=None):
+        self.ocr_calls += 1
+        time.sleep(self.ocr_delay)
+        if frame.shape[1] < 4 or (frame[0, 0], frame[0, 3]) != _MAGIC: return Reading()
+        profile = self.by_index.get(int(frame[0, 1]) << 8 | int(frame[0, 2]))
+        if profile is None: return Reading()
+        missed = self.misses.get(profile.id, 0)
+        if missed < self.fail_first:
+            self.misses[profile.id] = missed + 1
+            return Reading()
+        self.stages["digits"] += 1
+        return Reading(profile.points, profile.membership, {"points": 95, "membership": 90}, "digits")
+
+class FakePageReader(PageReader):
+    def __init__(self, desktop): self.d = desktop
+
+    def read(self, scan_url):
+        win = self.d.front()
+        if not (win and self.d.loaded(win)): return None
+        return Reading(win.profile.points, win.profile.membership, {"points": 100, "membership": 100}, "dom")
+
+class MemoryStorage(Storage):
+    """Profiles from a list; put() rows become `committed` on flush(), which takes `flush_delay`."""
+    def __init__(self, profiles, flush_delay=0.1):
+        self.profiles = {p.id: p for p in profiles}
+        self.flush_delay = flush_delay
+        self.pending = []
+        self.committed = []
+        self.transactions = 0
+        self.lock = threading.Lock()
+
+    def load_profiles(self, ids): return [self.profiles[i] for i in ids if i in self.profiles]
+
+    def put(self, profile_id, points, membership, source, conf=None, fields=None):
+        with self.lock: self.pending.append((profile_id, points, membership, source, conf, fields))
+
+    def flush(self):
+        with self.lock: rows, self.pending = self.pending, []
+        if not rows: return
+        time.sleep(self.flush_delay)
+        with self.lock:
+            self.committed.extend(rows)
+            self.transactions += 1
+
+    def close(self): self.flush()
+
+def fake_backends(profiles, launch_delay=0.05, load_delay=0.2, ocr_delay=0.3, flush_delay=0.1, fail_first=0, dom=False, ocr_workers=0):
+    """(Backends, FakeDesktop) over one fake desktop. ocr_workers >= 2 reads frames on an ocr_pool.OcrPipeline."""
+    d = FakeDesktop(profiles, launch_delay, load_delay)
+    launcher = FakeLauncher(d)
+    ocr = FakeOcr(d.by_index, ocr_delay, fail_first)
+    pool = None
+    if ocr_workers >= 2:
+        from ocr_pool import OcrPipeline
+        w, h = d.size
+        pool = OcrPipeline(partial(FakeOcr, d.by_index, ocr_delay, fail_first), ocr, ocr_workers, slot_bytes=w * h)
+    return Backends(launcher, FakeWindows(d, launcher.pids), FakeInput(d), FakeCapture(d), ocr,
+                    MemoryStorage(profiles, flush_delay), page=FakePageReader(d) if dom else None, words=FakeWords(), ocr_pool=pool), d
+
+# --- DUMMY BROWSER PROGRAM (for processes.ProcessManager on any OS) ---
+_DUMMY = """import subprocess, sys, time
+if {handoff}: sys.exit(0)
+children = [subprocess.Popen([sys.executable, "-c", "import time; time.sleep(600)"]) for _ in range({children})]
+time.sleep(600)
+"""
+
+def dummy_browser(children=2, handoff=False):
+    """argv prefix of a stand-in browser: a python process with `children` child processes (its
+    "renderers"), which ignores Edge's arguments. handoff=True exits at once, like Edge passing its
+    window to an instance that is already running."""
+    return [sys.executable, "-c", _DUMMY.format(children=children, handoff=handoff)]
+
+# --- EDGE USER DATA TREE (for edge_profiles and ProfileController.auto_detect_profiles) ---
+def make_user_data(root, count, pad_kb=512, seed=7):
+    """Synthetic Edge 'User Data' tree: Default + Profile 1..N-1, Preferences written like Edge does
+    (compact, sorted keys) with filler settings so each file is about pad_kb."""
+    rnd = random.Random(seed)
+    filler = {f"setting_{i}": {"enabled": bool(i % 2), "values": list(range(20))} for i in range(pad_kb * 4)}
+    os.makedirs(root, exist_ok=True)
+    for n in range(count):
+        item = "Default" if n == 0 else f"Profile {n}"
+        os.makedirs(os.path.join(root, item), exist_ok=True)
+        prefs = {"browser": filler, "profile": {"name": f"Person {n}", "content_settings": {"exceptions": filler}},
+                 "extensions": {"settings": filler, "profile": {"enabled": True}}}
+        kind = rnd.random()
+        if kind < 0.8: prefs["account_info"] = [{"email": f"user{n}@example.com", "full_name": f"User {n}", "given_name": "User"}]
+        elif kind < 0.9: prefs["account_info"] = []
+        with open(os.path.join(root, item, "Preferences"), 'w', encoding='utf-8') as f:
+            json.dump(prefs, f, sort_keys=True, separators=(',', ':'))
+    os.makedirs(os.path.join(root, "System Profile"), exist_ok=True)   # Not a user profile
@@ -0,0 +1,76 @@
+import time
+from datetime import datetime
+
+from sqlalchemy import text
+
+from db_model import ScanHistory, LEVEL_CODES, SCAN_SOURCES, MembershipLevel
+
+# --- SCAN HISTORY QUERIES ---
+# Every helper is one SQL statement. Rows are reached per profile through the
+# (profile_id, ts) index, so cost follows the size of the window, not of the table.
+# "Gained" counts only increases between consecutive scans, so redeeming points
+# doesn't show up as a negative day.
+
+# Scans inside the window plus, per profile, the last scan before it (the baseline).
+# CROSS JOIN pins profiles as the outer loop so SQLite seeks the index per profile.
+_SCOPED = """
+scoped AS (
+    SELECT h.profile_id, h.ts, h.points
+    FROM profiles p CROSS JOIN scan_history h ON h.profile_id = p.id AND h.ts >= :since
+    UNION ALL
+    SELECT h.profile_id, h.ts, h.points
+    FROM profiles p CROSS JOIN scan_history h ON h.id = (
+        SELECT b.id FROM scan_history b WHERE b.profile_id = p.id AND b.ts < :since ORDER BY b.ts DESC LIMIT 1)
+),
+lagged AS (
+    SELECT profile_id, ts, points,
+           points - LAG(points) OVER (PARTITION BY profile_id ORDER BY ts) AS delta
+    FROM scoped
+)"""
+
+# Aggregated before joining back to profiles, so the join is one row per profile
+_GAINS = """
+gains AS (
+    SELECT profile_id, SUM(CASE WHEN delta > 0 AND ts >= :since THEN delta ELSE 0 END) AS gained
+    FROM lagged GROUP BY profile_id
+)"""
+
+def _epoch(when):
+    if isinstance(when, datetime): return int(when.timestamp())
+    return int(when)
+
+def _days_ago(days): return int(time.time()) - int(days * 86400)
+
+def history_row(profile_id, points, membership, source="ocr", when=None, conf=None):
+    """Insert parameters for one scan (used by the scan writer's bulk insert). conf: {"points": 0-100, "membership": 0-100}."""
+    level = MembershipLevel(membership) if not isinstance(membership, MembershipLevel) else membership
+    conf = conf or {}
+    return {"profile_id": profile_id, "ts": _epoch(when) if when is not None else int(time.time()), "points": points,
+            "level": LEVEL_CODES.index(level), "source": SCAN_SOURCES.index(source) if source in SCAN_SOURCES else 0,
+            "points_conf": conf.get("points"), "level_conf": conf.get("membership")}
+
+def record_scan(session, profile_id, points, membership, source="ocr", when=None, conf=None):
+    session.execute(ScanHistory.__table__.insert(), [history_row(profile_id, points, membership, source, when, conf)])
+
+def daily_deltas(session, days=7):
+    """[(profile_id, 'YYYY-MM-DD', gained, peak_points)] for each profile and local day with scans in the last N days."""
+    sql = f"""WITH {_SCOPED}
+    SELECT profile_id, date(ts, 'unixepoch', 'localtime') AS day,
+           SUM(CASE WHEN delta > 0 THEN delta ELSE 0 END) AS gained,
+           MAX(points) AS peak
+    FROM lagged WHERE ts >= :since
+    GROUP BY profile_id, day ORDER BY profile_id, day"""
+    return [tuple(r) for r in session.execute(text(sql), {"since": _days_ago(days)})]
+
+def totals_last_days(session, days=7):
+    """{profile_id: points gained in the last N days} for every profile (0 when nothing was gained)."""
+    sql = f"""WITH {_SCOPED}, {_GAINS}
+    SELECT p.id, COALESCE(g.gained, 0) FROM profiles p LEFT JOIN gains g ON g.profile_id = p.id"""
+    return dict(session.execute(text(sql), {"since": _days_ago(days)}).all())
+
+def no_gain_since(session, since):
+    """Profile ids whose points have not gone up since `since` (datetime or unix seconds), including never scanned ones."""
+    sql = f"""WITH {_SCOPED}, {_GAINS}
+    SELECT p.id FROM profiles p LEFT JOIN gains g ON g.profile_id = p.id
+    WHERE COALESCE(g.gained, 0) = 0 ORDER BY p.id"""
+    return [r[0] for r in session.execute(text(sql), {"since": _epoch(since)})]
@@ -1,20 +1,23 @@
 import sys
 import random
 import math
-import subprocess
+import multiprocessing
 import os 
+import threading
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
-                               QScrollArea, QStatusBar, QToolBar, QLabel, QFrame, 
+                               QStatusBar, QToolBar, QLabel, QFrame, 
                                QSizePolicy, QSpinBox, QDialog, QFormLayout, QDialogButtonBox, 
                                QGroupBox, QMenu, QToolButton, QInputDialog, QLineEdit, QMenuBar, QMessageBox, QCheckBox)
-from PySide6.QtCore import Qt, QSize
+from PySide6.QtCore import Qt, QSize, QTimer, Signal
 from PySide6.QtGui import QAction, QIcon, QColor, QFont, QScreen
 
 from controller import ProfileController
-from db_model import MembershipLevel, Profile
-from ui_components import ProfileCard
-from worker import Worker
-from settings_manager import SettingsManager 
+from db_model import MembershipLevel, Profile, Session
+from selection import run_query, parse_positions, QueryError
+from ui_components import ProfileListModel, ProfileListView
+import theme
+from settings_manager import SettingsManager
+from processes import ProcessManager 
 
 # --- SILENCE PRINT STATEMENTS ---
 class NullWriter:
@@ -38,13 +41,7 @@ class FilterDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle("Advanced Selection")
         self.resize(250, 150)
-        self.setStyleSheet("""
-            QDialog { background-color: #252526; color: white; }
-            QLabel { color: #ccc; font-weight: bold; }
-            QSpinBox { background: #333; border: 1px solid #555; color: white; padding: 4px; }
-            QPushButton { background: #0e639c; color: white; border: none; padding: 6px; border-radius: 4px; }
-            QPushButton:hover { background: #1177bb; }
-        """)
+        self.setStyleSheet(theme.FILTER_DIALOG)
         layout = QVBoxLayout(self); layout.addWidget(QLabel("Select profiles with points:"))
         form = QFormLayout()
         self.spin_min = QSpinBox(); self.spin_min.setRange(0, 1000000); self.spin_min.setSingleStep(500); self.spin_min.setValue(0)
@@ -57,25 +54,12 @@ class FilterDialog(QDialog):
 
 # --- SETTINGS DIALOG ---
 class SettingsDialog(QDialog):
-    def __init__(self, current_min, current_max, current_w, current_h, current_url, is_on_top, current_font_size, resize_callback, parent=None):
+    def __init__(self, current_min, current_max, current_w, current_h, current_url, is_on_top, current_font_size, resize_callback, use_dom=False, trace_on=False, parent=None):
         super().__init__(parent)
         self.setWindowTitle("App Settings")
         self.resize(400, 450)
         self.resize_callback = resize_callback 
-        self.setStyleSheet("""
-            QDialog { background-color: #252526; color: white; }
-            QLabel { font-size: 13px; font-weight: bold; color: #ddd; }
-            QSpinBox { 
-                background-color: #333; border: 2px solid #555; border-radius: 6px; padding: 6px; color: white; font-size: 14px; font-weight: bold; 
-            }
-            QLineEdit { background-color: #333; border: 2px solid #555; border-radius: 6px; padding: 6px; color: #00e676; font-family: 'Consolas', monospace; }
-            QCheckBox { spacing: 8px; color: #ddd; font-weight: bold; }
-            QCheckBox::indicator { width: 18px; height: 18px; border-radius: 4px; border: 2px solid #555; background-color: #333; }
-            QCheckBox::indicator:checked { background-color: #0e639c; border-color: #0e639c; }
-            QGroupBox { border: 1px solid #444; border-radius: 6px; margin-top: 10px; font-weight: bold; color: #aaa; }
-            QPushButton { background-color: #0e639c; color: white; border: none; padding: 8px 20px; border-radius: 4px; font-weight: bold; }
-            QPushButton:hover { background-color: #1177bb; }
-        """)
+        self.setStyleSheet(theme.SETTINGS_DIALOG)
         layout = QVBoxLayout(self); layout.setSpacing(15)
         
         grp_random = QGroupBox("Search Randomization")
@@ -105,6 +89,12 @@ class SettingsDialog(QDialog):
         self.chk_ontop = QCheckBox("Keep Window Always on Top")
         self.chk_ontop.setChecked(is_on_top)
         form_scan.addRow("", self.chk_ontop)
+        self.chk_dom = QCheckBox("Read points from page (DevTools), OCR as fallback")
+        self.chk_dom.setChecked(use_dom)
+        form_scan.addRow("", self.chk_dom)
+        self.chk_trace = QCheckBox("Write timing trace (scan_trace.jsonl)")
+        self.chk_trace.setChecked(trace_on)
+        form_scan.addRow("", self.chk_trace)
         layout.addWidget(grp_scan)
         
         btns = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
@@ -114,9 +104,11 @@ class SettingsDialog(QDialog):
         if self.resize_callback: self.resize_callback(self.spin_w.value(), self.spin_h.value())
     
     def get_values(self): 
-        return (int(self.spin_min.value()/3)*3, int(self.spin_max.value()/3)*3, self.edit_url.text().strip(), self.chk_ontop.isChecked(), self.spin_font.value())
+        return (int(self.spin_min.value()/3)*3, int(self.spin_max.value()/3)*3, self.edit_url.text().strip(), self.chk_ontop.isChecked(), self.spin_font.value(), self.chk_dom.isChecked(), self.chk_trace.isChecked())
 
 class MainWindow(QMainWindow):
+    preloaded = Signal(object, str)     # (tesseract path or None, error text)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Rewards Bot Pro")
@@ -137,109 +129,56 @@ class MainWindow(QMainWindow):
         self.apply_styles()
         self.move_to_bottom_right()
         self.controller = ProfileController()
-        self.cards = {} 
+        self.model = ProfileListModel(self)
         self.worker = None 
         self.launch_batch_index = 0
         self.launch_ids = []
         self.rnd_min = self.settings.get("search_count_min", 30)
         self.rnd_max = self.settings.get("search_count_max", 45)
         self.scan_url = self.settings.get("scan_url", "https://rewards.bing.com/")
+        self.scan_source = self.settings.get("scan_source", "ocr")
+        self.devtools_port = self.settings.get("devtools_port", 9222)
+        self.trace_enabled = self.settings.get("trace_enabled", False)
+        self.trace_file = self.settings.get("trace_file", "scan_trace.jsonl")
+        self.last_query = self.settings.get("last_query", "")
+        self.tesseract_cmd = self.settings.get("tesseract_cmd") or None
+        self.ocr_workers = self.settings.get("ocr_workers", 0)
+        self.processes = ProcessManager(debug_port=self.devtools_port)  # Every Edge the app starts; Kill closes only these
         self.init_ui()
         self.load_profile_data()
         self.randomize_search_box()
+        # Load the automation/OCR stack once the window is up, so the first Start doesn't wait on it
+        self.preloaded.connect(self.on_preloaded)
+        if self.settings.get("preload_automation", True): QTimer.singleShot(500, self.preload_automation)
+
+    # --- AUTOMATION STACK (cv2, numpy, pyautogui, tesseract...) IS LOADED ON FIRST USE ---
+    def worker_class(self):
+        from worker import Worker
+        return Worker
+
+    def preload_automation(self):
+        cached = self.tesseract_cmd
+        def load():
+            cmd, error = None, ""
+            try:
+                import capture, scanner     # The backends import these lazily, so the worker imports alone don't
+                from ocr_engine import configure_tesseract, get_engine
+                cmd = configure_tesseract(cached)
+                get_engine()
+                self.worker_class()
+            except Exception as e: error = str(e)
+            self.preloaded.emit(cmd, error)     # Queued to the GUI thread
+        threading.Thread(target=load, name="preload", daemon=True).start()
+
+    def on_preloaded(self, cmd, error):
+        self.tesseract_cmd = cmd or self.tesseract_cmd
+        if error: self.log(f"Preload failed: {error}")
 
     def apply_styles(self):
         img_plus = resource_path("assets/plus.png").replace("\\", "/")
         img_minus = resource_path("assets/minus.png").replace("\\", "/")
 
-        self.setStyleSheet(f"""
-            QMainWindow {{ background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #1e1e1e, stop:1 #181818); }}
-            QMenuBar {{ background-color: #2b2b2b; color: #ddd; }}
-            QMenuBar::item {{ padding: 5px 10px; background-color: transparent; }}
-            QMenuBar::item:selected {{ background-color: #3e3e42; }}
-            QMenu {{ background-color: #252526; color: white; border: 1px solid #444; }}
-            QMenu::item {{ padding: 5px 20px; }}
-            QMenu::item:selected {{ background-color: #0e639c; }}
-            
-            QToolBar {{ background-color: #252526; border-bottom: 2px solid #0e639c; spacing: 10px; padding: 5px; }}
-            QToolButton {{ background-color: #444; border: 1px solid #555; color: #f0f0f0; border-radius: 6px; padding: 6px; margin: 2px; }}
-            QToolButton:hover {{ background-color: #230; border: 1px solid #555; }}
-            QToolButton:pressed {{ background-color: #0e639c; color: white; }}
-
-            QCheckBox {{ color: #ccc; font-weight: bold; spacing: 5px; }}
-            QCheckBox::indicator {{ width: 16px; height: 16px; border: 1px solid #555; border-radius: 3px; background: #333; }}
-            QCheckBox::indicator:checked {{ background-color: #0e639c; border-color: #0e639c; }}
-
-            /* --- COMPACT PILL SHAPE SPINBOX --- */
-            QSpinBox {{
-                background-color: #ffffff;
-                color: #5856D6;         /* Purple Text */
-                font-family: 'Segoe UI';
-                font-weight: bold;
-                font-size: 13px;        
-                border-radius: 15px;    /* Half of height (30px) */
-                padding: 0px 30px;      /* Reduced padding */
-                min-height: 30px;       /* Compact Height */
-                max-height: 30px;
-                min-width: 80px;        
-                max-width: 100px;
-                selection-background-color: transparent;
-                selection-color: #5856D6;
-            }}
-
-            /* DOWN BUTTON (Left Purple Circle) */
-            QSpinBox::down-button {{
-                subcontrol-origin: border;
-                subcontrol-position: center left;
-                width: 30px;
-                height: 30px;
-                background-color: #4b49b6; 
-                border-top-left-radius: 15px;
-                border-bottom-left-radius: 15px;
-                border: none;
-            }}
-            QSpinBox::down-button:hover {{ background-color: #3d3b94; }}
-            QSpinBox::down-button:pressed {{ background-color: #2a2970; }}
-
-            /* UP BUTTON (Right Purple Circle) */
-            QSpinBox::up-button {{
-                subcontrol-origin: border;
-                subcontrol-position: center right;
-                width: 30px;
-                height: 30px;
-                background-color: #4b49b6; 
-                border-top-right-radius: 15px;
-                border-bottom-right-radius: 15px;
-                border: none;
-            }}
-            QSpinBox::up-button:hover {{ background-color: #3d3b94; }}
-            QSpinBox::up-button:pressed {{ background-color: #2a2970; }}
-
-            /* ARROWS - Using Assets from Folder */
-            QSpinBox::up-arrow, QSpinBox::down-arrow {{
-                width: 16px;
-                height: 16px;
-                image: none;
-            }}
-            
-            /* Plus Icon */
-            QSpinBox::up-arrow {{
-                image: url("{img_plus}");
-            }}
-
-            /* Minus Icon */
-            QSpinBox::down-arrow {{
-                 image: url("{img_minus}");
-            }}
-
-            /* SCROLLBAR & OTHERS */
-            QScrollArea {{ border: none; background: transparent; }}
-            QWidget#ScrollContents {{ background: transparent; }}
-            QScrollBar:vertical {{ border: none; background: #1e1e1e; width: 10px; }}
-            QScrollBar::handle:vertical {{ background: #444; min-height: 20px; border-radius: 5px; }}
-            QStatusBar {{ background-color: #181818; color: #666; border-top: 1px solid #333; }}
-            QLabel#StatusRight {{ color: #00e676; font-weight: bold; padding-right: 15px; }}
-        """)
+        self.setStyleSheet(theme.main_stylesheet(img_plus, img_minus))
 
     def move_to_bottom_right(self):
         screen = QApplication.primaryScreen()
@@ -273,6 +212,7 @@ class MainWindow(QMainWindow):
         select_menu.addAction("Free Members", lambda: self.apply_selection("member"))
         select_menu.addSeparator()
         select_menu.addAction("By Points...", self.open_filter_dialog)
+        select_menu.addAction("By Query (e.g. gold & points>5000)...", self.open_query_dialog)
         settings_menu = main_menu.addMenu("Settings")
         settings_action = QAction("Preferences...", self)
         settings_action.triggered.connect(self.open_settings_dialog)
@@ -289,7 +229,7 @@ class MainWindow(QMainWindow):
         self.act_launch = QAction(QIcon(resource_path("assets/launch.png")), "", self); self.act_launch.setToolTip("Launch Profiles"); self.act_launch.triggered.connect(self.on_launch_clicked); self.toolbar.addAction(self.act_launch)
         self.act_stop = QAction(QIcon(resource_path("assets/stop.png")), "", self); self.act_stop.setToolTip("Stop Process"); self.act_stop.triggered.connect(self.on_stop_clicked); self.toolbar.addAction(self.act_stop)
         self.toolbar.addSeparator()
-        self.act_kill = QAction(QIcon(resource_path("assets/close.png")), "", self); self.act_kill.setToolTip("Force Close All Edge Browsers"); self.act_kill.triggered.connect(self.on_kill_clicked); self.toolbar.addAction(self.act_kill)
+        self.act_kill = QAction(QIcon(resource_path("assets/close.png")), "", self); self.act_kill.setToolTip("Close Edge Browsers Started by the App"); self.act_kill.triggered.connect(self.on_kill_clicked); self.toolbar.addAction(self.act_kill)
         self.act_detect = QAction(QIcon(resource_path("assets/search.png")), "", self); self.act_detect.setToolTip("Scan PC for new Edge Profiles"); self.act_detect.triggered.connect(self.on_detect_clicked); self.toolbar.addAction(self.act_detect)
 
         self.toolbar.addSeparator()
@@ -303,7 +243,7 @@ class MainWindow(QMainWindow):
         
         lbl_batch = QLabel("Parallel")
         lbl_batch.setAlignment(Qt.AlignCenter)
-        lbl_batch.setStyleSheet("color: #ccc; font-size: 11px; font-weight: bold; margin-bottom: 2px;")
+        lbl_batch.setObjectName("SectionLabel")
         
         self.spin_batch = QSpinBox()
         self.spin_batch.setRange(1, 15)
@@ -324,7 +264,7 @@ class MainWindow(QMainWindow):
         
         lbl_search = QLabel("Points")
         lbl_search.setAlignment(Qt.AlignCenter)
-        lbl_search.setStyleSheet("color: #ccc; font-size: 11px; font-weight: bold; margin-bottom: 2px;")
+        lbl_search.setObjectName("SectionLabel")
         
         self.spin_search = QSpinBox()
         self.spin_search.setRange(3, 300)
@@ -354,64 +294,76 @@ class MainWindow(QMainWindow):
         
         central = QWidget(); self.setCentralWidget(central)
         self.main_layout = QVBoxLayout(central); self.main_layout.setContentsMargins(0,0,0,0)
-        self.scroll = QScrollArea(); self.scroll.setWidgetResizable(True); self.scroll_content = QWidget()
-        self.cards_layout = QVBoxLayout(self.scroll_content); self.cards_layout.setContentsMargins(15,15,15,15); self.cards_layout.setSpacing(10); self.cards_layout.setAlignment(Qt.AlignTop)
-        self.scroll.setWidget(self.scroll_content); self.main_layout.addWidget(self.scroll)
+        self.main_layout.setContentsMargins(0,10,0,10)
+        self.list_view = ProfileListView(self.model, self.current_font_size)
+        self.list_view.membership_changed.connect(self.update_membership_in_db)
+        self.list_view.launch_requested.connect(self.launch_single_profile)
+        self.model.check_changed.connect(self.update_selection_counter)
+        self.main_layout.addWidget(self.list_view)
         self.status_bar = QStatusBar(); self.setStatusBar(self.status_bar)
         self.lbl_selection_status = QLabel("Selected: 0 / 0"); self.lbl_selection_status.setObjectName("StatusRight")
+        self.lbl_trace = QLabel(); self.lbl_trace.setObjectName("StatusRight"); self.lbl_trace.hide()   # Last run's trace summary
+        self.status_bar.addPermanentWidget(self.lbl_trace)
         self.status_bar.addPermanentWidget(self.lbl_selection_status)
         self.log("Ready.")
 
     def on_kill_clicked(self):
-        try: subprocess.run(["taskkill", "/IM", "msedge.exe", "/F"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL); self.log("All Edge instances closed.")
+        try: closed = self.processes.close_all(); self.log(f"Closed {closed} Edge instances started by the app." if closed else "No Edge instances started by the app are open.")
         except Exception as e: self.log(f"Error closing: {e}")
 
     def on_detect_clicked(self):
         self.log("Scanning for new profiles...")
-        count = self.controller.auto_detect_profiles()
-        if count > 0: self.log(f"Found {count} new profiles! Reloading..."); self.load_profile_data(); QMessageBox.information(self, "Scan Complete", f"Successfully added {count} new profiles.")
+        try: result = self.controller.auto_detect_profiles()
+        except OSError as e:
+            self.log(f"Error scanning: {e}"); QMessageBox.warning(self, "Scan Failed", f"Couldn't read Edge's User Data folder:\n{e}")
+            return
+        if result:
+            parts = []
+            if result.added: parts.append(f"Added {result.added} new profiles.")
+            if result.updated: parts.append(f"Updated email/name of {result.updated} profiles.")
+            if result.removed: parts.append(f"{result.removed} profiles no longer exist in Edge (Select > By Query: missing).")
+            self.log("Profiles changed! Reloading..."); self.load_profile_data(); QMessageBox.information(self, "Scan Complete", "\n".join(parts))
         else: self.log("No new profiles found."); QMessageBox.information(self, "Scan Complete", "No new profiles found.")
 
     def set_launch_active_style(self, active=True):
         widget = self.toolbar.widgetForAction(self.act_launch)
-        if widget: widget.setStyleSheet("QToolButton { background-color: #2e7d32; border: 1px solid #1b5e20; } QToolButton:hover { background-color: #388e3c; }" if active else "")
+        if widget: theme.set_state(widget, "active", bool(active))
 
     def launch_single_profile(self, profile):
         self.log(f"Launching {profile.name}...")
-        try: subprocess.Popen(f'start msedge --start-maximized --profile-directory="{profile.edge_profile_directory}" "{self.scan_url}"', shell=True)
+        try: self.processes.launch(profile.edge_profile_directory, self.scan_url)
         except Exception as e: self.log(f"Error launching: {e}")
 
     def update_selection_counter(self):
-        total = len(self.cards); selected = sum(1 for c in self.cards.values() if c.checkbox.isChecked()); self.lbl_selection_status.setText(f"Selected: {selected} / {total}")
+        total = self.model.rowCount(); selected = self.model.checked_count(); self.lbl_selection_status.setText(f"Selected: {selected} / {total}")
     def apply_selection(self, mode):
-        for pid, card in self.cards.items():
-            cb = card.checkbox; cb.blockSignals(True)
-            if mode == "all": cb.setChecked(True)
-            elif mode == "none": cb.setChecked(False)
-            elif mode == "inverse": cb.setChecked(not cb.isChecked())
-            elif mode == "gold": cb.setChecked(card.current_membership == "Gold")
-            elif mode == "silver": cb.setChecked(card.current_membership == "Silver")
-            elif mode == "member": cb.setChecked(card.current_membership == "Member")
-            cb.blockSignals(False)
-        self.update_selection_counter(); self.log(f"Selection applied: {mode.title()}")
+        if mode == "all": self.model.select_all()
+        elif mode == "none": self.model.select_none()
+        elif mode == "inverse": self.model.invert_selection()
+        elif mode in ("gold", "silver", "member"): self.select_by_query(mode); return
+        else: return
+        self.log(f"Selection applied: {mode.title()}")
+    def select_by_query(self, text, label=None):
+        # Evaluated against the DB columns, so points/tiers written by the scanner count even before a refresh
+        try:
+            with Session() as session: ids = run_query(session, text, self.model.ids_in_positions, len(self.model.rows))
+        except QueryError as e: self.log(f"Query error: {e}"); return False
+        self.model.set_selection(ids); self.log(f"Selection applied: {label or text} ({len(ids)})")
+        return True
+    def open_query_dialog(self):
+        text, ok = QInputDialog.getText(self, "Select by Query", "e.g.  gold & points>5000 & 1-20,35\n"
+                                        "Tiers: gold, silver, member   Fields: points, name~, email~, dir~\n"
+                                        "Combine with & | ! and ( )", QLineEdit.Normal, self.last_query)
+        if ok and text.strip() and self.select_by_query(text.strip()): self.last_query = text.strip()
     def open_range_dialog(self):
         text, ok = QInputDialog.getText(self, "Range Selection", "Enter ranges (e.g., 1-5, 8):\nSeparated by commas.")
         if ok and text:
-            for c in self.cards.values(): c.checkbox.blockSignals(True); c.checkbox.setChecked(False); c.checkbox.blockSignals(False)
-            all_ids = list(self.cards.keys()); total = len(all_ids); parts = text.split(',')
-            for part in parts:
-                part = part.strip()
-                try:
-                    if '-' in part:
-                        start, end = map(int, part.split('-'))
-                        for i in range(max(1, start)-1, min(total, end)): self.cards[all_ids[i]].checkbox.setChecked(True)
-                    else:
-                        idx = int(part); 
-                        if 1 <= idx <= total: self.cards[all_ids[idx-1]].checkbox.setChecked(True)
-                except: pass
-            self.update_selection_counter(); self.log("Range selection applied.")
+            parts = [p.strip() for p in text.split(',') if p.strip()]
+            try: positions = [n for part in parts for n in parse_positions(part, len(self.model.rows))]
+            except ValueError: positions = []
+            self.model.set_selection(self.model.ids_in_positions(positions)); self.log("Range selection applied.")
     def populate_batch_menu(self):
-        self.batch_menu.clear(); batch_size = self.spin_batch.value(); total_profiles = len(self.cards)
+        self.batch_menu.clear(); batch_size = self.spin_batch.value(); total_profiles = self.model.rowCount()
         if total_profiles == 0: return
         num_batches = math.ceil(total_profiles / batch_size)
         for i in range(num_batches):
@@ -419,20 +371,13 @@ class MainWindow(QMainWindow):
             action = QAction(f"Batch {batch_num} ({start_idx}-{end_idx})", self)
             action.triggered.connect(lambda checked=False, b_idx=i: self.select_batch_index(b_idx)); self.batch_menu.addAction(action)
     def select_batch_index(self, batch_index):
-        batch_size = self.spin_batch.value(); all_ids = list(self.cards.keys()); start_idx = batch_index * batch_size; end_idx = start_idx + batch_size
-        for c in self.cards.values(): c.checkbox.blockSignals(True); c.checkbox.setChecked(False); c.checkbox.blockSignals(False)
-        for i in range(start_idx, min(end_idx, len(all_ids))): self.cards[all_ids[i]].checkbox.setChecked(True)
-        self.update_selection_counter(); self.log(f"Selected Batch {batch_index + 1}")
+        batch_size = self.spin_batch.value(); start_idx = batch_index * batch_size; end_idx = start_idx + batch_size
+        self.model.set_selection(self.model.ids_in_positions(range(start_idx + 1, end_idx + 1))); self.log(f"Selected Batch {batch_index + 1}")
     def open_filter_dialog(self):
         dlg = FilterDialog(self); 
         if dlg.exec():
             min_p, max_p = dlg.get_range()
-            for pid, card in self.cards.items():
-                card.checkbox.blockSignals(True)
-                try: txt = card.points_label.text().replace(",", ""); pts = int(txt); select = min_p <= pts <= max_p; card.checkbox.setChecked(select)
-                except: card.checkbox.setChecked(False)
-                card.checkbox.blockSignals(False)
-            self.update_selection_counter(); self.log(f"Filtered: {min_p}-{max_p} pts.")
+            self.select_by_query(f"points>={min_p} & points<={max_p}", f"{min_p}-{max_p} pts")
     def randomize_search_box(self):
         if self.rnd_min > self.rnd_max: self.rnd_min, self.rnd_max = self.rnd_max, self.rnd_min
         raw = random.randint(self.rnd_min, self.rnd_max); val = int(raw/3)*3
@@ -440,35 +385,23 @@ class MainWindow(QMainWindow):
         self.spin_search.setValue(val); self.log(f"Randomized: {val}")
     
     def open_settings_dialog(self):
-        dlg = SettingsDialog(self.rnd_min, self.rnd_max, self.width(), self.height(), self.scan_url, self.is_always_on_top, self.current_font_size, self.update_size_anchor, self)
+        dlg = SettingsDialog(self.rnd_min, self.rnd_max, self.width(), self.height(), self.scan_url, self.is_always_on_top, self.current_font_size, self.update_size_anchor, self.scan_source == "dom", self.trace_enabled, self)
         if dlg.exec():
-            self.rnd_min, self.rnd_max, self.scan_url, new_top_state, new_font = dlg.get_values()
+            self.rnd_min, self.rnd_max, self.scan_url, new_top_state, new_font, use_dom, self.trace_enabled = dlg.get_values()
+            self.scan_source = "dom" if use_dom else "ocr"
             if new_top_state != self.is_always_on_top:
                 self.is_always_on_top = new_top_state
                 self.apply_on_top_mode()
             
             if new_font != self.current_font_size:
                 self.current_font_size = new_font
-                self.load_profile_data() 
+                self.list_view.set_font_size(new_font) 
             
             self.randomize_search_box()
 
     def load_profile_data(self):
-        while self.cards_layout.count():
-            item = self.cards_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-        self.cards.clear()
-        profs = self.controller.get_all_profiles()
-        for p in profs:
-            c = ProfileCard(p, self.current_font_size)
-            c.membership_changed.connect(self.update_membership_in_db)
-            c.checkbox.toggled.connect(self.update_selection_counter)
-            c.launch_requested.connect(self.launch_single_profile)
-            self.cards_layout.addWidget(c)
-            self.cards[p.id] = c
-        self.update_selection_counter()
+        # Diff against what is shown: only added/removed/changed rows are touched
+        self.model.sync_profiles(self.controller.get_all_profiles(fresh=True))
 
     def update_membership_in_db(self, pid, lvl):
         sess = self.controller.session; p = sess.get(Profile, pid)
@@ -479,13 +412,13 @@ class MainWindow(QMainWindow):
         if self.worker and self.worker.isRunning(): return
         batch_size = self.spin_batch.value()
         if self.launch_batch_index == 0:
-            self.launch_ids = [pid for pid, c in self.cards.items() if c.checkbox.isChecked()]
+            self.launch_ids = self.model.checked_ids()
             if not self.launch_ids: self.log("No selection!"); return
             self.set_launch_active_style(True)
         start = self.launch_batch_index * batch_size; end = start + batch_size; current_batch_ids = self.launch_ids[start:end]
         if not current_batch_ids: self.reset_launch_state(); self.log("All batches finished."); return
         self.log(f"Launching Batch {self.launch_batch_index + 1}...")
-        self.worker = Worker("launch", current_batch_ids, batch_size, self.spin_search.value(), scan_url=self.scan_url)
+        self.worker = self.worker_class()("launch", current_batch_ids, batch_size, self.spin_search.value(), scan_url=self.scan_url, trace_path=self.trace_path(), processes=self.processes)
         self.worker.log_signal.connect(self.log); self.worker.finished_signal.connect(self.on_batch_launched); self.worker.start()
         self.act_start.setEnabled(False); self.act_scan.setEnabled(False); self.act_launch.setEnabled(False)
 
@@ -494,6 +427,7 @@ class MainWindow(QMainWindow):
         if start < len(self.launch_ids): 
             self.log(f"Ready for Batch {self.launch_batch_index + 1}")
         else: self.reset_launch_state(); self.log("Done. All profiles launched.")
+        if self.worker: self.show_trace_summary(self.worker.runner.tracer.summary())
         self.act_start.setEnabled(True); self.act_scan.setEnabled(True); self.act_launch.setEnabled(True); self.worker = None
 
     def reset_launch_state(self):
@@ -501,35 +435,38 @@ class MainWindow(QMainWindow):
 
     def start_worker(self, mode):
         if self.worker and self.worker.isRunning(): return
-        ids = [pid for pid, c in self.cards.items() if c.checkbox.isChecked()]
+        ids = self.model.checked_ids()
         if not ids: self.log("No selection!"); return
         
         # --- PASS CHECKBOX STATE TO WORKER ---
         should_update = self.chk_update_status.isChecked()
         
-        self.worker = Worker(mode, ids, self.spin_batch.value(), self.spin_search.value(), scan_url=self.scan_url, update_after=should_update)
+        self.worker = self.worker_class()(mode, ids, self.spin_batch.value(), self.spin_search.value(), scan_url=self.scan_url, update_after=should_update, scan_source=self.scan_source, devtools_port=self.devtools_port, trace_path=self.trace_path(), tesseract_cmd=self.tesseract_cmd, processes=self.processes, ocr_workers=self.ocr_workers)
         self.worker.log_signal.connect(self.log); self.worker.card_update_signal.connect(self.update_card_ui)
         self.worker.finished_signal.connect(self.on_worker_finished); self.worker.start()
         self.act_start.setEnabled(False); self.act_scan.setEnabled(False); self.act_launch.setEnabled(False)
     
+    def trace_path(self): return self.trace_file if self.trace_enabled else None
+
+    def show_trace_summary(self, text):
+        # Stays in the status bar (log() messages expire); the full text is in the tooltip
+        self.lbl_trace.setText(text if len(text) <= 90 else text[:87] + "...")
+        self.lbl_trace.setToolTip(text); self.lbl_trace.setVisible(bool(text))
+
     def on_start_clicked(self): self.start_worker("start")
     def on_scan_clicked(self): self.start_worker("scan")
     def on_stop_clicked(self): 
         if self.worker: self.worker.stop()
         self.reset_launch_state(); self.log("Stopping...")
     def update_card_ui(self, pid, pts, membership): 
-        if pid in self.cards: 
-            card = self.cards[pid]
-            card.points_label.setText(f"{pts:,}")
-            
-            # --- UPDATE MEMBERSHIP BADGE DYNAMICALLY ---
-            if membership and membership != card.current_membership:
-                card.current_membership = membership
-                card.badge_btn.setText(membership)
-                card.update_badge_style()
+        # --- UPDATE POINTS & MEMBERSHIP BADGE IN PLACE ---
+        self.model.update_profile(pid, pts, membership)
         
     def on_worker_finished(self): 
         self.log("Done.")
+        if self.worker:
+            self.tesseract_cmd = self.worker.tesseract_cmd or self.tesseract_cmd
+            self.show_trace_summary(self.worker.runner.tracer.summary())
         self.act_start.setEnabled(True); self.act_scan.setEnabled(True); self.act_launch.setEnabled(True); self.worker = None
         
         # --- SHUTDOWN LOGIC ---
@@ -547,6 +484,14 @@ class MainWindow(QMainWindow):
             "search_count_max": self.rnd_max, 
             "last_search_val": self.spin_search.value(), 
             "scan_url": self.scan_url,
+            "scan_source": self.scan_source,
+            "devtools_port": self.devtools_port,
+            "trace_enabled": self.trace_enabled,
+            "trace_file": self.trace_file,
+            "last_query": self.last_query,
+            "tesseract_cmd": self.tesseract_cmd or "",
+            "preload_automation": self.settings.get("preload_automation", True),
+            "ocr_workers": self.ocr_workers,
             "always_on_top": self.is_always_on_top,
             "font_size": self.current_font_size,
             "scan_after_search": self.chk_update_status.isChecked(), # Save Checkbox
@@ -555,4 +500,5 @@ class MainWindow(QMainWindow):
         self.controller.close(); e.accept()
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()    # OCR worker processes re-run this exe (PyInstaller build)
     app = QApplication(sys.argv); window = MainWindow(); window.show(); sys.exit(app.exec())
\ No newline at end of file
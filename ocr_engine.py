@@ -0,0 +1,133 @@
+import os
+import shlex
+import shutil
+import sys
+import threading
+import pytesseract
+
+def parse_config(config):
+    """Splits a tesseract CLI style config ("--psm 6 -c key=value") into (psm, {key: value})."""
+    psm, variables = None, {}
+    parts = shlex.split(config or "")
+    for i, part in enumerate(parts):
+        if part == "--psm" and i + 1 < len(parts): psm = int(parts[i + 1])
+        elif part == "-c" and i + 1 < len(parts) and "=" in parts[i + 1]:
+            key, value = parts[i + 1].split("=", 1)
+            variables[key] = value
+    return psm, variables
+
+class PytesseractEngine:
+    """Fallback engine: one tesseract subprocess (plus temp image) per call."""
+    name = "pytesseract"
+
+    def image_to_string(self, image, config=""):
+        return pytesseract.image_to_string(image, config=config)
+
+    def image_to_data(self, image, config=""):
+        return pytesseract.image_to_data(image, config=config, output_type=pytesseract.Output.DICT)
+
+    def close(self): pass
+
+class TesserocrEngine:
+    """In-process engine: the language model is loaded once per config and fed numpy buffers directly."""
+    name = "tesserocr"
+
+    def __init__(self, lang="eng", tessdata=None):
+        import tesserocr
+        self.tesserocr = tesserocr
+        self.lang = lang
+        self.tessdata = tessdata or find_tessdata()
+        self.apis = {}                   # config string -> PyTessBaseAPI
+        self.lock = threading.Lock()     # A tesseract handle is not thread safe
+
+    def _api(self, config):
+        api = self.apis.get(config)
+        if api is None:
+            psm, variables = parse_config(config)
+            kwargs = {"lang": self.lang}
+            if self.tessdata: kwargs["path"] = self.tessdata
+            api = self.tesserocr.PyTessBaseAPI(**kwargs)
+            if psm is not None: api.SetPageSegMode(psm)
+            for key, value in variables.items(): api.SetVariable(key, value)
+            self.apis[config] = api
+        return api
+
+    def _set_image(self, api, image):
+        height, width = image.shape[:2]
+        channels = 1 if image.ndim == 2 else image.shape[2]
+        if not image.flags["C_CONTIGUOUS"]: image = image.copy()  # ROI crops are strided views
+        api.SetImageBytes(image.tobytes(), width, height, channels, width * channels)
+
+    def image_to_string(self, image, config=""):
+        with self.lock:
+            api = self._api(config)
+            self._set_image(api, image)
+            return api.GetUTF8Text()
+
+    def image_to_data(self, image, config=""):
+        RIL = self.tesserocr.RIL
+        data = {k: [] for k in ("text", "left", "top", "width", "height", "conf", "block_num", "par_num", "line_num")}
+        with self.lock:
+            api = self._api(config)
+            self._set_image(api, image)
+            api.Recognize()
+            block = par = line = 0
+            for it in self.tesserocr.iterate_level(api.GetIterator(), RIL.WORD):
+                if it.IsAtBeginningOf(RIL.BLOCK): block += 1; par = line = 0
+                if it.IsAtBeginningOf(RIL.PARA): par += 1; line = 0
+                if it.IsAtBeginningOf(RIL.TEXTLINE): line += 1
+                box = it.BoundingBox(RIL.WORD)
+                if box is None: continue
+                x1, y1, x2, y2 = box
+                data["text"].append(it.GetUTF8Text(RIL.WORD) or "")
+                data["left"].append(x1); data["top"].append(y1)
+                data["width"].append(x2 - x1); data["height"].append(y2 - y1)
+                data["conf"].append(it.Confidence(RIL.WORD))
+                data["block_num"].append(block); data["par_num"].append(par); data["line_num"].append(line)
+        return data
+
+    def close(self):
+        with self.lock:
+            for api in self.apis.values(): api.End()
+            self.apis.clear()
+
+def find_tessdata():
+    """tessdata folder next to the configured tesseract binary, if there is one."""
+    if os.getenv("TESSDATA_PREFIX"): return os.getenv("TESSDATA_PREFIX")
+    cmd = pytesseract.pytesseract.tesseract_cmd
+    folder = os.path.join(os.path.dirname(cmd), "tessdata") if os.path.dirname(cmd) else None
+    return folder if folder and os.path.isdir(folder) else None
+
+def tesseract_candidates():
+    """Usual install locations of tesseract.exe (plus the bundled copy and PATH)."""
+    paths = [r'C:\Program Files\Tesseract-OCR\tesseract.exe', r'C:\Program Files (x86)\Tesseract-OCR\tesseract.exe']
+    if os.getenv('LOCALAPPDATA'): paths.append(os.path.join(os.getenv('LOCALAPPDATA'), 'Tesseract-OCR', 'tesseract.exe'))
+    if hasattr(sys, '_MEIPASS'): paths.append(os.path.join(sys._MEIPASS, 'Tesseract-OCR', 'tesseract.exe'))
+    on_path = shutil.which("tesseract")
+    if on_path: paths.append(on_path)
+    return paths
+
+def configure_tesseract(cached=None):
+    """Points pytesseract at the cached path if it still exists, else at the first candidate found.
+    Returns the path used (for the settings cache) or None."""
+    for path in ([cached] if cached else []) + tesseract_candidates():
+        if os.path.exists(path):
+            pytesseract.pytesseract.tesseract_cmd = path
+            return path
+    return None
+
+ENGINES = {"pytesseract": PytesseractEngine, "tesserocr": TesserocrEngine}
+
+def create_engine(name="auto"):
+    """Builds the requested engine; "auto" prefers tesserocr and falls back to pytesseract."""
+    if name != "auto": return ENGINES[name]()
+    try: return TesserocrEngine()
+    except Exception: return PytesseractEngine()
+
+_shared = None
+
+def get_engine():
+    """Process wide engine, so the model is loaded once for the whole app."""
+    global _shared
+    if _shared is None: _shared = create_engine()
+    return _shared
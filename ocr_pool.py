@@ -0,0 +1,157 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# --- OCR ON A PROCESS POOL, FRAMES HANDED OVER IN SHARED MEMORY ---
+# Capture writes each frame straight into a free shared memory slot and
+# submits a job that names the slot; workers map the same memory instead of
+# receiving a pickled screenshot. There are only `slots` slots, so capture
+# waits (backpressure) when OCR falls behind.
+# Jobs are grouped by a token (one per profile scan). cancel(token) drops its
+# queued jobs and flags the token, so a worker that picks one up later skips
+# it; a job already inside tesseract finishes and its result is ignored.
+#
+# Readers (scanner.DashboardScanner, fakes.FakeOcr) are rebuilt in each worker by
+# `make_reader`; what they learn about the page (the located panel) travels back
+# with each result as hints(size) and goes out with the next job via prime().
+
+_RING = 256     # Cancelled tokens remembered by workers
+
+def worker_count(setting=0):
+    """OCR processes for the `ocr_workers` setting: 0 picks one per spare core (at most 4).
+    Fewer than 2 means no pool: OCR stays on the engine's thread lane."""
+    n = setting or min(4, (os.cpu_count() or 1) - 1)
+    return n if n >= 2 else 0
+
+class NullCapture:
+    """Workers only OCR frames they are handed."""
+    name = "none"
+    def size(self): return (0, 0)
+    def grab(self, region=None, gray=True, scale=1): raise RuntimeError("OCR workers don't capture")
+    def close(self): pass
+
+def scanner_reader(scan_url, tesseract_cmd=None):
+    """make_reader for the real scanner (module level, so it pickles)."""
+    from ocr_engine import configure_tesseract
+    from scanner import DashboardScanner
+    configure_tesseract(tesseract_cmd)
+    return DashboardScanner(scan_url, capture=NullCapture(), memo_size=0)
+
+# --- worker side ---
+_reader = None
+_cancelled = None
+_attached = {}
+
+def _init_worker(make_reader, cancelled):
+    global _reader, _cancelled
+    _reader, _cancelled = make_reader(), cancelled
+
+def _attach(name):
+    shm = _attached.get(name)
+    if shm is None:     # Spawned workers share the parent's resource tracker, which unlinks the block once
+        shm = _attached[name] = shared_memory.SharedMemory(name=name)
+    return shm
+
+def _read_job(token, name, shape, size, region, hints):
+    if _cancelled[token % _RING] == token: return None
+    frame = np.ndarray(shape, dtype=np.uint8, buffer=_attach(name).buf)
+    calls, stages = _reader.ocr_calls, dict(_reader.stages)
+    _reader.prime(size, hints)
+    reading = _reader.read_snapshot(frame, size, region)
+    return (reading, _reader.hints(size), _reader.ocr_calls - calls,
+            {k: v - stages.get(k, 0) for k, v in _reader.stages.items()})
+
+# --- parent side ---
+class Slot:
+    def __init__(self, nbytes):
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, nbytes))
+
+    def view(self, shape):
+        need = int(np.prod(shape))
+        if need > self.shm.size:            # A bigger screen than planned: swap in a bigger block
+            self.close()
+            self.shm = shared_memory.SharedMemory(create=True, size=need)
+        return np.ndarray(shape, dtype=np.uint8, buffer=self.shm.buf)
+
+    def close(self):
+        self.shm.close()
+        try: self.shm.unlink()
+        except FileNotFoundError: pass
+
+class OcrPipeline:
+    """Process pool OCR for the engine. `reader` is the parent's copy (region, dedup, counters)."""
+    def __init__(self, make_reader, reader, workers, slots=None, slot_bytes=1920 * 1080):
+        self.workers = workers
+        self.reader = reader
+        ctx = multiprocessing.get_context("spawn")     # Same behaviour on Windows and elsewhere
+        self.cancelled = ctx.Array('q', [-1] * _RING, lock=False)
+        self.pool = ProcessPoolExecutor(self.workers, mp_context=ctx, initializer=_init_worker, initargs=(make_reader, self.cancelled))
+        self.slots = [Slot(slot_bytes) for _ in range(slots or self.workers * 2)]
+        self.free = None                # asyncio.Queue of free slots, made on the engine's loop
+        self.token = 0
+        self.jobs = {}                  # token -> set of futures
+        self.seen = {}                  # token -> frame fingerprints already submitted
+
+    def warm_up(self):
+        """Starts every worker now (spawning and importing the OCR stack takes a while)."""
+        list(self.pool.map(abs, range(self.workers)))
+
+    def begin(self):
+        self.token += 1
+        self.jobs[self.token], self.seen[self.token] = set(), set()
+        return self.token
+
+    async def acquire(self):
+        if self.free is None:
+            self.free = asyncio.Queue()
+            for slot in self.slots: self.free.put_nowait(slot)
+        return await self.free.get()
+
+    def release(self, slot): self.free.put_nowait(slot)
+
+    def fill(self, token, slot, capture):
+        """Grabs the page into the slot (call on the screen thread). (shape, size, region), or None for a repeat frame."""
+        size = capture.size()
+        region = self.reader.region(size)
+        frame = capture.grab(region=region)
+        key = self.reader.fingerprint(frame)
+        if key is not None:
+            if key in self.seen.get(token, ()):
+                self.reader.ocr_skipped += 1
+                return None
+            self.seen.setdefault(token, set()).add(key)
+        np.copyto(slot.view(frame.shape), frame)
+        return frame.shape, size, region
+
+    def submit(self, token, slot, shot):
+        """Future of the job's Reading (None if cancelled). The slot is released when the job ends."""
+        shape, size, region = shot
+        loop = asyncio.get_running_loop()
+        fut = loop.run_in_executor(self.pool, _read_job, token, slot.shm.name, shape, size, region, self.reader.hints(size))
+        self.jobs.setdefault(token, set()).add(fut)
+
+        def done(f):
+            self.release(slot)
+            self.jobs.get(token, set()).discard(f)
+            if f.cancelled() or f.exception() or f.result() is None: return
+            _, hints, calls, stages = f.result()
+            self.reader.prime(size, hints)
+            self.reader.ocr_calls += calls
+            for k, v in stages.items(): self.reader.stages[k] = self.reader.stages.get(k, 0) + v
+        fut.add_done_callback(done)
+        return fut
+
+    def cancel(self, token):
+        """Drops the token's outstanding jobs: queued ones are cancelled, running ones skipped or ignored."""
+        self.cancelled[token % _RING] = token
+        for fut in list(self.jobs.pop(token, ())): fut.cancel()
+        self.seen.pop(token, None)
+
+    def close(self):
+        for token in list(self.jobs): self.cancel(token)
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        for slot in self.slots: slot.close()
@@ -0,0 +1,145 @@
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+from backends import ProcessLauncher
+
+# --- BROWSER PROCESSES WE STARTED, PER PROFILE ---
+# Edge is started directly (no `start`, no shell) so we know its PID. On Windows
+# closing kills that process tree (taskkill /PID /T); elsewhere the browser runs in
+# its own session and the whole process group is signalled. Edge processes we
+# didn't start are never touched.
+# All profiles share one User Data folder, so a launch while Edge is already running
+# hands its window to the running browser and exits. When that browser is one of
+# ours (parallel searches) closing it closes every window. When it isn't (the user
+# had Edge open) the window can't be closed by us; those launches are counted in
+# `handed_off`.
+
+_WINDOWS = sys.platform == "win32"
+
+def edge_executable():
+    """Path of msedge.exe: the App Paths entry (what `start msedge` uses), the usual install folders, then PATH."""
+    if _WINDOWS:
+        try:
+            import winreg
+            for hive in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+                try:
+                    with winreg.OpenKey(hive, r"SOFTWARE\Microsoft\Windows\CurrentVersion\App Paths\msedge.exe") as key:
+                        path = winreg.QueryValue(key, None)
+                    if path and os.path.isfile(path): return path
+                except OSError: pass
+        except ImportError: pass
+        for base in (os.getenv("ProgramFiles(x86)"), os.getenv("ProgramFiles"), os.getenv("LOCALAPPDATA")):
+            if not base: continue
+            path = os.path.join(base, "Microsoft", "Edge", "Application", "msedge.exe")
+            if os.path.isfile(path): return path
+    return shutil.which("msedge") or shutil.which("microsoft-edge")
+
+class BrowserProcess:
+    def __init__(self, profile_dir, popen):
+        self.profile_dir = profile_dir
+        self.popen = popen
+        self.pid = popen.pid
+
+    def alive(self):
+        if self.popen.poll() is None: return True
+        return not _WINDOWS and _group_alive(self.pid)     # Children left in its process group still count
+
+    def __repr__(self): return f"<BrowserProcess({self.profile_dir!r}, pid={self.pid})>"
+
+def _group_alive(pgid):
+    """Any live (non-zombie) process in the group. Exited children wait as zombies until init reaps them."""
+    if os.path.isdir("/proc/self"):
+        for name in os.listdir("/proc"):
+            if not name.isdigit(): continue
+            try:
+                with open(f"/proc/{name}/stat", "rb") as f: fields = f.read().rsplit(b")", 1)[1].split()
+            except OSError: continue
+            if int(fields[2]) == pgid and fields[0] != b"Z": return True
+        return False
+    try: os.killpg(pgid, 0)
+    except (ProcessLookupError, PermissionError): return False
+    return True
+
+class ProcessManager(ProcessLauncher):
+    """Launches one browser per profile and closes only those.
+
+    `command` is the browser argv prefix, default [edge_executable()]; a dummy
+    program (fakes.dummy_browser()) stands in for Edge on Linux.
+    """
+    def __init__(self, command=None, debug_port=9222, grace=2.0):
+        self.command = list(command) if command else None
+        self.debug_port = debug_port
+        self.grace = grace                      # Seconds between asking and forcing (POSIX)
+        self.procs = []                         # BrowserProcess per launch, oldest first
+        self.handed_off = 0
+        self.lock = threading.Lock()
+
+    def argv(self, profile_dir, url=None, debug=False):
+        if self.command is None:
+            exe = edge_executable()
+            if not exe: raise FileNotFoundError("Microsoft Edge (msedge.exe) not found")
+            self.command = [exe]
+        args = self.command + ["--start-maximized", f"--profile-directory={profile_dir}"]
+        if debug: args.append(f"--remote-debugging-port={self.debug_port}")
+        if url: args.append(url)
+        return args
+
+    def launch(self, profile_dir, url=None, debug=False):
+        kwargs = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP} if _WINDOWS else {"start_new_session": True}
+        popen = subprocess.Popen(self.argv(profile_dir, url, debug), stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                 stderr=subprocess.DEVNULL, **kwargs)
+        proc = BrowserProcess(profile_dir, popen)
+        with self.lock: self.procs.append(proc)
+        return proc
+
+    def running(self, profile_dir=None):
+        """Launched processes (of one profile) still alive."""
+        with self.lock: procs = [p for p in self.procs if profile_dir is None or p.profile_dir == profile_dir]
+        return [p for p in procs if p.alive()]
+
+    def pids(self):
+        """{profile_dir: pid} of the live launches; the newest wins for a profile launched twice."""
+        return {p.profile_dir: p.pid for p in self.running()}
+
+    def any_running(self): return bool(self.running())
+
+    def close(self, profile_dir):
+        with self.lock:
+            procs = [p for p in self.procs if p.profile_dir == profile_dir]
+            self.procs = [p for p in self.procs if p.profile_dir != profile_dir]
+        return self._terminate(procs)
+
+    def close_all(self):
+        """Closes every browser we launched and returns once they are gone (or after about 2 x `grace`). Returns how many were live."""
+        with self.lock: procs, self.procs = self.procs, []
+        return self._terminate(procs)
+
+    def _terminate(self, procs):
+        live = [p for p in procs if p.alive()]
+        if not live:    # Every launch exited by itself: their windows went to an Edge we didn't start
+            self.handed_off += sum(1 for p in procs if p.popen.returncode == 0)
+            return 0
+        if _WINDOWS:
+            for p in live:
+                subprocess.run(["taskkill", "/PID", str(p.pid), "/T", "/F"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:
+            self._signal(live, signal.SIGTERM)
+            deadline = time.monotonic() + self.grace
+            while time.monotonic() < deadline and any(p.alive() for p in live): time.sleep(0.02)
+            self._signal([p for p in live if p.alive()], signal.SIGKILL)
+        for p in live:
+            try: p.popen.wait(timeout=self.grace)
+            except subprocess.TimeoutExpired: pass
+        deadline = time.monotonic() + self.grace       # The rest of each tree (renderers, killed with it) exits a moment later
+        while time.monotonic() < deadline and any(p.alive() for p in live): time.sleep(0.02)
+        return len(live)
+
+    def _signal(self, procs, sig):
+        for p in procs:
+            try: os.killpg(p.pid, sig)
+            except (ProcessLookupError, PermissionError): pass
@@ -0,0 +1,101 @@
+import asyncio
+import contextvars
+import time
+
+# --- WAITING ON OBSERVABLE CONDITIONS INSTEAD OF FIXED SLEEPS ---
+
+class WaitResult:
+    def __init__(self, name, ok, elapsed, polls, value=None):
+        self.name = name
+        self.ok = ok            # False when the deadline passed (or the wait was cancelled)
+        self.elapsed = elapsed
+        self.polls = polls
+        self.value = value
+
+    def __bool__(self): return self.ok
+
+    def __repr__(self): return f"<WaitResult({self.name}, ok={self.ok}, {self.elapsed:.2f}s, polls={self.polls})>"
+
+class WaitStats:
+    """Remembers how long each kind of wait really took during a run."""
+    def __init__(self): self.waits = {}
+
+    def add(self, result): self.waits.setdefault(result.name, []).append(result)
+
+    def summary(self):
+        parts = []
+        for name, results in self.waits.items():
+            total = sum(r.elapsed for r in results)
+            timeouts = sum(1 for r in results if not r.ok)
+            part = f"{name} {total / len(results):.1f}s avg x{len(results)}"
+            if timeouts: part += f" ({timeouts} timed out)"
+            parts.append(part)
+        return ", ".join(parts)
+
+def wait_until(condition, timeout, name="wait", initial=0.05, max_interval=1.0, factor=1.6, keep_going=None, stats=None):
+    """Polls condition() with bounded exponential backoff until it returns a truthy value or the deadline passes.
+
+    keep_going() is checked between polls so a Stop request cancels the wait.
+    """
+    start = time.monotonic()
+    deadline = start + timeout
+    interval, polls = initial, 0
+    while True:
+        polls += 1
+        try: value = condition()
+        except Exception: value = None  # A failing probe (window gone mid-check...) just means "not yet"
+        now = time.monotonic()
+        if value:
+            result = WaitResult(name, True, now - start, polls, value)
+            break
+        if now >= deadline or (keep_going and not keep_going()):
+            result = WaitResult(name, False, now - start, polls)
+            break
+        time.sleep(min(interval, max(0.0, deadline - now)))
+        interval = min(interval * factor, max_interval)
+    if stats is not None: stats.add(result)
+    return result
+
+async def wait_until_async(condition, timeout, name="wait", initial=0.05, max_interval=1.0, factor=1.6, keep_going=None, stats=None, executor=None):
+    """wait_until for the asyncio engine: the backoff sleeps don't block the loop.
+
+    Blocking probes (subprocess, sockets) should pass an executor to run condition() there.
+    """
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    deadline = start + timeout
+    interval, polls = initial, 0
+    while True:
+        polls += 1
+        try: value = await loop.run_in_executor(executor, contextvars.copy_context().run, condition) if executor else condition()
+        except Exception: value = None
+        now = loop.time()
+        if value:
+            result = WaitResult(name, True, now - start, polls, value)
+            break
+        if now >= deadline or (keep_going and not keep_going()):
+            result = WaitResult(name, False, now - start, polls)
+            break
+        await asyncio.sleep(min(interval, max(0.0, deadline - now)))
+        interval = min(interval * factor, max_interval)
+    if stats is not None: stats.add(result)
+    return result
+
+# --- CONDITIONS (each returns a zero-arg callable) ---
+
+def frame_stable(capture, stable_for=0.5, scale=0.25, region=None):
+    """True once the (downscaled) screen has not changed for `stable_for` seconds."""
+    from scanner import frame_fingerprint
+    state = {"key": None, "since": 0.0}
+    def check():
+        key = frame_fingerprint(capture.grab(region=region, scale=scale))
+        now = time.monotonic()
+        if key != state["key"]: state["key"], state["since"] = key, now
+        return now - state["since"] >= stable_for
+    return check
+
+def frame_changed(capture, scale=0.25, region=None):
+    """True once the screen differs from how it looked when this condition was created."""
+    from scanner import frame_fingerprint
+    first = frame_fingerprint(capture.grab(region=region, scale=scale))
+    return lambda: frame_fingerprint(capture.grab(region=region, scale=scale)) != first
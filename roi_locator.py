@@ -0,0 +1,122 @@
+import re
+
+from dashboard import NUMBER
+
+# --- ANCHOR WORDS ON THE REWARDS DASHBOARD ---
+ANCHOR_FIRST = re.compile(r"^available$", re.IGNORECASE)
+ANCHOR_SECOND = re.compile(r"^points", re.IGNORECASE)
+TIER_WORD = re.compile(r"^(gold|silver|member|level)\b", re.IGNORECASE)
+
+def words_to_text(data, offsets=None):
+    """Rebuilds plain OCR text (one line per tesseract line) from image_to_data output.
+    Pass a list as `offsets` to get (start, end, word index) of every word in the text."""
+    lines = {}
+    for i, word in enumerate(data["text"]):
+        if not word or not word.strip(): continue
+        key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+        lines.setdefault(key, []).append((word, i))
+    out, pos = [], 0
+    for _, words in sorted(lines.items()):
+        for word, i in words:
+            if offsets is not None: offsets.append((pos, pos + len(word), i))
+            pos += len(word) + 1        # The space, or the newline after the last word
+        out.append(" ".join(word for word, _ in words))
+    return "\n".join(out)
+
+class DashboardLocator:
+    """Finds the 'Available points' panel once and caches its crop box.
+
+    The box is keyed by screen resolution and scan URL, so every later attempt
+    (and every later profile) can capture and OCR a small region instead of the full frame.
+    Inside it the boxes of the points value and the tier label are cached too
+    (relative to the panel), for the single-line first stage of the OCR cascade.
+    """
+    def __init__(self, pad=1.0, number_rows=3, tier_reach=6):
+        self.pad = pad                  # Padding around the panel, in anchor heights
+        self.number_rows = number_rows  # The points value sits below the anchor text
+        self.tier_reach = tier_reach    # How far (in anchor heights) to look for the tier text
+        self.cache = {}
+        self.fields = {}                # key -> {"points": box, "tier": box} inside the panel
+
+    def key(self, size, scan_url): return (size[0], size[1], scan_url)
+
+    def get(self, size, scan_url): return self.cache.get(self.key(size, scan_url))
+
+    def get_fields(self, size, scan_url): return self.fields.get(self.key(size, scan_url), {})
+
+    def invalidate(self, size, scan_url):
+        self.cache.pop(self.key(size, scan_url), None)
+        self.fields.pop(self.key(size, scan_url), None)
+
+    def read_full_frame(self, engine, gray, size, scan_url, config, scale=1.0):
+        """OCRs the whole frame once, returning its word data and caching the panel box if found.
+
+        `size` is the screen (width, height); `scale` maps preprocessed frame pixels back to
+        screen pixels, since the cached box is used to grab just that region of the screen.
+        """
+        data = engine.image_to_data(gray, config=config)
+        fields = {}
+        roi = self.locate(data, gray.shape, fields)
+        if roi is not None:
+            key = self.key(size, scan_url)
+            self.cache[key] = tuple(int(v / scale) for v in roi)
+            self.fields[key] = {name: tuple(int(v / scale) for v in box) for name, box in fields.items()}
+        return data
+
+    def locate(self, data, shape, fields=None):
+        """Panel box in frame pixels, or None. Fills `fields` with the points/tier boxes relative to it."""
+        words = data["text"]
+        anchor = None
+        for i in range(len(words) - 1):
+            if ANCHOR_FIRST.match(words[i].strip()) and ANCHOR_SECOND.match(words[i + 1].strip()):
+                anchor = self._box(data, i, i + 1)
+                break
+        if anchor is None: return None
+
+        ax, ay, aw, ah = anchor
+        left, top, right, bottom = ax, ay, ax + aw, ay + ah * (1 + self.number_rows)
+
+        # The points value: the first number under the anchor
+        number = None
+        for j in range(i + 2, len(words)):
+            if not NUMBER.match(words[j].strip()): continue
+            box = self._box(data, j, j)
+            if ay - ah // 2 <= box[1] <= bottom: number = box; break
+
+        # Pull in the nearest tier label ("Gold Member", "Level 2") so membership survives the crop
+        best = None
+        for i, word in enumerate(words):
+            if not TIER_WORD.match(word.strip()): continue
+            wx, wy, ww, wh = self._box(data, i, i)
+            dist = abs((wy + wh / 2) - (ay + ah / 2))
+            if dist <= ah * self.tier_reach and (best is None or dist < best[0]):
+                best = (dist, (wx, wy, ww, wh))
+        if best:
+            wx, wy, ww, wh = best[1]
+            left, top = min(left, wx), min(top, wy)
+            right, bottom = max(right, wx + ww), max(bottom, wy + wh)
+
+        pad = int(ah * self.pad)
+        frame_h, frame_w = shape[:2]
+        left, top = max(0, left - pad), max(0, top - pad)
+        right, bottom = min(frame_w, right + pad * 4), min(frame_h, bottom + pad)
+        if right <= left or bottom <= top: return None
+        if fields is not None:
+            half = max(1, pad // 2)
+            if number: fields["points"] = self._inside(number, left, top, right, bottom, half, grow_right=pad * 4)
+            if best: fields["tier"] = self._inside(best[1], left, top, right, bottom, half, grow_right=pad * 8)
+        return (left, top, right - left, bottom - top)
+
+    def _inside(self, box, left, top, right, bottom, pad, grow_right=0):
+        """box padded (more to the right: numbers grow, "Gold" -> "Gold Member") and made relative to the panel."""
+        x, y, w, h = box
+        x1, y1 = max(left, x - pad), max(top, y - pad)
+        x2, y2 = min(right, x + w + pad + grow_right), min(bottom, y + h + pad)
+        return (x1 - left, y1 - top, x2 - x1, y2 - y1)
+
+    def _box(self, data, first, last):
+        x1 = min(data["left"][first], data["left"][last])
+        y1 = min(data["top"][first], data["top"][last])
+        x2 = max(data["left"][i] + data["width"][i] for i in (first, last))
+        y2 = max(data["top"][i] + data["height"][i] for i in (first, last))
+        return (x1, y1, x2 - x1, y2 - y1)
@@ -0,0 +1,63 @@
+import asyncio
+
+from roi_locator import DashboardLocator
+from tracing import Tracer
+from engine import AutomationEngine
+
+# --- AUTOMATION CORE (no Qt) ---
+# Runs scan / start / launch jobs for the GUI Worker and the command line alike:
+# a blocking facade over the asyncio engine (engine.py) with the real Edge/desktop/DB backends.
+# Heavy modules (cv2, tesseract, pyautogui, pygetwindow, wonderwords) load when a job needs them.
+
+class Runner:
+    # Shared across runs: the points panel only moves when the resolution or URL changes
+    locator = DashboardLocator()
+
+    def __init__(self, mode, selected_ids, batch_size=5, search_count=30, scan_url="https://rewards.bing.com/pointsbreakdown", update_after=True, scan_source="ocr", devtools_port=9222, trace_path=None, tesseract_cmd=None, on_log=None, on_result=None, overlap=True, processes=None, ocr_workers=0):
+        self.on_log = on_log or print               # on_log(message)
+        self.mode = mode
+        self.selected_ids = selected_ids
+        self.scan_url = scan_url
+        self.scan_source = scan_source
+        self.devtools_port = devtools_port
+        self.tracer = Tracer(trace_path)   # Disabled (no-op spans) without a path
+        self.tesseract_cmd = tesseract_cmd  # Cached path from settings; resolved (and re-checked) in run()
+        self.processes = processes          # The caller's ProcessManager, so browsers a launch job leaves open stay tracked
+        self.ocr_workers = ocr_workers      # See ocr_pool.worker_count
+        self.engine = AutomationEngine(mode, batch_size, search_count, scan_url, update_after, scan_source,
+                                       on_log=self.on_log, on_result=on_result, tracer=self.tracer, overlap=overlap)
+
+    @property
+    def results(self): return self.engine.results
+
+    @property
+    def failed(self): return self.engine.failed
+
+    @property
+    def error(self): return self.engine.error
+
+    def log(self, message): self.on_log(message)
+
+    def summary(self): return self.engine.summary()
+
+    def backends(self):
+        from backends import real_backends
+        return real_backends(self.mode, self.scan_url, self.scan_source, self.devtools_port, locator=self.locator,
+                             tracer=self.tracer, on_error=lambda e: self.log(f"DB write failed: {e}"), processes=self.processes,
+                             ocr_workers=self.ocr_workers, tesseract_cmd=self.tesseract_cmd)
+
+    def run(self):
+        """Runs the whole job on the calling thread; returns summary()."""
+        try:
+            from ocr_engine import configure_tesseract
+            self.tesseract_cmd = configure_tesseract(self.tesseract_cmd)
+            if not self.tesseract_cmd and self.mode != "launch": self.log("Tesseract not found, OCR scans will fail.")
+            return asyncio.run(self.engine.run(self.backends, self.selected_ids))
+        except Exception as e:
+            self.engine.error = str(e)
+            self.log(f"Worker Error: {str(e)}")
+            return self.summary()
+        finally:
+            self.tracer.close()
+
+    def stop(self): self.engine.stop()
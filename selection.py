@@ -0,0 +1,148 @@
+import re
+
+from sqlalchemy import select, and_, or_, not_, true, false
+
+from db_model import Profile, MembershipLevel, EdgeFolder
+
+# --- SELECTION QUERIES ---
+# Evaluated as one SELECT over the profiles table, e.g.
+#   gold & points>5000 & 1-20,35
+#   (silver | gold) & !email~outlook
+# Terms:
+#   gold / silver / member          membership tier (plural allowed)
+#   points>5000 (>, >=, <, <=, =, !=); also id, and conf (OCR confidence of the last read, 0-100),
+#                                   today, streak and search (today's points, day streak, PC search points)
+#   name~text, email~text, dir~text  substring match, case-insensitive (= for an exact match)
+#   1-20,35                         1-based positions in the list, like the range dialog
+#   missing                         profiles whose Edge folder was gone at the last detection
+#   all / none
+# Combine with & (and), | (or), ! (not) and parentheses. & binds tighter than |.
+
+class QueryError(ValueError):
+    pass
+
+_TOKEN = re.compile(r"""\s*(?:
+    (?P<positions>\d+(?:\s*-\s*\d+)?(?:\s*,\s*\d+(?:\s*-\s*\d+)?)*)(?![\w.])
+  | (?P<compare>[a-z_]+)\s*(?P<op>>=|<=|!=|=|>|<|~)\s*(?P<value>"[^"]*"|'[^']*'|[^\s&|()!]+)
+  | (?P<word>[a-z_]+)
+  | (?P<punct>[&|!()])
+)""", re.VERBOSE | re.IGNORECASE)
+
+_TIERS = {"member": MembershipLevel.MEMBER, "members": MembershipLevel.MEMBER, "free": MembershipLevel.MEMBER,
+          "silver": MembershipLevel.SILVER, "gold": MembershipLevel.GOLD}
+_NUMBER_FIELDS = {"points": Profile.available_points, "id": Profile.id, "conf": Profile.points_conf,
+                  "today": Profile.today_points, "streak": Profile.streak, "search": Profile.search_points}
+_TEXT_FIELDS = {"name": Profile.name, "email": Profile.email, "dir": Profile.edge_profile_directory}
+
+def tokenize(text):
+    tokens, pos = [], 0
+    text = text.strip()
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        if not m or m.end() == pos: raise QueryError(f"Can't read the query at: {text[pos:pos + 15]!r}")
+        tokens.append(m)
+        pos = m.end()
+        while pos < len(text) and text[pos].isspace(): pos += 1
+    return tokens
+
+def parse_positions(text, count=None):
+    """'1-5, 8' -> [1, 2, 3, 4, 5, 8]. With the list length `count`, ranges are cut to 1..count
+    before they are expanded, so '1-999999999' costs no more than 'all'."""
+    out = []
+    for part in text.split(','):
+        lo, _, hi = part.partition('-')
+        lo = int(lo); hi = int(hi) if hi.strip() else lo
+        lo, hi = min(lo, hi), max(lo, hi)
+        if count is not None: lo, hi = max(lo, 1), min(hi, count)
+        out.extend(range(lo, hi + 1))
+    return out
+
+def _contains(value):
+    """ilike pattern matching `value` literally: % and _ in it aren't wildcards."""
+    return "%" + value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+class _Parser:
+    def __init__(self, tokens, position_ids, count):
+        self.tokens, self.i = tokens, 0
+        self.position_ids = position_ids
+        self.count = count
+
+    def peek(self):
+        if self.i >= len(self.tokens): return None
+        return self.tokens[self.i].group("punct")
+
+    def parse(self):
+        clause = self.expr()
+        if self.i < len(self.tokens): raise QueryError(f"Unexpected {self.tokens[self.i].group(0).strip()!r}")
+        return clause
+
+    def expr(self):
+        parts = [self.term()]
+        while self.peek() == '|': self.i += 1; parts.append(self.term())
+        return parts[0] if len(parts) == 1 else or_(*parts)
+
+    def term(self):
+        parts = [self.factor()]
+        while self.peek() == '&': self.i += 1; parts.append(self.factor())
+        return parts[0] if len(parts) == 1 else and_(*parts)
+
+    def factor(self):
+        if self.i >= len(self.tokens): raise QueryError("Query ends too early")
+        punct = self.peek()
+        if punct == '!':
+            self.i += 1
+            return not_(self.factor())
+        if punct == '(':
+            self.i += 1
+            clause = self.expr()
+            if self.peek() != ')': raise QueryError("Missing ')'")
+            self.i += 1
+            return clause
+        if punct: raise QueryError(f"Unexpected {punct!r}")
+        m = self.tokens[self.i]; self.i += 1
+        return self.atom(m)
+
+    def atom(self, m):
+        if m.group("positions"):
+            if self.position_ids is None: raise QueryError("Positions need the list order")
+            return Profile.id.in_(self.position_ids(parse_positions(m.group("positions"), self.count)))
+        if m.group("word"):
+            word = m.group("word").lower()
+            if word in _TIERS: return Profile.membership == _TIERS[word]
+            if word == "missing":
+                return Profile.edge_profile_directory.in_(select(EdgeFolder.directory).where(EdgeFolder.present.is_(False)))
+            if word == "all": return true()
+            if word == "none": return false()
+            raise QueryError(f"Unknown word {m.group('word')!r}")
+        field, op, value = m.group("compare").lower(), m.group("op"), m.group("value").strip("\"'")
+        if field in _NUMBER_FIELDS:
+            column = _NUMBER_FIELDS[field]
+            try: number = int(value.replace(",", ""))
+            except ValueError: raise QueryError(f"{field} needs a number, got {value!r}")
+            if op == '~': raise QueryError(f"Use <, >, = with {field}")
+            return {'>': column > number, '>=': column >= number, '<': column < number,
+                    '<=': column <= number, '=': column == number, '!=': column != number}[op]
+        if field in _TEXT_FIELDS:
+            column = _TEXT_FIELDS[field]
+            if op == '~': return column.ilike(_contains(value), escape="\\")
+            if op == '=': return column == value
+            if op == '!=': return column != value
+            raise QueryError(f"Use ~ or = with {field}")
+        if field in ("tier", "membership"):
+            if value.lower() not in _TIERS: raise QueryError(f"Unknown tier {value!r}")
+            level = Profile.membership == _TIERS[value.lower()]
+            if op == '=': return level
+            if op == '!=': return not_(level)
+            raise QueryError(f"Use = or != with {field}")
+        raise QueryError(f"Unknown field {field!r}")
+
+def compile_query(text, position_ids=None, count=None):
+    """Query text -> SQLAlchemy WHERE clause. position_ids(list of 1-based positions) -> ids resolves ranges;
+    `count` (the list length) bounds them."""
+    tokens = tokenize(text)
+    if not tokens: raise QueryError("Empty query")
+    return _Parser(tokens, position_ids, count).parse()
+
+def run_query(session, text, position_ids=None, count=None):
+    """Set of profile ids matching the query."""
+    return set(session.scalars(select(Profile.id).where(compile_query(text, position_ids, count))))
@@ -13,7 +13,15 @@ class SettingsManager:
         "last_search_val": 30,
         "scan_url": "https://rewards.bing.com/pointsbreakdown",
         "always_on_top": False,
-        "font_size": 13  # <--- NEW SETTING
+        "font_size": 13,  # <--- NEW SETTING
+        "scan_source": "ocr",  # "ocr" or "dom" (read the page over DevTools, OCR as fallback)
+        "devtools_port": 9222,
+        "trace_enabled": False,  # Per-phase timing spans for every run
+        "trace_file": "scan_trace.jsonl",
+        "last_query": "",
+        "tesseract_cmd": "",  # Resolved tesseract.exe, re-checked (one stat) before use
+        "ocr_workers": 0,  # OCR processes: 0 = one per spare CPU core (up to 4), 1 = OCR on a thread in the app
+        "preload_automation": True  # Load OCR/automation modules in the background after the window shows
     }
 
     @staticmethod
@@ -0,0 +1,60 @@
+import json
+import os
+import shutil
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from controller import ProfileController
+from db_model import Profile, init_db, make_engine
+from fakes import make_user_data
+
+def set_name(user_data, item, full_name):
+    """Rewrites a profile's Preferences with a new account name, like Edge after a sign-in."""
+    path = os.path.join(user_data, item, "Preferences")
+    with open(path, encoding="utf-8") as f: prefs = json.load(f)
+    prefs["account_info"] = [{"email": f"{item}@example.com", "full_name": full_name, "given_name": full_name}]
+    with open(path, "w", encoding="utf-8") as f: json.dump(prefs, f, sort_keys=True, separators=(",", ":"))
+
+@pytest.fixture
+def controller(tmp_path):
+    engine = make_engine(str(tmp_path / "profiles.db"))
+    init_db(engine, verbose=False)
+    controller = ProfileController(sessionmaker(bind=engine)())
+    yield controller
+    controller.close()
+    engine.dispose()
+
+def names(controller):
+    return {p.edge_profile_directory: p.name for p in controller.get_all_profiles(fresh=True)}
+
+def test_detect_add_rename_unchanged_removed(controller, tmp_path):
+    user_data = str(tmp_path / "User Data")
+    make_user_data(user_data, 3, pad_kb=1)
+    result = controller.auto_detect_profiles(user_data, workers=1)
+    assert (result.added, result.read) == (3, 3)
+    assert set(names(controller)) == {"Default", "Profile 1", "Profile 2"}
+
+    assert not controller.auto_detect_profiles(user_data, workers=1)     # Unchanged: nothing read
+
+    set_name(user_data, "Profile 1", "Renamed Person")
+    result = controller.auto_detect_profiles(user_data, workers=1)
+    assert (result.updated, result.read) == (1, 1)
+    assert names(controller)["Profile 1"] == "Renamed Person"
+
+    shutil.rmtree(os.path.join(user_data, "Profile 2"))
+    result = controller.auto_detect_profiles(user_data, workers=1)
+    assert (result.removed, result.read) == (1, 0)
+    assert [p.edge_profile_directory for p in controller.get_missing_profiles()] == ["Profile 2"]
+
+def test_other_user_data_folder_is_read_again(controller, tmp_path):
+    stable, beta = str(tmp_path / "Edge" / "User Data"), str(tmp_path / "Edge Beta" / "User Data")
+    make_user_data(stable, 3, pad_kb=1)
+    shutil.copytree(stable, beta)           # Same folder names, sizes and mtimes: only the root tells them apart
+    shutil.rmtree(os.path.join(beta, "Profile 2"))
+    controller.auto_detect_profiles(stable, workers=1)
+
+    result = controller.auto_detect_profiles(beta, workers=1)
+    assert result.read == 2 and result.removed == 0
+    assert controller.get_missing_profiles() == []      # Profile 2 is only absent from the other tree
+    assert controller.session.query(Profile).count() == 3
@@ -0,0 +1,16 @@
+import json
+import os
+
+import pytest
+
+from dashboard import parse_dashboard
+
+with open(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bench_data", "ocr_text.json")) as f:
+    CASES = json.load(f)
+
+@pytest.mark.parametrize("case", CASES, ids=[case["name"] for case in CASES])
+def test_parse_dashboard(case):
+    reading = parse_dashboard(case["text"])
+    expect = dict(case["expect"])
+    assert (reading.points, reading.membership) == (expect.pop("points"), expect.pop("membership"))
+    assert {k: list(v) if isinstance(v, tuple) else v for k, v in reading.fields.items()} == expect
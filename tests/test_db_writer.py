@@ -0,0 +1,76 @@
+import json
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from db_model import Base, Profile, ScanHistory, make_engine
+from db_writer import ScanResultWriter, detail_columns
+
+def test_detail_columns_every_field():
+    row = detail_columns({"today": 175, "streak": 3, "auto_redeem": 0, "pc_search": (45, 90), "mobile_search": (0, 60)})
+    assert row == {"today_points": 175, "streak": 3, "auto_redeem": 0, "search_points": 45, "search_max": 90,
+                   "mobile_points": 0, "mobile_max": 60}
+
+def test_detail_columns_clears_fields_not_read():
+    assert detail_columns({"today": 60})["mobile_max"] is None
+    assert detail_columns({}) == {} and detail_columns(None) == {}
+
+def test_writer_saves_details(tmp_path):
+    engine = make_engine(str(tmp_path / "p.db"))
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as session, session.begin():
+        session.add(Profile(id=1, name="A", edge_profile_directory="Default"))
+    writer = ScanResultWriter(Session)
+    writer.put(1, 4290, "Gold", fields={"auto_redeem": 2000, "mobile_search": (30, 60)})
+    writer.close()
+    with Session() as session:
+        p = session.scalars(select(Profile)).one()
+        assert (p.available_points, p.auto_redeem, p.mobile_points, p.mobile_max) == (4290, 2000, 30, 60)
+        assert p.details_run == p.last_run
+    engine.dispose()
+
+def flaky(Session, failures):
+    """Session factory whose first `failures` sessions fail to commit, like a locked database."""
+    left = [failures]
+    def make():
+        if left[0]:
+            left[0] -= 1
+            raise RuntimeError("database is locked")
+        return Session()
+    return make
+
+@pytest.fixture
+def db(tmp_path):
+    engine = make_engine(str(tmp_path / "p.db"))
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as session, session.begin():
+        session.add_all([Profile(id=1, name="A", edge_profile_directory="Default"), Profile(id=2, name="B", edge_profile_directory="Profile 1")])
+    yield Session
+    engine.dispose()
+
+def test_failed_flush_is_retried(db):
+    errors = []
+    writer = ScanResultWriter(flaky(db, 1), on_error=errors.append, flush_ms=60000)
+    writer.put(1, 100, "Gold")
+    writer.flush(wait=True)
+    assert len(errors) == 1 and writer.written == 0
+    writer.put(2, 200, "Silver")
+    writer.flush(wait=True)
+    writer.close()
+    with db() as session:
+        assert [(p.id, p.available_points) for p in session.scalars(select(Profile).order_by(Profile.id))] == [(1, 100), (2, 200)]
+        assert session.scalar(select(func.count()).select_from(ScanHistory)) == 2
+
+def test_results_dumped_after_max_retries(db, tmp_path):
+    dump = tmp_path / "unsaved.jsonl"
+    writer = ScanResultWriter(flaky(db, 2), flush_ms=60000, max_retries=2, dump_path=str(dump))
+    writer.put(1, 100, "Gold", conf={"points": 91})
+    writer.flush(wait=True); writer.flush(wait=True)
+    writer.close()
+    assert writer.dropped == 1 and writer.written == 0
+    lines = [json.loads(line) for line in dump.read_text().splitlines()]
+    assert lines[0]["profile"]["available_points"] == 100 and lines[0]["profile"]["membership"] == "Gold"
+    assert lines[1]["history"]["points"] == 100 and lines[1]["history"]["points_conf"] == 91
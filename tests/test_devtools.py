@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from capture import FrameCapture
+from devtools import DevToolsClient, StandInDevToolsServer
+from scanner import DashboardScanner
+
+SCAN_URL = "https://rewards.bing.com/pointsbreakdown"
+
+PAGE = """<html><head><style>.x { color: red }</style><script>var a = "<div>9,999</div>";</script></head><body>
+<div>Hi sourabh</div><div>Gold Member</div>
+<div>Available points</div><div>4,290</div>
+<div>Auto-redeem</div><div>-</div>
+<div>Today's points</div><div>175</div>
+{padding}
+</body></html>"""
+
+@pytest.fixture
+def scanner():
+    return DashboardScanner(SCAN_URL, capture=FrameCapture(np.zeros((8, 8), np.uint8)), memo_size=0)
+
+# filler lines: none (7-bit and 16-bit frame lengths) or a page text over 64 KB (64-bit length);
+# fragment: replies split into frames of that many bytes
+@pytest.mark.parametrize("filler, fragment", [(0, None), (6000, None), (6000, 4096), (0, 100)])
+def test_page_text_round_trip(scanner, filler, fragment):
+    html = PAGE.replace("{padding}", "<p>filler words</p>" * filler)
+    server = StandInDevToolsServer(html, "https://rewards.bing.com/", fragment=fragment).start()
+    try:
+        text = DevToolsClient(server.port).page_text(SCAN_URL)
+    finally:
+        server.stop()
+    assert text == server.text
+    assert (len(text.encode()) > 65536) == bool(filler)
+    reading = scanner.parse_text(text)
+    assert (reading.points, reading.membership, reading.stage) == (4290, "Gold", "dom")
+    assert reading.fields["today"] == 175
+    assert reading.conf["points"] == 100
+
+def test_page_text_without_a_browser():
+    server = StandInDevToolsServer("<div>x</div>", "https://rewards.bing.com/").start()
+    port = server.port
+    server.stop()
+    assert DevToolsClient(port, timeout=1).page_text(SCAN_URL) is None
@@ -0,0 +1,30 @@
+import json
+import os
+
+import pytest
+
+from edge_profiles import fingerprint_folders, read_identity
+
+def write(path, prefs, **dump):
+    with open(path, "w", encoding="utf-8") as f: json.dump(prefs, f, **(dump or {"sort_keys": True, "separators": (",", ":")}))
+    return str(path)
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+def test_nested_profile_decoy_is_ignored(tmp_path, chunk_size):
+    prefs = {"account_info": [{"email": "a@example.com", "full_name": "", "given_name": ""}],
+             "extensions": {"settings": {"abc": {"profile": {"name": "Decoy"}}}, "note": "\"profile\":{\"name\":\"In a string\"}"},
+             "profile": {"content_settings": {"profile": {"name": "Nested decoy"}}, "name": "Real name"}}
+    path = write(tmp_path / "Preferences", prefs)
+    assert read_identity(path, chunk_size) == ("a@example.com", "", "", "Real name")
+
+def test_account_name_and_pretty_printed_file(tmp_path):
+    prefs = {"account_info": [{"email": "b@example.com", "full_name": "B Person", "given_name": "B"}], "profile": {"name": "Person 1"}}
+    path = write(tmp_path / "Preferences", prefs, indent=3)
+    assert read_identity(path, 5)[:3] == ("b@example.com", "B Person", "B")     # Reading stops once the account has a name
+
+def test_no_top_level_keys(tmp_path):
+    path = write(tmp_path / "Preferences", {"browser": {"profile": {"name": "Decoy"}}})
+    assert read_identity(path, 4) == ("Unknown", "", "", "")
+
+def test_fingerprint_folders_raises_when_user_data_is_unreadable(tmp_path):
+    with pytest.raises(OSError): fingerprint_folders(str(tmp_path / "missing"))
@@ -0,0 +1,85 @@
+import asyncio
+import json
+
+import pytest
+
+from backends import Storage, WindowManager
+from engine import AutomationEngine
+from fakes import fake_backends, make_profiles
+from tracing import Tracer
+
+PROFILES = 4
+TIMEOUTS = {"window": 2, "load": 3, "load_stable": 0.05, "search_load_stable": 0.05, "repaint": 0.2, "batch_pause": 0.05}
+
+def run(mode, overlap=True, fail_first=0):
+    """(summary, storage, desktop, handles claimed, stray windows) of one engine run over the fake desktop."""
+    profiles = make_profiles(PROFILES)
+    backends, desktop = fake_backends(profiles, launch_delay=0.01, load_delay=0.05, ocr_delay=0.01, flush_delay=0, fail_first=fail_first)
+    strays = [desktop.stray()]                  # Open before the run (baseline)...
+    launch = backends.launcher.launch
+    def launch_beside_stray(*args):
+        if len(strays) == 1: strays.append(desktop.stray())    # ...and one popping up in front during it
+        return launch(*args)
+    backends.launcher.launch = launch_beside_stray
+    claimed, claim = [], backends.windows.claim
+    def recording_claim(profile_dir):
+        handle = claim(profile_dir)
+        if handle is not None: claimed.append(handle)
+        return handle
+    backends.windows.claim = recording_claim
+    engine = AutomationEngine(mode, batch_size=2, search_count=6, on_log=lambda m: None, overlap=overlap, timeouts=TIMEOUTS)
+    summary = asyncio.run(engine.run(lambda: backends, [p.id for p in profiles]))
+    return summary, backends.storage, desktop, claimed, strays
+
+@pytest.mark.parametrize("fail_first", [0, 1])
+@pytest.mark.parametrize("overlap", [False, True], ids=["sequential", "overlap"])
+@pytest.mark.parametrize("mode", ["scan", "start"])
+def test_one_row_per_profile(mode, overlap, fail_first):
+    summary, storage, _, _, _ = run(mode, overlap, fail_first)
+    expected = {p.id: (p.points, p.membership) for p in make_profiles(PROFILES)}
+    assert summary["error"] is None and summary["failed"] == []
+    assert sorted(row[0] for row in storage.committed) == sorted(expected)
+    assert {pid: (points, mem) for pid, points, mem, *_ in storage.committed} == expected
+
+@pytest.mark.parametrize("overlap", [False, True], ids=["sequential", "overlap"])
+def test_launch_opens_one_window_per_profile(overlap):
+    summary, storage, desktop, claimed, _ = run("launch", overlap)
+    assert summary["error"] is None
+    assert desktop.launches == PROFILES and len(set(claimed)) == PROFILES
+    assert storage.committed == []      # Launching reads nothing
+
+@pytest.mark.parametrize("mode", ["scan", "start", "launch"])
+def test_stray_windows_left_alone(mode):
+    _, _, desktop, claimed, strays = run(mode)
+    for stray in strays:
+        assert stray.handle not in claimed
+        assert stray in desktop.windows and stray.title == "Inbox - Outlook - Microsoft Edge"
+
+def test_incomplete_backend_fails_when_built():
+    class NoFlush(Storage):
+        def load_profiles(self, ids): return []
+        def put(self, profile_id, points, membership, source, conf=None, fields=None): pass
+        def close(self): pass
+    with pytest.raises(TypeError): NoFlush()
+    with pytest.raises(TypeError): WindowManager(dict)
+
+def test_lane_spans_keep_bound_attributes(tmp_path):
+    """Spans opened on the screen and OCR threads (as the real scanner does) carry the batch/profile bound by the engine."""
+    path = tmp_path / "trace.jsonl"
+    tracer = Tracer(str(path))
+    profiles = make_profiles(PROFILES)
+    backends, _ = fake_backends(profiles, launch_delay=0.01, load_delay=0.05, ocr_delay=0.01, flush_delay=0)
+    def traced(name, fn):
+        def call(*args, **kwargs):
+            with tracer.span(name): return fn(*args, **kwargs)
+        return call
+    backends.capture.grab = traced("capture", backends.capture.grab)
+    backends.ocr.read_snapshot = traced("ocr", backends.ocr.read_snapshot)
+    engine = AutomationEngine("scan", batch_size=2, on_log=lambda m: None, tracer=tracer, timeouts=TIMEOUTS)
+    asyncio.run(engine.run(lambda: backends, [p.id for p in profiles]))
+    tracer.close()
+    spans = [json.loads(line) for line in path.read_text().splitlines()]
+    lanes = [s for s in spans if s["name"] in ("capture", "ocr")]
+    assert {s["name"] for s in lanes} == {"capture", "ocr"}
+    assert all(s.get("batch") in (1, 2) for s in lanes)
+    assert all("profile_id" in s for s in lanes if s["name"] == "ocr")
@@ -0,0 +1,61 @@
+import os
+import time
+
+import pytest
+
+from fakes import dummy_browser
+from processes import ProcessManager
+
+pytestmark = pytest.mark.skipif(not os.path.isdir("/proc/self"), reason="counts process group members in /proc")
+
+def group(pgid):
+    """Live (non-zombie) pids in a process group."""
+    pids = []
+    for name in os.listdir("/proc"):
+        if not name.isdigit(): continue
+        try:
+            with open(f"/proc/{name}/stat", "rb") as f: fields = f.read().rsplit(b")", 1)[1].split()
+        except OSError: continue
+        if int(fields[2]) == pgid and fields[0] != b"Z": pids.append(int(name))
+    return pids
+
+def wait_for(check, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not check():
+        if time.monotonic() > deadline: return False
+        time.sleep(0.02)
+    return True
+
+@pytest.fixture
+def managers():
+    made = []
+    def make(*args, **kwargs):
+        made.append(ProcessManager(*args, grace=1.0, **kwargs))
+        return made[-1]
+    yield make
+    for manager in made: manager.close_all()
+
+def test_close_all_kills_browser_and_children(managers):
+    manager = managers(dummy_browser(children=2))
+    procs = [manager.launch(f"Profile {i}") for i in range(2)]
+    assert wait_for(lambda: all(len(group(p.pid)) == 3 for p in procs))
+    assert manager.close_all() == 2
+    assert all(group(p.pid) == [] for p in procs)
+    assert not manager.any_running() and manager.pids() == {}
+
+def test_handoff_launch_is_counted(managers):
+    manager = managers(dummy_browser(handoff=True))
+    proc = manager.launch("Profile 1")
+    assert wait_for(lambda: proc.popen.poll() is not None)
+    assert manager.close_all() == 0
+    assert manager.handed_off == 1
+
+def test_foreign_browser_survives(managers):
+    foreign = managers(dummy_browser(children=1))     # Stands in for the user's own Edge
+    theirs = foreign.launch("Default")
+    manager = managers(dummy_browser(children=1))
+    ours = manager.launch("Profile 1")
+    assert wait_for(lambda: len(group(theirs.pid)) == 2 and len(group(ours.pid)) == 2)
+    manager.close_all()
+    assert group(ours.pid) == []
+    assert len(group(theirs.pid)) == 2 and foreign.pids() == {"Default": theirs.pid}
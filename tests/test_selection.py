@@ -0,0 +1,38 @@
+import time
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from db_model import Base, Profile, make_engine
+from selection import parse_positions, run_query
+
+@pytest.fixture
+def session(tmp_path):
+    engine = make_engine(str(tmp_path / "p.db"))
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        session.add_all([Profile(id=i, name=name, email=email, edge_profile_directory=f"Profile {i}") for i, (name, email) in
+                         enumerate([("work_1", "a_b@example.com"), ("work 1", "axb@example.com"), ("50% off", "c@example.com"),
+                                    ("500 off", "d\\e@example.com")], 1)])
+        session.commit()
+        yield session
+    engine.dispose()
+
+def test_huge_range_is_cut_to_the_list():
+    t0 = time.perf_counter()
+    assert parse_positions("1-999999999", count=4) == [1, 2, 3, 4]
+    assert parse_positions("3-1, 9, 0-2", count=4) == [1, 2, 3, 1, 2]
+    assert time.perf_counter() - t0 < 0.5
+    assert parse_positions("2-4, 7") == [2, 3, 4, 7]       # Without a count: as written
+
+def test_query_positions_bounded(session):
+    order = [1, 2, 3, 4]
+    resolve = lambda ns: {order[n - 1] for n in ns if 1 <= n <= len(order)}
+    assert run_query(session, "2-999999999 & !3", resolve, len(order)) == {2, 4}
+
+@pytest.mark.parametrize("query, expected", [
+    ("name~work_", {1}), ("name~_", {1}), ("name~%", {3}), ("name~0%", {3}),
+    ("email~a_b", {1}), ("email~\\", {4}), ("name~WORK", {1, 2}),
+])
+def test_text_match_is_literal(session, query, expected):
+    assert run_query(session, query) == expected
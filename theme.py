@@ -0,0 +1,161 @@
+from functools import lru_cache
+
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPen, QBrush
+
+# --- COLOURS (shared by stylesheets and painted rows) ---
+COLORS = {
+    "card": "#2b2b2b", "card_hover": "#323232", "card_border": "#3d3d3d", "card_border_hover": "#5a5a5a",
+    "accent": "#0e639c", "check_border": "#555", "check_border_hover": "#888",
+    "name": "#e0e0e0", "email": "#888888", "email_hover": "#3daee9", "points": "#00e676",
+}
+# Tier -> (badge background, badge text)
+TIERS = {"Member": ("#555555", "#ffffff"), "Silver": ("#90a4ae", "#ffffff"), "Gold": ("#ffb300", "#000000")}
+
+# --- STYLESHEETS (plain templates, formatted once) ---
+_MAIN_WINDOW = """
+    QMainWindow { background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #1e1e1e, stop:1 #181818); }
+    QMenuBar { background-color: #2b2b2b; color: #ddd; }
+    QMenuBar::item { padding: 5px 10px; background-color: transparent; }
+    QMenuBar::item:selected { background-color: #3e3e42; }
+    QMenu { background-color: #252526; color: white; border: 1px solid #444; }
+    QMenu::item { padding: 5px 20px; }
+    QMenu::item:selected { background-color: #0e639c; }
+
+    QToolBar { background-color: #252526; border-bottom: 2px solid #0e639c; spacing: 10px; padding: 5px; }
+    QToolButton { background-color: #444; border: 1px solid #555; color: #f0f0f0; border-radius: 6px; padding: 6px; margin: 2px; }
+    QToolButton:hover { background-color: #230; border: 1px solid #555; }
+    QToolButton:pressed { background-color: #0e639c; color: white; }
+    /* Launch button while a batch is waiting: toggled with set_state(widget, "active", ...) */
+    QToolButton[active="true"] { background-color: #2e7d32; border: 1px solid #1b5e20; }
+    QToolButton[active="true"]:hover { background-color: #388e3c; }
+
+    QCheckBox { color: #ccc; font-weight: bold; spacing: 5px; }
+    QCheckBox::indicator { width: 16px; height: 16px; border: 1px solid #555; border-radius: 3px; background: #333; }
+    QCheckBox::indicator:checked { background-color: #0e639c; border-color: #0e639c; }
+
+    /* --- COMPACT PILL SHAPE SPINBOX --- */
+    QSpinBox {
+        background-color: #ffffff;
+        color: #5856D6;         /* Purple Text */
+        font-family: 'Segoe UI';
+        font-weight: bold;
+        font-size: 13px;
+        border-radius: 15px;    /* Half of height (30px) */
+        padding: 0px 30px;      /* Reduced padding */
+        min-height: 30px;       /* Compact Height */
+        max-height: 30px;
+        min-width: 80px;
+        max-width: 100px;
+        selection-background-color: transparent;
+        selection-color: #5856D6;
+    }
+
+    /* DOWN BUTTON (Left Purple Circle) */
+    QSpinBox::down-button {
+        subcontrol-origin: border;
+        subcontrol-position: center left;
+        width: 30px;
+        height: 30px;
+        background-color: #4b49b6;
+        border-top-left-radius: 15px;
+        border-bottom-left-radius: 15px;
+        border: none;
+    }
+    QSpinBox::down-button:hover { background-color: #3d3b94; }
+    QSpinBox::down-button:pressed { background-color: #2a2970; }
+
+    /* UP BUTTON (Right Purple Circle) */
+    QSpinBox::up-button {
+        subcontrol-origin: border;
+        subcontrol-position: center right;
+        width: 30px;
+        height: 30px;
+        background-color: #4b49b6;
+        border-top-right-radius: 15px;
+        border-bottom-right-radius: 15px;
+        border: none;
+    }
+    QSpinBox::up-button:hover { background-color: #3d3b94; }
+    QSpinBox::up-button:pressed { background-color: #2a2970; }
+
+    /* ARROWS - Using Assets from Folder */
+    QSpinBox::up-arrow, QSpinBox::down-arrow { width: 16px; height: 16px; image: none; }
+    QSpinBox::up-arrow { image: url("%(img_plus)s"); }
+    QSpinBox::down-arrow { image: url("%(img_minus)s"); }
+
+    /* PROFILE LIST, SCROLLBAR & OTHERS */
+    QListView { border: none; background: transparent; }
+    QScrollBar:vertical { border: none; background: #1e1e1e; width: 10px; }
+    QScrollBar::handle:vertical { background: #444; min-height: 20px; border-radius: 5px; }
+    QStatusBar { background-color: #181818; color: #666; border-top: 1px solid #333; }
+    QLabel#StatusRight { color: #00e676; font-weight: bold; padding-right: 15px; }
+    QLabel#SectionLabel { color: #ccc; font-size: 11px; font-weight: bold; margin-bottom: 2px; }
+"""
+
+FILTER_DIALOG = """
+    QDialog { background-color: #252526; color: white; }
+    QLabel { color: #ccc; font-weight: bold; }
+    QSpinBox { background: #333; border: 1px solid #555; color: white; padding: 4px; }
+    QPushButton { background: #0e639c; color: white; border: none; padding: 6px; border-radius: 4px; }
+    QPushButton:hover { background: #1177bb; }
+"""
+
+SETTINGS_DIALOG = """
+    QDialog { background-color: #252526; color: white; }
+    QLabel { font-size: 13px; font-weight: bold; color: #ddd; }
+    QSpinBox {
+        background-color: #333; border: 2px solid #555; border-radius: 6px; padding: 6px; color: white; font-size: 14px; font-weight: bold;
+    }
+    QLineEdit { background-color: #333; border: 2px solid #555; border-radius: 6px; padding: 6px; color: #00e676; font-family: 'Consolas', monospace; }
+    QCheckBox { spacing: 8px; color: #ddd; font-weight: bold; }
+    QCheckBox::indicator { width: 18px; height: 18px; border-radius: 4px; border: 2px solid #555; background-color: #333; }
+    QCheckBox::indicator:checked { background-color: #0e639c; border-color: #0e639c; }
+    QGroupBox { border: 1px solid #444; border-radius: 6px; margin-top: 10px; font-weight: bold; color: #aaa; }
+    QPushButton { background-color: #0e639c; color: white; border: none; padding: 8px 20px; border-radius: 4px; font-weight: bold; }
+    QPushButton:hover { background-color: #1177bb; }
+"""
+
+@lru_cache(maxsize=None)
+def main_stylesheet(img_plus, img_minus):
+    """The main window sheet, formatted once per set of icon paths."""
+    return _MAIN_WINDOW % {"img_plus": img_plus, "img_minus": img_minus}
+
+def set_state(widget, name, value):
+    """Switches a [name="value"] rule of an already applied sheet without re-parsing any stylesheet."""
+    if widget.property(name) == value: return
+    widget.setProperty(name, value)
+    widget.style().unpolish(widget); widget.style().polish(widget)
+
+# --- CACHED PAINT OBJECTS FOR THE PROFILE LIST DELEGATE ---
+class RowPalette:
+    """QColor/QPen/QBrush objects for a painted row, built once instead of on every paint."""
+    def __init__(self):
+        c = {k: QColor(v) for k, v in COLORS.items()}
+        self.card_pen = (QPen(c["card_border"], 1), QPen(c["card_border_hover"], 1))    # (normal, hovered)
+        self.card_brush = (QBrush(c["card"]), QBrush(c["card_hover"]))
+        self.check_on = (QPen(c["accent"], 2), QBrush(c["accent"]))
+        self.check_off = (QPen(c["check_border"], 2), QPen(c["check_border_hover"], 2), QBrush(c["card"]))
+        self.name_pen = QPen(c["name"])
+        self.email_pen = (QPen(c["email"]), QPen(c["email_hover"]))
+        self.points_pen = QPen(c["points"])
+        self.tiers = {level: (QBrush(QColor(bg)), QPen(QColor(fg))) for level, (bg, fg) in TIERS.items()}
+
+    def tier(self, level): return self.tiers.get(level, self.tiers["Member"])
+
+class RowFonts:
+    """Fonts and metrics for one font size."""
+    def __init__(self, size):
+        self.name = QFont("Segoe UI", size, QFont.Bold)
+        self.email = QFont("Segoe UI", size, QFont.Normal)
+        self.email_hover = QFont(self.email); self.email_hover.setUnderline(True)
+        self.points = QFont("Segoe UI", 14, QFont.Bold)
+        self.badge = QFont("Segoe UI"); self.badge.setPixelSize(10); self.badge.setBold(True)
+        self.name_metrics = QFontMetrics(self.name)
+        self.email_metrics = QFontMetrics(self.email)
+        self.points_metrics = QFontMetrics(self.points)
+
+@lru_cache(maxsize=1)
+def row_palette(): return RowPalette()     # Needs a QGuiApplication, so built on first paint
+
+@lru_cache(maxsize=8)
+def row_fonts(size): return RowFonts(size)
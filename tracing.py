@@ -0,0 +1,90 @@
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging.handlers import RotatingFileHandler
+
+# --- PER-PHASE TIMING SPANS, WRITTEN AS JSONL ---
+# with tracer.bind(profile_id=3, batch=1):
+#     with tracer.span("ocr", attempt=2): ...
+# Each span becomes one line: {"run": ..., "name": "ocr", "dur_ms": 812.4, "profile_id": 3, "batch": 1, "attempt": 2, ...}
+
+class _NullSpan:
+    __slots__ = ()
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+
+NULL_SPAN = _NullSpan()
+
+class _Span:
+    __slots__ = ("tracer", "name", "attrs", "t0")
+
+    def __init__(self, tracer, name, attrs):
+        self.tracer, self.name, self.attrs = tracer, name, attrs
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer._record(self.name, self.t0, time.perf_counter(), self.attrs, exc_type is None)
+        return False
+
+class Tracer:
+    """Timing spans for a Worker run. With no path it is disabled and span() returns a shared no-op."""
+    def __init__(self, path=None, max_bytes=5 * 1024 * 1024, backups=3):
+        self.enabled = bool(path)
+        self.run_id = time.strftime("%Y%m%d-%H%M%S")
+        self.bound = ContextVar(f"trace.{self.run_id}", default={})    # Per thread and per asyncio task
+        self.lock = threading.Lock()
+        self.totals = {}            # span name -> [count, seconds]
+        self.profiles = {}          # profile name -> seconds spent in its "profile" span
+        self.logger = None
+        if self.enabled:
+            handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self.logger = logging.Logger(f"trace.{self.run_id}")
+            self.logger.addHandler(handler)
+
+    def span(self, name, **attrs):
+        if not self.enabled: return NULL_SPAN
+        return _Span(self, name, attrs)
+
+    @contextmanager
+    def bind(self, **attrs):
+        """Attributes (profile_id, batch, attempt...) added to every span opened inside the block."""
+        if not self.enabled:
+            yield
+            return
+        token = self.bound.set({**self.bound.get(), **attrs})
+        try: yield
+        finally: self.bound.reset(token)
+
+    def _record(self, name, t0, t1, attrs, ok):
+        seconds = t1 - t0
+        record = {"run": self.run_id, "ts": round(time.time() - seconds, 3), "name": name,
+                  "dur_ms": round(seconds * 1000, 2), "ok": ok, **self.bound.get(), **attrs}
+        with self.lock:
+            total = self.totals.setdefault(name, [0, 0.0])
+            total[0] += 1; total[1] += seconds
+            if name == "profile" and "profile_id" in record:
+                label = record.get("profile") or f"#{record['profile_id']}"
+                self.profiles[label] = self.profiles.get(label, 0.0) + seconds
+        self.logger.info(json.dumps(record))
+
+    def summary(self, slowest=3):
+        if not self.enabled or not self.totals: return ""
+        phases = sorted(self.totals.items(), key=lambda kv: -kv[1][1])
+        text = "Trace: " + ", ".join(f"{name} {secs:.1f}s/{count}" for name, (count, secs) in phases)
+        if self.profiles:
+            worst = sorted(self.profiles.items(), key=lambda kv: -kv[1])[:slowest]
+            text += " | Slowest: " + ", ".join(f"{label} {secs:.1f}s" for label, secs in worst)
+        return text
+
+    def close(self):
+        if self.logger:
+            for h in list(self.logger.handlers): h.close(); self.logger.removeHandler(h)
+
+NULL_TRACER = Tracer()
@@ -1,135 +1,279 @@
-from PySide6.QtWidgets import (QWidget, QHBoxLayout, QLabel, QCheckBox, QFrame, QPushButton)
-from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QCursor, QFont
-
-class ClickableLabel(QLabel):
-    clicked = Signal()
-    
-    def __init__(self, text="", parent=None):
-        super().__init__(text, parent)
-        self.setAttribute(Qt.WA_Hover)
-
-    def mousePressEvent(self, event):
-        if event.button() == Qt.LeftButton: self.clicked.emit()
-        super().mousePressEvent(event)
-
-class ProfileCard(QWidget):
-    membership_changed = Signal(int, str)
-    launch_requested = Signal(object) 
+from PySide6.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView
+from PySide6.QtCore import Qt, Signal, QAbstractListModel, QModelIndex, QRect, QSize
+from PySide6.QtGui import QPainter, QCursor
+
+from theme import row_palette, row_fonts
+
+MEMBERSHIP_CYCLE = {"Member": "Silver", "Silver": "Gold", "Gold": "Member"}
+
+class ProfileRow:
+    """Plain per-row data for the list; the painted row never touches the ORM object."""
+    __slots__ = ("id", "name", "email", "membership", "points", "profile")
+
+    def __init__(self, profile):
+        self.id = profile.id
+        self.name = profile.name
+        self.email = profile.email
+        self.membership = profile.membership.value
+        self.points = profile.available_points or 0
+        self.profile = profile
+
+    def refresh(self, profile):
+        """Copies changed fields from `profile`; True if anything visible changed."""
+        new = (profile.name, profile.email, profile.membership.value, profile.available_points or 0)
+        self.profile = profile
+        if new == (self.name, self.email, self.membership, self.points): return False
+        self.name, self.email, self.membership, self.points = new
+        return True
+
+class ProfileListModel(QAbstractListModel):
+    ProfileRole = Qt.UserRole + 1
+    check_changed = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []
+        self.row_of = {}            # profile id -> row number
+        self.selected = set()       # checked profile ids
+
+    # --- Qt model API ---
+    def rowCount(self, parent=QModelIndex()): return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid(): return None
+        row = self.rows[index.row()]
+        if role == Qt.DisplayRole: return row.name
+        if role == Qt.CheckStateRole: return Qt.Checked if row.id in self.selected else Qt.Unchecked
+        if role == self.ProfileRole: return row
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or not index.isValid(): return False
+        pid = self.rows[index.row()].id
+        if value in (True, Qt.Checked, Qt.Checked.value): self.set_selection(self.selected | {pid})
+        else: self.set_selection(self.selected - {pid})
+        return True
+
+    def flags(self, index):
+        return Qt.ItemIsEnabled | Qt.ItemIsUserCheckable if index.isValid() else Qt.NoItemFlags
+
+    # --- Profile helpers ---
+    def set_profiles(self, profiles):
+        self.beginResetModel()
+        self.rows = [ProfileRow(p) for p in profiles]
+        self.row_of = {r.id: i for i, r in enumerate(self.rows)}
+        self.selected = set(self.row_of)
+        self.endResetModel()
+        self.check_changed.emit()
+
+    def sync_profiles(self, profiles):
+        """Brings the rows in line with `profiles` (same order as before, e.g. by id) by removing,
+        inserting and updating only what differs. Check states and scroll position are kept,
+        new profiles start checked."""
+        incoming = {p.id: p for p in profiles}
+
+        # Removed profiles, last run first so earlier row numbers stay valid
+        gone = [i for i, r in enumerate(self.rows) if r.id not in incoming]
+        while gone:
+            last = first = gone.pop()
+            while gone and gone[-1] == first - 1: first = gone.pop()
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self.rows[first:last + 1]
+            self.endRemoveRows()
+
+        # New profiles in runs, changed ones in place
+        i, order, existing = 0, list(profiles), {r.id for r in self.rows}
+        while i < len(order):
+            p = order[i]
+            if i < len(self.rows) and self.rows[i].id == p.id:
+                if self.rows[i].refresh(p): self.dataChanged.emit(self.index(i), self.index(i))
+                i += 1
+                continue
+            if p.id in existing:   # Order changed under us, nothing to diff against
+                self.beginResetModel()
+                self.selected |= {q.id for q in order if q.id not in existing}
+                self.rows = [ProfileRow(q) for q in order]
+                self.endResetModel()
+                break
+            end = i
+            while end < len(order) and order[end].id not in existing: end += 1
+            self.beginInsertRows(QModelIndex(), i, end - 1)
+            self.rows[i:i] = [ProfileRow(q) for q in order[i:end]]
+            self.selected.update(q.id for q in order[i:end])
+            self.endInsertRows()
+            i = end
+
+        self.row_of = {r.id: i for i, r in enumerate(self.rows)}
+        self.selected.intersection_update(incoming)
+        self.check_changed.emit()
+
+    def ids(self): return [r.id for r in self.rows]
+
+    def ids_in_positions(self, positions):
+        """Profile ids for 1-based list positions (what the range and batch menus count in)."""
+        return {self.rows[n - 1].id for n in positions if 1 <= n <= len(self.rows)}
+
+    # --- Selection ---
+    def is_checked(self, pid): return pid in self.selected
+
+    def checked_ids(self): return [r.id for r in self.rows if r.id in self.selected]
+
+    def checked_count(self): return len(self.selected)
+
+    def set_selection(self, ids):
+        """Replaces the checked set. Only rows whose state flips are touched, with one notification
+        covering them; returns how many rows changed."""
+        ids = set(ids) & self.row_of.keys()
+        changed = ids ^ self.selected
+        if not changed: return 0
+        self.selected = ids
+        rows = [self.row_of[pid] for pid in changed]
+        self.dataChanged.emit(self.index(min(rows)), self.index(max(rows)), [Qt.CheckStateRole])
+        self.check_changed.emit()
+        return len(changed)
 
-    def __init__(self, profile_data, font_size=13):
-        super().__init__()
-        self.profile = profile_data 
-        self.current_membership = profile_data.membership.value
+    def select_all(self): return self.set_selection(self.row_of.keys())
+
+    def select_none(self): return self.set_selection(())
+
+    def invert_selection(self): return self.set_selection(self.row_of.keys() - self.selected)
+
+    def update_profile(self, pid, points=None, membership=None):
+        i = self.row_of.get(pid)
+        if i is None: return
+        row = self.rows[i]
+        if points is not None: row.points = points
+        if membership: row.membership = membership
+        self.dataChanged.emit(self.index(i), self.index(i))
+
+class ProfileDelegate(QStyledItemDelegate):
+    """Paints a profile row (checkbox, name, email, tier badge, points) without any child widgets."""
+    def __init__(self, font_size=13, parent=None):
+        super().__init__(parent)
+        self.hover = (None, None)       # (profile id, part) under the mouse
+        self.set_font_size(font_size)
+
+    def set_font_size(self, font_size):
         self.font_size = font_size
-        
-        self.layout = QHBoxLayout(self)
-        self.layout.setContentsMargins(2, 2, 2, 2)
-        self.layout.setSpacing(0)
-
-        self.frame = QFrame()
-        self.frame.setObjectName("CardFrame")
-        self.frame.setAttribute(Qt.WA_Hover) 
-        
-        # Frame Stylesheet
-        self.frame.setStyleSheet(f"""
-            #CardFrame {{ 
-                background-color: #2b2b2b; 
-                border-radius: 6px; 
-                border: 1px solid #3d3d3d; 
-            }}
-            #CardFrame:hover {{ 
-                border: 1px solid #5a5a5a; 
-                background-color: #323232; 
-            }}
-            QCheckBox {{ spacing: 8px; }}
-            QCheckBox::indicator {{ 
-                width: 18px; height: 18px; 
-                border-radius: 4px; 
-                border: 2px solid #555; 
-                background-color: #2b2b2b; 
-            }}
-            QCheckBox::indicator:hover {{ border-color: #888; }}
-            
-            /* REMOVED IMAGE - NOW USES SIMPLE BLUE SQUARE */
-            QCheckBox::indicator:checked {{ 
-                background-color: #0e639c; 
-                border: 2px solid #0e639c; 
-            }}
-        """)
-        
-        self.frame_layout = QHBoxLayout(self.frame)
-        self.frame_layout.setContentsMargins(10, 5, 10, 5)
-        self.frame_layout.setSpacing(15)
-
-        # 1. Checkbox
-        self.checkbox = QCheckBox()
-        self.checkbox.setChecked(True)
-        self.checkbox.setCursor(QCursor(Qt.PointingHandCursor))
-        self.frame_layout.addWidget(self.checkbox)
-
-        # 2. Name & Email (Single Line)
-        name_font = QFont("Segoe UI", self.font_size, QFont.Bold)
-        email_font = QFont("Segoe UI", self.font_size, QFont.Normal)
-        
-        self.name_label = QLabel(profile_data.name)
-        self.name_label.setFont(name_font)
-        self.name_label.setStyleSheet("color: #e0e0e0; background: transparent; border: none;")
-        
-        email_text = f"({profile_data.email})" if profile_data.email else ""
-        self.email_label = ClickableLabel(email_text)
-        self.email_label.setFont(email_font)
-        self.email_label.setCursor(QCursor(Qt.PointingHandCursor))
-        self.email_label.clicked.connect(self.request_launch)
-        
-        # Specific Hover Style for Email
-        self.email_label.setStyleSheet("""
-            QLabel { 
-                color: #888888; 
-                background: transparent; 
-                border: none; 
-            }
-            QLabel:hover { 
-                color: #3daee9; 
-                text-decoration: underline; 
-            }
-        """)
-        
-        self.frame_layout.addWidget(self.name_label)
-        self.frame_layout.addWidget(self.email_label)
-        
-        self.frame_layout.addStretch()
-
-        # 3. Badge
-        self.badge_btn = QPushButton(self.current_membership)
-        self.badge_btn.setCursor(QCursor(Qt.PointingHandCursor))
-        self.badge_btn.setFixedSize(60, 20)
-        self.badge_btn.clicked.connect(self.toggle_membership)
-        self.update_badge_style()
-        self.frame_layout.addWidget(self.badge_btn)
-
-        # 4. Points
-        self.points_label = QLabel(f"{profile_data.available_points:,}")
-        self.points_label.setFont(QFont("Segoe UI", 14, QFont.Bold))
-        self.points_label.setStyleSheet("color: #00e676; background: transparent; border: none;")
-        self.points_label.setFixedWidth(80) 
-        self.points_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-        self.frame_layout.addWidget(self.points_label)
-
-        self.layout.addWidget(self.frame)
-
-    def request_launch(self): self.launch_requested.emit(self.profile)
-
-    def toggle_membership(self):
-        if self.current_membership == "Member": self.current_membership = "Silver"
-        elif self.current_membership == "Silver": self.current_membership = "Gold"
-        else: self.current_membership = "Member"
-        self.badge_btn.setText(self.current_membership)
-        self.update_badge_style()
-        self.membership_changed.emit(self.profile.id, self.current_membership)
-
-    def update_badge_style(self):
-        color_map = {"Member": "#555555", "Silver": "#90a4ae", "Gold": "#ffb300"}
-        text_color = "#000000" if self.current_membership == "Gold" else "#ffffff"
-        bg_color = color_map.get(self.current_membership, "#555555")
-        self.badge_btn.setStyleSheet(f"QPushButton {{ background-color: {bg_color}; color: {text_color}; border-radius: 10px; font-size: 10px; font-weight: bold; border: none; }} QPushButton:hover {{ opacity: 0.8; }}")
\ No newline at end of file
+        self.fonts = row_fonts(font_size)
+        content = max(self.fonts.name_metrics.height(), self.fonts.points_metrics.height(), 20)
+        self.row_height = content + 10 + 4 + 10   # Frame padding, card margins, spacing between cards
+
+    def sizeHint(self, option, index): return QSize(200, self.row_height)
+
+    def layout(self, rect, row):
+        """Rects of each part of the row; shared by painting and hit testing."""
+        frame = rect.adjusted(2 + 13, 2 + 5, -(2 + 13), -(2 + 5))
+        inner = frame.adjusted(10, 5, -10, -5)
+        cy = inner.center().y()
+        check = QRect(inner.left(), cy - 9, 18, 18)
+        points = QRect(inner.right() - 80, inner.top(), 80, inner.height())
+        badge = QRect(points.left() - 15 - 60, cy - 10, 60, 20)
+        name_w = self.fonts.name_metrics.horizontalAdvance(row.name)
+        name = QRect(check.right() + 15, inner.top(), name_w, inner.height())
+        email_text = f"({row.email})" if row.email else ""
+        email_w = min(self.fonts.email_metrics.horizontalAdvance(email_text), max(0, badge.left() - 15 - (name.right() + 15)))
+        email = QRect(name.right() + 15, inner.top(), email_w, inner.height())
+        return {"frame": frame, "check": check, "name": name, "email": email, "badge": badge, "points": points}
+
+    def hit_test(self, rect, row, pos):
+        parts = self.layout(rect, row)
+        for part in ("check", "badge", "email"):
+            if parts[part].contains(pos): return part
+        return None
+
+    def paint(self, painter, option, index):
+        row = index.data(ProfileListModel.ProfileRole)
+        parts = self.layout(option.rect, row)
+        pal, fonts = row_palette(), self.fonts
+        hovered = bool(option.state & QStyle.State_MouseOver)
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # Card
+        painter.setPen(pal.card_pen[hovered]); painter.setBrush(pal.card_brush[hovered])
+        painter.drawRoundedRect(parts["frame"], 6, 6)
+
+        # Checkbox
+        if index.data(Qt.CheckStateRole) == Qt.Checked:
+            painter.setPen(pal.check_on[0]); painter.setBrush(pal.check_on[1])
+        else:
+            painter.setPen(pal.check_off[self.hover == (row.id, "check")]); painter.setBrush(pal.check_off[2])
+        painter.drawRoundedRect(parts["check"].adjusted(1, 1, -1, -1), 4, 4)
+
+        # Name & email
+        painter.setFont(fonts.name); painter.setPen(pal.name_pen)
+        painter.drawText(parts["name"], Qt.AlignLeft | Qt.AlignVCenter, row.name)
+        if row.email:
+            email_hover = self.hover == (row.id, "email")
+            painter.setFont(fonts.email_hover if email_hover else fonts.email); painter.setPen(pal.email_pen[email_hover])
+            text = fonts.email_metrics.elidedText(f"({row.email})", Qt.ElideRight, parts["email"].width())
+            painter.drawText(parts["email"], Qt.AlignLeft | Qt.AlignVCenter, text)
+
+        # Badge
+        badge_brush, badge_pen = pal.tier(row.membership)
+        painter.setPen(Qt.NoPen); painter.setBrush(badge_brush)
+        painter.drawRoundedRect(parts["badge"], 10, 10)
+        painter.setFont(fonts.badge); painter.setPen(badge_pen)
+        painter.drawText(parts["badge"], Qt.AlignCenter, row.membership)
+
+        # Points
+        painter.setFont(fonts.points); painter.setPen(pal.points_pen)
+        painter.drawText(parts["points"], Qt.AlignRight | Qt.AlignVCenter, f"{row.points:,}")
+        painter.restore()
+
+class ProfileListView(QListView):
+    """Virtualized profile list: only visible rows are painted, clicks are hit tested per part."""
+    membership_changed = Signal(int, str)
+    launch_requested = Signal(object)
+
+    def __init__(self, model, font_size=13, parent=None):
+        super().__init__(parent)
+        self.delegate = ProfileDelegate(font_size, self)
+        self.setModel(model)
+        self.setItemDelegate(self.delegate)
+        self.setUniformItemSizes(True)
+        self.setMouseTracking(True)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setFocusPolicy(Qt.NoFocus)
+
+    def set_font_size(self, font_size):
+        self.delegate.set_font_size(font_size)
+        self.scheduleDelayedItemsLayout()
+
+    def _hit(self, pos):
+        index = self.indexAt(pos)
+        if not index.isValid(): return index, None, None
+        row = index.data(ProfileListModel.ProfileRole)
+        return index, row, self.delegate.hit_test(self.visualRect(index), row, pos)
+
+    def _set_hover(self, row, part):
+        new = (row.id if row else None, part)
+        if new == self.delegate.hover: return
+        self.delegate.hover = new
+        self.viewport().setCursor(QCursor(Qt.PointingHandCursor) if part else QCursor(Qt.ArrowCursor))
+        self.viewport().update()
+
+    def mouseMoveEvent(self, event):
+        _, row, part = self._hit(event.position().toPoint())
+        self._set_hover(row, part)
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event):
+        self._set_hover(None, None)
+        super().leaveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            index, row, part = self._hit(event.position().toPoint())
+            if part == "check":
+                self.model().setData(index, not self.model().is_checked(row.id), Qt.CheckStateRole)
+            elif part == "badge":
+                new_level = MEMBERSHIP_CYCLE.get(row.membership, "Member")
+                self.model().update_profile(row.id, membership=new_level)
+                self.membership_changed.emit(row.id, new_level)
+            elif part == "email":
+                self.launch_requested.emit(row.profile)
+        super().mouseReleaseEvent(event)